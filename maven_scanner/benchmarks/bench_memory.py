@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+
+"""
+Memory used by listed dependencies: one dict per dependency (the former layout) versus ArtifactRecord.
+
+    python benchmarks/bench_memory.py [number_of_artifacts]
+"""
+
+import os
+import sys
+import tracemalloc
+from maven_scanner.records import ArtifactRecord
+
+REPOSITORY = os.path.join(os.path.expanduser("~"), ".m2", "repository")
+REPOSITORY_URLS = ['https\\://repo.maven.apache.org/maven2/', 'https\\://nexus.example.com/repository/releases/']
+
+
+def parsed_artifacts(count):
+    """
+    Yield (filename, dir_path, pom_data, last_update_data) like the parsers produce them: every string is a new
+    object, even when its value repeats.
+    """
+    for number in range(count):
+        group_id = f"org.example.group{number // 500}"
+        artifact_id = f"artifact{number // 10}"
+        version = f"1.{number % 10}.0"
+        dir_path = os.path.join(REPOSITORY, *group_id.split('.'), artifact_id, version)
+        pom_data = {'groupId': f"{group_id}", 'artifactId': f"{artifact_id}", 'version': f"{version}"}
+        last_update_data = {'repository_url': f"{REPOSITORY_URLS[number % 2]}",
+                            'update_date': f"2024-02-{number % 28 + 1:02d} 12:00:00"}
+        yield f"{artifact_id}-{version}.jar", dir_path, pom_data, last_update_data
+
+
+def as_dict(filename, dir_path, pom_data, last_update_data):
+    return {
+        'groupId': pom_data['groupId'],
+        'artifactId': pom_data['artifactId'],
+        'version': pom_data['version'],
+        'repository_url': last_update_data['repository_url'],
+        'last_update': last_update_data['update_date'],
+        'filename': filename,
+        'file_path': os.path.join(dir_path, filename)
+    }
+
+
+def measure(factory, count):
+    tracemalloc.start()
+    items = [factory(*parsed) for parsed in parsed_artifacts(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return size
+
+
+def main(count):
+    dict_size = measure(as_dict, count)
+    record_size = measure(ArtifactRecord.from_parsed, count)
+    print(f"artifacts:            {count}")
+    print(f"dict per dependency:  {dict_size / 2 ** 20:8.1f} MiB  {dict_size / count:6.0f} B/artifact")
+    print(f"ArtifactRecord:       {record_size / 2 ** 20:8.1f} MiB  {record_size / count:6.0f} B/artifact")
+    print(f"reduction:            {100 * (1 - record_size / dict_size):8.1f} %")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+
+"""
+Scan benchmarks over a synthetic Maven repository (see synthetic_repo.py).
+
+    python benchmarks/bench_scan.py [--versions 10000] [--repo DIR] [--jobs N] [--executor thread|process]
+                                    [--roots N] [--json results.json] [--baseline previous.json]
+
+Reports per stage: wall time, file system calls (scandir, stat, listdir and open calls made in this process, plus read
+and write syscalls from /proc/self/io on Linux), peak RSS of the process so far and artifacts/sec. Results can be
+saved with --json and compared to a previous run with --baseline.
+
+With --roots N, the generated versions are split over N repositories, which are also listed together with one
+process and with one process per CPU, to check how multi-root scans scale. File system calls of those stages are
+made in the worker processes and are not counted.
+"""
+
+import argparse
+import builtins
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from maven_scanner.cli import filter_dependencies, scan_roots
+from maven_scanner.index import ScanIndex
+from maven_scanner.parallel import parse_directories
+from maven_scanner.scanner import MavenScanner
+from synthetic_repo import generate_repository
+
+COUNTED_CALLS = [(os, 'scandir'), (os, 'stat'), (os, 'listdir'), (builtins, 'open')]
+COLUMNS = ['stage', 'seconds', 'artifacts', 'artifacts/s', 'scandir', 'stat', 'listdir', 'open', 'read_sys',
+           'write_sys', 'peak_rss_mib']
+
+
+def proc_io():
+    """
+    Return read and write syscall counters of this process, zeros where /proc/self/io is not available.
+    """
+    counters = {'syscr': 0, 'syscw': 0}
+    try:
+        with open('/proc/self/io') as file:
+            for line in file:
+                name, _, value = line.partition(':')
+                if name in counters:
+                    counters[name] = int(value)
+    except OSError:
+        pass
+    return counters['syscr'], counters['syscw']
+
+
+def peak_rss_mib():
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10)
+
+
+@contextmanager
+def counting_calls(counts):
+    originals = [(module, name, getattr(module, name)) for module, name in COUNTED_CALLS]
+
+    def counted(name, function):
+        def wrapper(*args, **kwargs):
+            counts[name] += 1
+            return function(*args, **kwargs)
+        return wrapper
+
+    for module, name, function in originals:
+        setattr(module, name, counted(name, function))
+    try:
+        yield
+    finally:
+        for module, name, function in originals:
+            setattr(module, name, function)
+
+
+class Stages:
+    def __init__(self):
+        self.results = []
+
+    @contextmanager
+    def measure(self, stage):
+        """
+        Measure the enclosed block; it sets result['artifacts'] to the number of artifacts it handled.
+        """
+        counts = {name: 0 for _, name in COUNTED_CALLS}
+        result = {'stage': stage, 'artifacts': 0}
+        read_before, write_before = proc_io()
+        start = time.perf_counter()
+        with counting_calls(counts):
+            yield result
+        seconds = time.perf_counter() - start
+        read_after, write_after = proc_io()
+        result.update(counts)
+        result.update({'seconds': seconds, 'artifacts/s': result['artifacts'] / seconds if seconds else 0.0,
+                       'read_sys': read_after - read_before, 'write_sys': write_after - write_before,
+                       'peak_rss_mib': peak_rss_mib()})
+        self.results.append(result)
+
+
+def run(repo, jobs, executor, index_dir, roots=()):
+    stages = Stages()
+
+    scanner = MavenScanner(debug=False)
+    with stages.measure('walk') as result:
+        scanner.scan_maven_repo_for_dependencies(repo)
+        result['artifacts'] = len(scanner.jar_dir_dict)
+
+    dir_paths = sorted(set(scanner.jar_dir_dict.values()))
+    with stages.measure('parse') as result:
+        parse_directories(scanner, dir_paths, jobs, executor)
+        result['artifacts'] = len(scanner.jar_dir_dict)
+
+    with stages.measure('list') as result:
+        result['artifacts'] = len(filter_dependencies(scanner, 'all', 'all', jobs, executor))
+
+    with stages.measure('list (repository filter)') as result:
+        result['artifacts'] = len(filter_dependencies(scanner, '*releases*', 'all', jobs, executor))
+
+    index_path = os.path.join(index_dir, 'index')
+    for stage in ('walk + parse (index, cold)', 'walk + parse (index, warm)'):
+        indexed = MavenScanner(debug=False, index=ScanIndex(index_path, repo))
+        with stages.measure(stage) as result:
+            indexed.scan_maven_repo_for_dependencies(repo)
+            parse_directories(indexed, sorted(set(indexed.jar_dir_dict.values())), jobs, executor)
+            indexed.close()
+            result['artifacts'] = len(indexed.jar_dir_dict)
+
+    cpus = os.cpu_count() or 1
+    for root_jobs in sorted({1, cpus}) if roots else ():
+        with stages.measure(f'roots x{len(roots)} ({root_jobs} proc)') as result:
+            inventory, _ = scan_roots(roots, root_jobs, jobs=jobs)
+            result['artifacts'] = inventory.added
+    return stages.results
+
+
+def print_results(results, baseline=None):
+    baseline = {result['stage']: result for result in baseline or []}
+    print(' '.join(f"{column:>12}" if position else f"{column:<28}" for position, column in enumerate(COLUMNS)))
+    for result in results:
+        cells = [f"{result['stage']:<28}"]
+        for column in COLUMNS[1:]:
+            value = result[column]
+            cells.append(f"{value:>12.3f}" if isinstance(value, float) else f"{value:>12}")
+        print(' '.join(cells))
+        previous = baseline.get(result['stage'])
+        if previous and previous['seconds']:
+            print(f"{'':<28} {result['seconds'] / previous['seconds']:>11.2f}x of baseline time")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--versions', type=int, default=10000, help='Version directories to generate')
+    parser.add_argument('--repo', help='Existing repository to scan instead of a generated one')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--jobs', type=int, default=1)
+    parser.add_argument('--executor', default='thread', choices=['thread', 'process'])
+    parser.add_argument('--roots', type=int, default=0, help='Repositories the versions are also split over')
+    parser.add_argument('--json', dest='json_file', help='Save results to this file')
+    parser.add_argument('--baseline', help='Compare with results saved by a previous run')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='mvn-scn-bench-')
+    try:
+        repo = args.repo
+        if repo is None:
+            repo = os.path.join(work_dir, 'repository')
+            start = time.perf_counter()
+            written = generate_repository(repo, args.versions, args.seed)
+            print(f"Generated {args.versions} version directories, {written} artifacts in "
+                  f"{time.perf_counter() - start:.1f}s")
+        roots = []
+        for number in range(args.roots):
+            roots.append(os.path.join(work_dir, f'root{number}'))
+            generate_repository(roots[-1], args.versions // args.roots, args.seed + number)
+        results = run(repo, args.jobs, args.executor, work_dir, roots)
+    finally:
+        shutil.rmtree(work_dir)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)['results']
+    print_results(results, baseline)
+    if args.json_file:
+        with open(args.json_file, 'w') as file:
+            json.dump({'versions': args.versions, 'jobs': args.jobs, 'executor': args.executor, 'roots': args.roots,
+                       'results': results}, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+
+"""
+Generate a synthetic Maven local repository for benchmarks.
+
+    python benchmarks/synthetic_repo.py <target_dir> [number_of_version_directories] [seed]
+
+The layout follows ~/.m2/repository: <group path>/<artifactId>/<version>/ with a jar (or zip), its pom,
+_remote.repositories and, for some artifacts, .lastUpdated files and classified jars. POMs alternate between
+namespaced and non-namespaced documents, and a share of them inherit groupId and version from a <parent>.
+The same seed always produces the same tree.
+"""
+
+import os
+import random
+import sys
+
+POM_NAMESPACE = 'http://maven.apache.org/POM/4.0.0'
+REPOSITORY_URLS = ['https\\://repo.maven.apache.org/maven2/', 'https\\://nexus.example.com/repository/releases/',
+                   'https\\://nexus.example.com/repository/snapshots/']
+REPOSITORY_IDS = ['central', 'nexus-releases', 'nexus-snapshots']
+CLASSIFIERS = ['tests', 'linux-x86_64', 'javadoc', 'sources']
+GROUP_WORDS = ['apache', 'springframework', 'eclipse', 'google', 'fasterxml', 'hibernate', 'netty', 'example']
+# Share of version directories with each feature
+NAMESPACED_SHARE = 0.7
+PARENT_SHARE = 0.3
+CLASSIFIER_SHARE = 0.15
+LAST_UPDATED_SHARE = 0.4
+ZIP_SHARE = 0.05
+VERSIONS_PER_ARTIFACT = 8
+ARTIFACTS_PER_GROUP = 20
+
+
+def pom_content(group_id, artifact_id, version, namespaced, inherited):
+    xmlns = f' xmlns="{POM_NAMESPACE}"' if namespaced else ''
+    if inherited:
+        # Coordinates missing from the project are taken from the parent
+        coordinates = f"""  <parent>
+    <groupId>{group_id}</groupId>
+    <artifactId>{group_id.rsplit('.', 1)[-1]}-parent</artifactId>
+    <version>{version}</version>
+  </parent>
+  <artifactId>{artifact_id}</artifactId>"""
+    else:
+        coordinates = f"""  <groupId>{group_id}</groupId>
+  <artifactId>{artifact_id}</artifactId>
+  <version>{version}</version>"""
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<project{xmlns}>
+  <modelVersion>4.0.0</modelVersion>
+{coordinates}
+  <name>{artifact_id}</name>
+  <description>Synthetic artifact generated for benchmarks.</description>
+  <dependencies>
+    <dependency>
+      <groupId>org.slf4j</groupId>
+      <artifactId>slf4j-api</artifactId>
+      <version>2.0.9</version>
+    </dependency>
+  </dependencies>
+</project>
+"""
+
+
+def last_updated_content(rng, timestamp):
+    repository = rng.randrange(len(REPOSITORY_URLS))
+    lines = ['#NOTE: This is a Maven Resolver internal implementation file, its format can be changed without prior '
+             'notice.', '#Thu Nov 30 17:19:49 CET 2023',
+             f"{REPOSITORY_URLS[repository]}.lastUpdated={timestamp}"]
+    for other in range(len(REPOSITORY_URLS)):
+        if other != repository:
+            lines.append(f"{REPOSITORY_URLS[other]}.error=Could not transfer artifact from/to {REPOSITORY_IDS[other]}")
+    return '\n'.join(lines) + '\n'
+
+
+def coordinates(count):
+    """
+    Yield (groupId, artifactId, version) of count version directories.
+    """
+    for number in range(count):
+        artifact = number // VERSIONS_PER_ARTIFACT
+        group = artifact // ARTIFACTS_PER_GROUP
+        group_id = f"org.{GROUP_WORDS[group % len(GROUP_WORDS)]}.group{group}"
+        version = f"{number % VERSIONS_PER_ARTIFACT + 1}.{artifact % 5}.0"
+        if number % 13 == 0:
+            version += '-SNAPSHOT'
+        yield group_id, f"artifact{artifact}", version
+
+
+def generate_repository(root, count, seed=0):
+    """
+    Write count version directories below root and return the number of artifact files written.
+    """
+    rng = random.Random(seed)
+    artifacts = 0
+    for group_id, artifact_id, version in coordinates(count):
+        dir_path = os.path.join(root, *group_id.split('.'), artifact_id, version)
+        os.makedirs(dir_path, exist_ok=True)
+        base = f"{artifact_id}-{version}"
+        extension = 'zip' if rng.random() < ZIP_SHARE else 'jar'
+        files = [f"{base}.{extension}"]
+        if rng.random() < CLASSIFIER_SHARE:
+            files.append(f"{base}-{rng.choice(CLASSIFIERS)}.jar")
+        for name in files:
+            with open(os.path.join(dir_path, name), 'wb') as file:
+                file.write(b'PK\x05\x06' + bytes(18))  # Empty zip archive
+        artifacts += len([name for name in files if not name.endswith('-sources.jar')])
+
+        with open(os.path.join(dir_path, base + '.pom'), 'w') as file:
+            file.write(pom_content(group_id, artifact_id, version, rng.random() < NAMESPACED_SHARE,
+                                   rng.random() < PARENT_SHARE))
+        repository_id = rng.choice(REPOSITORY_IDS)
+        with open(os.path.join(dir_path, '_remote.repositories'), 'w') as file:
+            file.write('#NOTE: This is a Maven Resolver internal implementation file, its format can be changed '
+                       'without prior notice.\n')
+            for name in files + [base + '.pom']:
+                file.write(f"{name}>{repository_id}=\n")
+        if rng.random() < LAST_UPDATED_SHARE:
+            with open(os.path.join(dir_path, base + '.pom.lastUpdated'), 'w') as file:
+                file.write(last_updated_content(rng, 1700000000000 + rng.randrange(10 ** 10)))
+    return artifacts
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    target = sys.argv[1]
+    written = generate_repository(target, int(sys.argv[2]) if len(sys.argv) > 2 else 1000,
+                                  int(sys.argv[3]) if len(sys.argv) > 3 else 0)
+    print(f"{written} artifacts written to {target}")
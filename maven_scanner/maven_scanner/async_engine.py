@@ -0,0 +1,111 @@
+"""Asyncio scanning engine overlapping directory listings and file reads, for high latency file systems."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from maven_scanner.walker import classify_entries, list_directory
+
+ENGINES = ('sync', 'async')
+DEFAULT_IN_FLIGHT = 32
+
+
+class AsyncEngine:
+    """
+    Walks and parses a repository with up to in_flight blocking file system calls running at the same time in
+    worker threads, driven by an asyncio event loop. On NFS or SMB mounts most of the time of a scan is spent
+    waiting for replies, which this overlaps; results and their order are the same as with the sync scanner.
+    """
+
+    def __init__(self, in_flight=DEFAULT_IN_FLIGHT):
+        if in_flight < 1:
+            raise ValueError(f"In-flight limit must be at least 1, got {in_flight}")
+        self.in_flight = in_flight
+        # Event loop and worker threads of parse_directories, kept from one call to the next until shutdown()
+        self._loop = None
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    async def walk(self, root, lister=list_directory, stats=None):
+        """
+        Asynchronously yield an ArtifactDir for each directory below root, in the depth-first sorted order of
+        walker.walk_repository. The directories to be visited next are listed ahead while earlier ones are
+        processed.
+        """
+        loop = asyncio.get_event_loop()
+        with ThreadPoolExecutor(max_workers=self.in_flight) as pool:
+            listings = {}
+            stack = [root]
+            try:
+                while stack:
+                    # The top of the stack is visited next, list it and the following directories ahead
+                    for ahead in stack[-self.in_flight:]:
+                        if ahead not in listings:
+                            listings[ahead] = loop.run_in_executor(pool, lister, ahead)
+                    path = stack.pop()
+                    sub_dirs, file_names = await listings.pop(path)
+                    if stats is not None:
+                        stats.count('directories_listed')
+                        stats.count('files_listed', len(file_names))
+                    stack.extend(reversed(sub_dirs))
+                    record = classify_entries(path, file_names)
+                    if record is not None:
+                        yield record
+            finally:
+                # Directories listed ahead are not awaited when the walk was stopped early
+                for listing in listings.values():
+                    listing.cancel()
+
+    def iter_walk(self, root, lister=list_directory, stats=None):
+        """
+        Run walk() on a private event loop and return its records as a plain iterator, so the engine can replace
+        walk_repository. Listings continue in the worker threads while the consumer handles a record.
+        """
+        loop = asyncio.new_event_loop()
+        records = self.walk(root, lister, stats)
+        try:
+            while True:
+                try:
+                    record = loop.run_until_complete(records.__anext__())
+                except StopAsyncIteration:
+                    return
+                yield record
+        finally:
+            loop.run_until_complete(records.aclose())
+            loop.close()
+
+    async def parse(self, scanner, dir_paths, method='parse_dependency_dir', pool=None):
+        """
+        Call the scanner parse method on every directory with up to in_flight calls running at the same time and
+        return (result, error_counter, stats) tuples of the workers in the order of dir_paths. The calls run in
+        pool when given, in a new pool of in_flight threads otherwise.
+        """
+        loop = asyncio.get_event_loop()
+        if pool is None:
+            with ThreadPoolExecutor(max_workers=self.in_flight) as pool:
+                return await self.parse(scanner, dir_paths, method, pool)
+        return await asyncio.gather(*[loop.run_in_executor(pool, _parse, scanner, method, dir_path)
+                                      for dir_path in dir_paths])
+
+    def parse_directories(self, scanner, dir_paths, method='parse_dependency_dir'):
+        """
+        Run parse() on the engine's event loop. The loop and its worker threads are created by the first call and
+        reused by the following ones, eg. the batches of a stream, until shutdown().
+        """
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._pool = ThreadPoolExecutor(max_workers=self.in_flight)
+        return self._loop.run_until_complete(self.parse(scanner, dir_paths, method, self._pool))
+
+    def shutdown(self):
+        if self._loop is not None:
+            self._pool.shutdown()
+            self._loop.close()
+            self._loop = self._pool = None
+
+
+def _parse(scanner, method, dir_path):
+    worker = scanner.worker()
+    return getattr(worker, method)(dir_path), worker.error_counter, worker.stats
@@ -1,9 +1,46 @@
 import click
 from maven_scanner.scanner import MavenScanner
-from tabulate import tabulate
+from maven_scanner.index import ScanIndex, default_index_path
+from maven_scanner.parallel import create_pool, parse_directories, EXECUTORS, ASYNC_EXECUTOR
+from maven_scanner.async_engine import AsyncEngine, ENGINES, DEFAULT_IN_FLIGHT
+from maven_scanner.filters import DependencyFilter, subtree_roots
+from maven_scanner.deploy import HttpDeployer, DeployError, DeployJournal, run_deploys, DEFAULT_RETRIES
+from maven_scanner.settings import read_server_credentials
+from maven_scanner.writers import COLUMNS, ROOTS_COLUMNS, write_table, write_csv, write_tsv, write_jsonl, \
+    write_sqlite
+from maven_scanner.diff import diff_inventories, format_artifact, load_inventory
+from maven_scanner.records import ArtifactRecord
+from maven_scanner.inventory import ArtifactIndex, MergedInventory
+from maven_scanner.roots import expand_roots
+from maven_scanner.stats import TimedIterator
+from maven_scanner.verify import HashCache, verify_artifacts
+from maven_scanner.graph import DependencyGraph, SCOPES, TRANSITIVE_SCOPES, format_coordinate, parse_coordinate
+from maven_scanner.resolver import pom_path
+from maven_scanner.walker import classify_entries, list_directory
+from maven_scanner.usage import DEFAULT_USAGE_JOBS, format_size, largest, remove_versions, scan_usage, \
+    snapshots_to_prune
+from maven_scanner.daemon import LiveInventory, default_socket_path, query_dependencies, serve_inventory, stop_daemon
+from maven_scanner.watcher import DEFAULT_POLL_INTERVAL, create_watcher
+from maven_scanner.stats import ScanStats
+from datetime import datetime
+import cProfile
 import os
-import csv
+import sqlite3
 import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain
+
+DEPLOY_BACKENDS = ('mvn', 'http')
+OUTPUT_TYPES = ('stdout', 'csv', 'tsv', 'jsonl', 'sqlite')
+# Files written to the --output-file directory
+EXPORT_FILES = {'csv': 'dependencies.csv', 'jsonl': 'dependencies.jsonl', 'sqlite': 'dependencies.db'}
+PARSE_BATCH_SIZE = 256
+DEFAULT_HASH_JOBS = os.cpu_count() or 1
+DEFAULT_ROOT_JOBS = os.cpu_count() or 1
+
 
 @click.group()
 def cli():
@@ -11,90 +48,771 @@ def cli():
 
 
 @cli.command()
-@click.option('-r', '--repo-local-path', help='Path to Maven repository, default: ~/.m2/repository')
+@click.option('-r', '--local-repo-dir', help='Path to Maven repository, default: ~/.m2/repository')
 @click.option('-d', '--debug', is_flag=True, help='Enable debug mode to suppress exceptions and error messages.')
-def scan(local_repo_dir, debug):
-    scanner = scan_repo(local_repo_dir, debug)
-    click.echo(f"Number of JAR and ZIP directories found: {len(scanner.jar_dir_dict)}")
+@click.option('--index', 'use_index', is_flag=True, help='Use a persistent scan index and rescan only changed '
+                                                         'directories.')
+@click.option('--index-file', default=None, help='Path to the scan index, default: ~/.m2/.mvn-scn-index')
+@click.option('-j', '--jobs', default=1, type=int, help='Number of parallel workers used to parse pom and '
+                                                      'lastUpdated files, default: 1')
+@click.option('--executor', default='thread', type=click.Choice(EXECUTORS), help='Parallel workers type: thread '
+                                                                                 '(I/O bound, eg. NFS) or process '
+                                                                                 '(CPU bound pom parsing)')
+@click.option('--engine', default='sync', type=click.Choice(ENGINES), help='Scanning engine: sync, or async to overlap '
+                                                                          'many directory listings and file reads on '
+                                                                          'high latency file systems, eg. NFS or SMB')
+@click.option('--in-flight', default=DEFAULT_IN_FLIGHT, type=int, help='Number of file system calls the async engine '
+                                                                       'runs at the same time, used instead of --jobs '
+                                                                       f'and --executor, default: {DEFAULT_IN_FLIGHT}')
+@click.option('-g', '--group', 'groups', multiple=True, help='Scan only this groupId and its sub groups, or with '
+                                                               '--artifact only the artifacts directly in this '
+                                                               'groupId. Can be repeated and set with wildcard, eg. '
+                                                               '"org.spring*".')
+@click.option('-a', '--artifact', 'artifacts', multiple=True, help='Scan only this artifactId, can be repeated and set '
+                                                                  'with wildcard.')
+@click.option('--stats', 'show_stats', is_flag=True, help='Print stage durations, counters, cache hit rates and errors '
+                                                         'of the run to stderr.')
+@click.option('--stats-json', default=None, help='Write the run statistics as JSON to this file, "-" for stdout.')
+@click.option('--profile', 'profile_file', default=None, help='Profile the run with cProfile and write the profile '
+                                                              'to this file, eg. for "python -m pstats <file>".')
+def scan(local_repo_dir, debug, use_index, index_file, jobs, executor, engine, in_flight, groups, artifacts,
+         show_stats, stats_json, profile_file):
+    profiler = start_profiler(profile_file)
+    start = time.perf_counter()
+    if engine == 'async':
+        jobs, executor = in_flight, ASYNC_EXECUTOR
+    scanner = scan_repo(local_repo_dir, debug, use_index, index_file, DependencyFilter(artifacts=artifacts), groups,
+                        artifacts, engine, in_flight)
+    dir_paths = sorted(set(dir_path for _, dir_path in scanner.artifacts()))
+    parse_directories(scanner, dir_paths, jobs, executor)
+    scanner.close()
+    scanner.stats.add_duration('total', time.perf_counter() - start)
+    report_stats(scanner.stats, show_stats, stats_json, profiler, profile_file)
+    click.echo(f"Number of JAR and ZIP files found: {len(scanner.jar_dir_dict)}")
+    click.echo(f"Number of JAR and ZIP directories found: {len(dir_paths)}")
     click.echo(f"Number of errors encountered: {scanner.error_counter}")
 
 
 @cli.command()
-@click.option('-r', '--local-repo-dir', help='Path to Maven repository, default: ~/.m2/repository')
-@click.option('-t', '--output-type', default='stdout', help='Output type: stdout, csv')
+@click.option('-r', '--local-repo-dir', 'local_repo_dirs', multiple=True,
+              help='Path to Maven repository, default: ~/.m2/repository. Can be repeated to list the artifacts of '
+                   'several repositories at once.')
+@click.option('--roots-glob', 'roots_globs', multiple=True, help='List also the repositories matching this glob '
+                                                                 'pattern, eg. "/mnt/agents/*/.m2/repository".')
+@click.option('--roots-file', 'roots_files', multiple=True, help='List also the repositories of this manifest file, '
+                                                                 'one path or glob pattern per line.')
+@click.option('--root-jobs', default=DEFAULT_ROOT_JOBS, type=int, help='Number of repositories scanned at the same '
+                                                                       'time, each in its own process, default: '
+                                                                       'number of CPUs')
+@click.option('-t', '--output-type', default='stdout', type=click.Choice(OUTPUT_TYPES),
+              help='Output type: stdout (table), csv (dependencies.csv file), tsv (tab separated lines on stdout), '
+                   'jsonl (dependencies.jsonl file, JSON Lines) or sqlite (dependencies.db file)')
 @click.option('-o', '--output-file', default='.', help='Path to output file. by default, current directory.')
 @click.option('-f', '--filter-repo', default='all', help='Include only dependencies from this repo. Can be set with '
-                                                         'wildcard.')
+                                                         'wildcard or as regular expression: "re:<expression>".')
 @click.option('-fn', '--filter-filename', default='all', help='Include only dependencies with this filename. '
-                                                              'Can be set with wildcard.')
+                                                              'Can be set with wildcard or as regular expression: '
+                                                              '"re:<expression>".')
+@click.option('-fg', '--filter-group', default='all', help='Include only dependencies from this groupId and its '
+                                                           'sub groups. Can be set with wildcard or as regular '
+                                                           'expression: "re:<expression>".')
 @click.option('-d', '--deploy', default=None, help='Deploy listed dependencies to the specified repository: '
                                                    'You need to pass info in the form of: "repositoryId,repositoryUrl"')
+@click.option('--deploy-backend', default='mvn', type=click.Choice(DEPLOY_BACKENDS),
+              help='Deploy with "mvn deploy:deploy-file" or with direct HTTP uploads, default: mvn')
+@click.option('--settings', 'settings_file', default=None, help='Path to Maven settings.xml with the credentials '
+                                                               'used by the http backend, default: ~/.m2/settings.xml')
+@click.option('--deploy-jobs', default=1, type=int, help='Number of dependencies deployed at the same time, default: 1')
+@click.option('--retries', default=DEFAULT_RETRIES, type=int, help='Number of retries of a deploy that failed with a '
+                                                                   f'transient error, default: {DEFAULT_RETRIES}')
+@click.option('--retry-mvn', is_flag=True, help='Retry failed "mvn deploy:deploy-file" commands too. mvn does not '
+                                                'tell transient failures from permanent ones, eg. a refused '
+                                                'redeploy, so they are not retried by default.')
+@click.option('--journal', 'journal_file', default=None, help='Progress journal file. Deployed dependencies are '
+                                                              'recorded in it and skipped when the deploy is resumed.')
+@click.option('--with-transitive', is_flag=True, help='Deploy also the dependencies of the listed dependencies, '
+                                                      'directly or transitively, read from their poms.')
+@click.option('-y', '--yes', 'assume_yes', is_flag=True, help='Deploy without asking for confirmation.')
+@click.option('--skip-existing', is_flag=True, help='Check the target repository first and deploy only dependencies '
+                                                    'that are missing there or differ from the local file.')
 @click.option('--debug', is_flag=True, help='Enable debug mode to suppress exceptions and error messages.')
-def list_dependencies(local_repo_dir, output_type, output_file, filter_repo, filter_filename, debug, deploy):
-    scanner = scan_repo(local_repo_dir, debug)
+@click.option('--index', 'use_index', is_flag=True, help='Use a persistent scan index and rescan only changed '
+                                                         'directories.')
+@click.option('--index-file', default=None, help='Path to the scan index, default: ~/.m2/.mvn-scn-index')
+@click.option('-j', '--jobs', default=1, type=int, help='Number of parallel workers used to parse pom and '
+                                                      'lastUpdated files, default: 1')
+@click.option('--executor', default='thread', type=click.Choice(EXECUTORS), help='Parallel workers type: thread '
+                                                                                 '(I/O bound, eg. NFS) or process '
+                                                                                 '(CPU bound pom parsing)')
+@click.option('--engine', default='sync', type=click.Choice(ENGINES), help='Scanning engine: sync, or async to overlap '
+                                                                          'many directory listings and file reads on '
+                                                                          'high latency file systems, eg. NFS or SMB')
+@click.option('--in-flight', default=DEFAULT_IN_FLIGHT, type=int, help='Number of file system calls the async engine '
+                                                                       'runs at the same time, used instead of --jobs '
+                                                                       f'and --executor, default: {DEFAULT_IN_FLIGHT}')
+@click.option('-g', '--group', 'groups', multiple=True, help='Scan only this groupId and its sub groups, or with '
+                                                               '--artifact only the artifacts directly in this '
+                                                               'groupId. Can be repeated and set with wildcard, eg. '
+                                                               '"org.spring*".')
+@click.option('-a', '--artifact', 'artifacts', multiple=True, help='Scan only this artifactId, can be repeated and set '
+                                                                  'with wildcard.')
+@click.option('--stats', 'show_stats', is_flag=True, help='Print stage durations, counters, cache hit rates and errors '
+                                                         'of the run to stderr.')
+@click.option('--stats-json', default=None, help='Write the run statistics as JSON to this file, "-" for stdout.')
+@click.option('--profile', 'profile_file', default=None, help='Profile the run with cProfile and write the profile '
+                                                              'to this file, eg. for "python -m pstats <file>".')
+@click.option('--socket', 'socket_path', default=None, help='Unix socket of the "mvn-scn serve" daemon asked first, '
+                                                            'default: ~/.m2/.mvn-scn.sock')
+@click.option('--no-daemon', is_flag=True, help='Scan the repository even when a daemon is running.')
+def list_dependencies(local_repo_dirs, roots_globs, roots_files, root_jobs, output_type, output_file, filter_repo,
+                      filter_filename, filter_group, debug, deploy, deploy_backend, settings_file, deploy_jobs, retries,
+                      retry_mvn, journal_file, with_transitive, assume_yes, skip_existing, use_index, index_file, jobs,
+                      executor, engine, in_flight, groups, artifacts, show_stats, stats_json, profile_file, socket_path,
+                      no_daemon):
+    if with_transitive and not deploy:
+        raise click.UsageError("--with-transitive can only be used with --deploy")
+    roots = expand_roots(local_repo_dirs, roots_globs, roots_files)
+    if len(roots) > 1:
+        if with_transitive:
+            raise click.UsageError("--with-transitive can only be used with a single repository")
+        if index_file:
+            raise click.UsageError("--index-file can only be used with a single repository, each repository has "
+                                   "its default index with --index")
+        list_roots(roots, root_jobs, output_type, output_file, filter_repo, filter_filename, filter_group, debug,
+                   deploy, deploy_backend, settings_file, deploy_jobs, retries, retry_mvn, journal_file, assume_yes,
+                   skip_existing, use_index, jobs, executor, engine, in_flight, groups, artifacts, show_stats,
+                   stats_json, profile_file)
+        return
+    if (roots_globs or roots_files) and not roots:
+        raise click.UsageError("No repository matches the given roots")
+    local_repo_dir = roots[0] if roots else None
+    profiler = start_profiler(profile_file)
+    start = time.perf_counter()
+    if engine == 'async':
+        jobs, executor = in_flight, ASYNC_EXECUTOR
+    dependency_filter = DependencyFilter(filter_repo, filter_filename, filter_group, artifacts)
+
+    scanner = None
+    records = None
+    if not (no_daemon or with_transitive):
+        # A running daemon answers from its live inventory, without scanning the repository
+        records = query_dependencies(socket_path or default_socket_path(repo_dir(local_repo_dir)),
+                                     repo_dir(local_repo_dir), filter_repo, filter_filename, filter_group, artifacts,
+                                     groups)
+    if records is not None:
+        stats = ScanStats()
+        stats.count('artifacts_listed', len(records))
+        dependencies = TimedIterator(records)
+    else:
+        scanner, found = stream_repo(local_repo_dir, debug, use_index, index_file, dependency_filter, groups,
+                                     artifacts, engine, in_flight, collect_dependencies=with_transitive)
+        stats = scanner.stats
+        # Dependencies are produced while the repository is walked and written out as they come. The time spent
+        # producing them is measured apart from the time spent writing them out
+        dependency_graph = DependencyGraph() if with_transitive else None
+        dependencies = TimedIterator(iter_dependencies(scanner, found, dependency_filter, jobs, executor,
+                                                       graph=dependency_graph))
+    try:
+        if deploy:
+            dst_repo_id, dst_repo_url = deploy.split(',')
+            # Deploys need the whole list up front, indexed by coordinates to spot files claiming the same artifact
+            inventory = ArtifactIndex(dependencies)
+            if with_transitive:
+                with stats.timer('transitive'):
+                    added = add_transitive_dependencies(scanner, inventory, dependency_graph, jobs, executor)
+                print(f"Transitive dependencies added: {added}")
+            for duplicates in inventory.duplicates():
+                print(f"Same coordinates in several files: {', '.join(d['file_path'] for d in duplicates)}")
+            with stats.timer('deploy'):
+                deploy_dependencies(inventory.query(), dst_repo_id, dst_repo_url, deploy_backend, settings_file,
+                                    deploy_jobs, retries, journal_file, assume_yes, skip_existing, retry_mvn)
+        else:
+            output_start = time.perf_counter()
+            if output_type == 'stdout':
+                print_dependencies(dependencies)
+            elif output_type in EXPORT_FILES:
+                save_to_file(dependencies, output_file, output_type)
+            elif output_type == 'tsv':
+                print_tsv(dependencies)
+            stats.add_duration('output', time.perf_counter() - output_start - dependencies.seconds)
+    finally:
+        if scanner is not None:
+            scanner.close()
+        stats.add_duration('total', time.perf_counter() - start)
+        report_stats(stats, show_stats, stats_json, profiler, profile_file)
 
-    dependencies = filter_dependencies(scanner, filter_repo, filter_filename)
 
-    if deploy:
-        dst_repo_id, dst_repo_url = deploy.split(',')
-        deploy_dependencies(dependencies, dst_repo_id, dst_repo_url)
-    elif output_type == 'stdout':
-        print_dependencies(dependencies)
-    elif output_type == 'csv':
-        save_to_csv(dependencies, output_file)
+def list_roots(roots, root_jobs, output_type, output_file, filter_repo, filter_filename, filter_group, debug, deploy,
+               deploy_backend, settings_file, deploy_jobs, retries, retry_mvn, journal_file, assume_yes, skip_existing,
+               use_index, jobs, executor, engine, in_flight, groups, artifacts, show_stats, stats_json, profile_file):
+    """
+    list-dependencies of several repositories: list or deploy each artifact once, with the roots holding it.
+    """
+    profiler = start_profiler(profile_file)
+    start = time.perf_counter()
+    inventory, stats = scan_roots(roots, root_jobs, debug, filter_repo, filter_filename, filter_group, use_index,
+                                  jobs, executor, engine, in_flight, groups, artifacts)
+    try:
+        if deploy:
+            dst_repo_id, dst_repo_url = deploy.split(',')
+            with stats.timer('deploy'):
+                deploy_dependencies(list(inventory), dst_repo_id, dst_repo_url, deploy_backend, settings_file,
+                                    deploy_jobs, retries, journal_file, assume_yes, skip_existing, retry_mvn)
+        else:
+            with stats.timer('output'):
+                if output_type == 'stdout':
+                    print_dependencies(inventory.rows(), ROOTS_COLUMNS)
+                elif output_type in EXPORT_FILES:
+                    save_to_file(inventory.rows(), output_file, output_type, ROOTS_COLUMNS)
+                elif output_type == 'tsv':
+                    print_tsv(inventory.rows(), ROOTS_COLUMNS)
+    finally:
+        stats.add_duration('total', time.perf_counter() - start)
+        report_stats(stats, show_stats, stats_json, profiler, profile_file)
 
 
-def scan_repo(local_repo_dir, debug):
-    scanner = MavenScanner(debug)
-    if local_repo_dir:
-        scanner.scan_maven_repo_for_dependencies(local_repo_dir)
-    else:
-        scanner.scan_maven_repo_for_dependencies(os.path.join(os.path.expanduser("~"), ".m2", "repository"))
+@cli.command()
+@click.option('-r', '--local-repo-dir', help='Path to Maven repository, default: ~/.m2/repository')
+@click.option('-d', '--debug', is_flag=True, help='Enable debug mode to suppress exceptions and error messages.')
+@click.option('--index', 'use_index', is_flag=True, help='Use a persistent scan index and rescan only changed '
+                                                         'directories.')
+@click.option('--index-file', default=None, help='Path to the scan index, default: ~/.m2/.mvn-scn-index')
+@click.option('-j', '--jobs', default=1, type=int, help='Number of parallel workers used to parse pom and '
+                                                      'lastUpdated files, default: 1')
+@click.option('--executor', default='thread', type=click.Choice(EXECUTORS), help='Parallel workers type: thread '
+                                                                                 '(I/O bound, eg. NFS) or process '
+                                                                                 '(CPU bound pom parsing)')
+@click.option('--socket', 'socket_path', default=None, help='Unix socket to listen on, default: ~/.m2/.mvn-scn.sock')
+@click.option('--polling', is_flag=True, help='Look for changes by polling directory mtimes instead of with inotify.')
+@click.option('--poll-interval', default=DEFAULT_POLL_INTERVAL, type=float,
+              help=f'Seconds between polls, when polling, default: {DEFAULT_POLL_INTERVAL}')
+@click.option('--stop', is_flag=True, help='Stop the daemon listening on the socket and exit.')
+def serve(local_repo_dir, debug, use_index, index_file, jobs, executor, socket_path, polling, poll_interval, stop):
+    """
+    Scan the repository once, keep the inventory current as files change and answer list-dependencies queries.
+    """
+    local_repo_dir = repo_dir(local_repo_dir)
+    socket_path = socket_path or default_socket_path(local_repo_dir)
+    if stop:
+        click.echo("Daemon stopped." if stop_daemon(socket_path, local_repo_dir) else "No daemon is running.")
+        return
+    index = ScanIndex(index_file or default_index_path(local_repo_dir), local_repo_dir) if use_index else None
+    scanner = MavenScanner(debug, index)
+    # Watching starts before the scan, so changes made during the scan are not missed
+    watcher = create_watcher(local_repo_dir, polling, poll_interval, debug)
+    inventory = LiveInventory(scanner, local_repo_dir, jobs, executor)
+    try:
+        start = time.perf_counter()
+        inventory.load()
+        click.echo(f"Inventory of {inventory.status()['artifacts']} artifacts loaded in "
+                   f"{time.perf_counter() - start:.1f}s, listening on {socket_path}")
+        serve_inventory(inventory, socket_path, watcher, debug)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        scanner.close()
+
+
+@cli.command()
+@click.option('-r', '--local-repo-dir', help='Path to Maven repository, default: ~/.m2/repository')
+@click.option('-d', '--debug', is_flag=True, help='Enable debug mode to suppress exceptions and error messages.')
+@click.option('--index', 'use_index', is_flag=True, help='Use a persistent scan index and keep file hashes in it, so '
+                                                         'unchanged files are not hashed again.')
+@click.option('--index-file', default=None, help='Path to the scan index, default: ~/.m2/.mvn-scn-index')
+@click.option('-j', '--jobs', default=DEFAULT_HASH_JOBS, type=int, help='Number of files hashed at the same time, '
+                                                                        'default: number of CPUs')
+@click.option('-g', '--group', 'groups', multiple=True, help='Check only this groupId and its sub groups, or with '
+                                                               '--artifact only the artifacts directly in this '
+                                                               'groupId. Can be repeated and set with wildcard, eg. '
+                                                               '"org.spring*".')
+@click.option('-a', '--artifact', 'artifacts', multiple=True, help='Check only this artifactId, can be repeated and '
+                                                                  'set with wildcard.')
+def verify(local_repo_dir, debug, use_index, index_file, jobs, groups, artifacts):
+    """
+    Check artifacts against their .sha1 files, find corrupted archives and byte-identical duplicates.
+    """
+    report = check_artifacts(local_repo_dir, debug, use_index, index_file, jobs, groups, artifacts)
+    print_verify_report(report)
+    if not report.ok:
+        sys.exit(1)
+
+
+@cli.command()
+@click.option('-r', '--local-repo-dir', help='Path to Maven repository, default: ~/.m2/repository')
+@click.option('-d', '--debug', is_flag=True, help='Enable debug mode to suppress exceptions and error messages.')
+@click.option('--index', 'use_index', is_flag=True, help='Use a persistent scan index and keep file hashes in it, so '
+                                                         'unchanged files are not hashed again.')
+@click.option('--index-file', default=None, help='Path to the scan index, default: ~/.m2/.mvn-scn-index')
+@click.option('-j', '--jobs', default=DEFAULT_HASH_JOBS, type=int, help='Number of files hashed at the same time, '
+                                                                        'default: number of CPUs')
+@click.option('-g', '--group', 'groups', multiple=True, help='Check only this groupId and its sub groups, or with '
+                                                               '--artifact only the artifacts directly in this '
+                                                               'groupId. Can be repeated and set with wildcard, eg. '
+                                                               '"org.spring*".')
+@click.option('-a', '--artifact', 'artifacts', multiple=True, help='Check only this artifactId, can be repeated and '
+                                                                  'set with wildcard.')
+def dedupe(local_repo_dir, debug, use_index, index_file, jobs, groups, artifacts):
+    """
+    Find byte-identical artifacts stored under different coordinates.
+    """
+    report = check_artifacts(local_repo_dir, debug, use_index, index_file, jobs, groups, artifacts,
+                             check_sidecars=False)
+    print_verify_report(report)
+
+
+def check_artifacts(local_repo_dir, debug, use_index=False, index_file=None, jobs=DEFAULT_HASH_JOBS, groups=(),
+                    artifacts=(), check_sidecars=True):
+    """
+    Scan the repository and run verify_artifacts on the artifacts found, with hashes cached in the scan index
+    when one is used. Return the VerifyReport.
+    """
+    scanner = scan_repo(local_repo_dir, debug, use_index, index_file, DependencyFilter(artifacts=artifacts), groups,
+                        artifacts)
+    try:
+        file_paths = [os.path.join(dir_path, filename) for filename, dir_path in scanner.artifacts()]
+        return verify_artifacts(file_paths, jobs, check_sidecars, cache=HashCache(scanner.index))
+    finally:
+        scanner.close()
+
+
+def print_verify_report(report):
+    for file_path, reason in report.corrupted:
+        print(f"Corrupted: {file_path}: {reason}")
+    for file_path, expected, actual in report.mismatched:
+        print(f"Mismatched: {file_path}: .sha1 file has {expected}, content is {actual}")
+    for group in report.duplicates:
+        print("Duplicates:")
+        for file_path in group:
+            print(f"    {file_path}")
+    print(report.summary())
+
+
+@cli.command()
+@click.option('-r', '--local-repo-dir', help='Path to Maven repository, default: ~/.m2/repository')
+@click.option('-d', '--debug', is_flag=True, help='Enable debug mode to suppress exceptions and error messages.')
+@click.option('--index', 'use_index', is_flag=True, help='Use a persistent scan index and rescan only changed '
+                                                         'directories.')
+@click.option('--index-file', default=None, help='Path to the scan index, default: ~/.m2/.mvn-scn-index')
+@click.option('-j', '--jobs', default=1, type=int, help='Number of parallel workers used to parse pom files, '
+                                                      'default: 1')
+@click.option('--executor', default='thread', type=click.Choice(EXECUTORS), help='Parallel workers type: thread '
+                                                                                 '(I/O bound, eg. NFS) or process '
+                                                                                 '(CPU bound pom parsing)')
+@click.option('--dependencies-of', multiple=True, help='Print what this groupId:artifactId:version depends on, '
+                                                       'directly or transitively, can be repeated.')
+@click.option('--dependents-of', multiple=True, help='Print what depends on this groupId:artifactId:version, '
+                                                     'directly or transitively, can be repeated.')
+@click.option('--scope', 'scopes', multiple=True, type=click.Choice(SCOPES), help='Follow only dependencies of this '
+                                                                                  'scope, can be repeated, default: '
+                                                                                  f'{", ".join(TRANSITIVE_SCOPES)}')
+@click.option('--include-optional', is_flag=True, help='Follow optional dependencies too.')
+@click.option('--missing', 'show_missing', is_flag=True, help='Print the dependencies that are not in the repository.')
+@click.option('--stats', 'show_stats', is_flag=True, help='Print stage durations, counters, cache hit rates and errors '
+                                                         'of the run to stderr.')
+def graph(local_repo_dir, debug, use_index, index_file, jobs, executor, dependencies_of, dependents_of, scopes,
+          include_optional, show_missing, show_stats):
+    """
+    Build the dependency graph of the repository from the poms and query it.
+    """
+    try:
+        queries = [(parse_coordinate(value), False) for value in dependencies_of] + \
+                  [(parse_coordinate(value), True) for value in dependents_of]
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    start = time.perf_counter()
+    scanner = scan_repo(local_repo_dir, debug, use_index, index_file, collect_dependencies=True)
+    try:
+        dependency_graph = build_dependency_graph(scanner, jobs, executor)
+    finally:
+        scanner.close()
+    scanner.stats.add_duration('total', time.perf_counter() - start)
+    report_stats(scanner.stats, show_stats)
+
+    scopes = scopes or TRANSITIVE_SCOPES
+    for coordinate, reverse in queries:
+        if coordinate not in dependency_graph:
+            click.echo(f"Not in the repository: {format_coordinate(coordinate)}", err=True)
+        if reverse:
+            found = dependency_graph.reverse_closure([coordinate], scopes, include_optional)
+            print(f"Depending on {format_coordinate(coordinate)}:")
+        else:
+            found = dependency_graph.closure([coordinate], scopes, include_optional)
+            print(f"Dependencies of {format_coordinate(coordinate)}:")
+        for other in sorted(found - {coordinate}):
+            print(f"    {format_coordinate(other)}{'' if other in dependency_graph else ' (missing)'}")
+    if show_missing:
+        print("Not in the repository:")
+        for coordinate in dependency_graph.missing():
+            print(f"    {format_coordinate(coordinate)}")
+    missing = len(dependency_graph.missing())
+    print(f"Artifacts: {len(dependency_graph) - missing}, dependencies: {dependency_graph.edges}, "
+          f"missing artifacts: {missing}")
+
+
+@cli.command()
+@click.option('-r', '--local-repo-dir', help='Path to Maven repository, default: ~/.m2/repository')
+@click.option('-j', '--jobs', default=DEFAULT_USAGE_JOBS, type=int, help='Number of directory trees walked at the '
+                                                                        f'same time, default: {DEFAULT_USAGE_JOBS}')
+@click.option('-n', '--top', default=20, type=int, help='Number of groups, artifacts and versions listed, default: 20')
+def analyze(local_repo_dir, jobs, top):
+    """
+    Report the disk usage of the repository per groupId, artifact and version and its least recently downloaded
+    versions.
+    """
+    start = time.perf_counter()
+    usage = scan_usage(repo_dir(local_repo_dir), jobs)
+    print("Largest groups:")
+    for group_id, (size, files) in largest(usage.by_group(), top):
+        print(f"    {format_size(size):>10}  {files:>7} files  {group_id}")
+    print("Largest artifacts:")
+    for (group_id, artifact_id), (size, files) in largest(usage.by_artifact(), top):
+        print(f"    {format_size(size):>10}  {files:>7} files  {group_id}:{artifact_id}")
+    print("Largest versions:")
+    for version in sorted(usage.versions, key=lambda version: -version.size)[:top]:
+        print(f"    {format_size(version.size):>10}  {version.files:>7} files  {format_version(version)}")
+    print("Least recently downloaded versions:")
+    for version in usage.stalest(top):
+        print(f"    {format_time(version.last_used)}  {format_size(version.size):>10}  {format_version(version)}")
+    print(f"Total: {format_size(usage.size)} in {usage.files} files, {len(usage.versions)} versions, "
+          f"scanned in {time.perf_counter() - start:.1f}s")
+
+
+@cli.command()
+@click.option('-r', '--local-repo-dir', help='Path to Maven repository, default: ~/.m2/repository')
+@click.option('-j', '--jobs', default=DEFAULT_USAGE_JOBS, type=int, help='Number of directory trees walked at the '
+                                                                        f'same time, default: {DEFAULT_USAGE_JOBS}')
+@click.option('--keep', default=1, type=int, help='Number of most recently downloaded SNAPSHOT versions kept per '
+                                                  'artifact, default: 1')
+@click.option('--older-than', default=30, type=int, help='Delete only SNAPSHOT versions downloaded more than this '
+                                                         'number of days ago, default: 30')
+@click.option('--dry-run', is_flag=True, help='List the versions that would be deleted without deleting them.')
+@click.option('-y', '--yes', 'assume_yes', is_flag=True, help='Delete without asking for confirmation.')
+def prune(local_repo_dir, jobs, keep, older_than, dry_run, assume_yes):
+    """
+    Delete old SNAPSHOT versions past the retention policy.
+    """
+    usage = scan_usage(repo_dir(local_repo_dir), jobs)
+    versions = snapshots_to_prune(usage, keep, older_than)
+    if not versions:
+        print("No SNAPSHOT versions to prune.")
+        return
+    print("The following SNAPSHOT versions will be deleted:")
+    for version in versions:
+        print(f"    {format_time(version.last_used)}  {format_size(version.size):>10}  {format_version(version)}")
+    total = sum(version.size for version in versions)
+    print(f"{len(versions)} versions, {format_size(total)}")
+    if dry_run:
+        return
+    if assume_yes or input("Do you want to delete these versions? (y/n): ").lower() == 'y':
+        freed, errors = remove_versions(versions)
+        for path, error in errors:
+            print(f"Error deleting {path}: {error}")
+        print(f"Freed {format_size(freed)}")
+
+
+@cli.command()
+@click.argument('old_inventory', type=click.Path(exists=True, dir_okay=False))
+@click.argument('new_inventory', type=click.Path(exists=True, dir_okay=False))
+@click.option('--summary', 'summary_only', is_flag=True, help='Print only the number of added, removed and '
+                                                              're-sourced artifacts.')
+def diff(old_inventory, new_inventory, summary_only):
+    """
+    Compare two inventories saved by list-dependencies as jsonl, sqlite, csv or tsv. Print the artifacts added
+    (+), removed (-) and re-sourced (~), ie. downloaded from another repository.
+    """
+    start = time.perf_counter()
+    old = load_inventory(old_inventory)
+    new = load_inventory(new_inventory)
+    differences = diff_inventories(old, new)
+    if not summary_only:
+        for coordinate in differences.added:
+            click.echo(f"+ {format_artifact(coordinate)}  {new[coordinate]}")
+        for coordinate in differences.removed:
+            click.echo(f"- {format_artifact(coordinate)}  {old[coordinate]}")
+        for coordinate, old_url, new_url in differences.resourced:
+            click.echo(f"~ {format_artifact(coordinate)}  {old_url} -> {new_url}")
+    click.echo(f"{differences.summary()} ({len(old)} -> {len(new)} artifacts, "
+               f"{time.perf_counter() - start:.2f}s)")
+
+
+def repo_dir(local_repo_dir):
+    return local_repo_dir or os.path.join(os.path.expanduser("~"), ".m2", "repository")
+
+
+def format_version(version):
+    return f"{version.group_id}:{version.artifact_id}:{version.version}"
+
+
+def format_time(timestamp):
+    return datetime.utcfromtimestamp(int(timestamp)).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def build_dependency_graph(scanner, jobs=1, executor='thread'):
+    """
+    Parse the poms of all scanned directories, including pom only ones such as parents and BOMs, with their
+    dependencies and return the DependencyGraph of the repository. The scanner must collect dependencies.
+    """
+    dependency_graph = DependencyGraph()
+    dir_paths = [dir_path for dir_path, record in scanner.dir_records.items() if record.poms]
+    for pom_data in parse_directories(scanner, dir_paths, jobs, executor, 'parse_pom_file'):
+        if pom_data:
+            scanner.stats.count('dependencies_unversioned', dependency_graph.add_pom(pom_data))
+    return dependency_graph
+
+
+def add_transitive_dependencies(scanner, inventory, dependency_graph, jobs=1, executor='thread'):
+    """
+    Add the artifacts that the artifacts of inventory depend on, directly or transitively, to inventory, and
+    return their number. dependency_graph holds the dependencies of the listed artifacts; dependencies outside of
+    the listed ones, eg. from other groups or repositories, are looked up in the repository by their coordinates
+    and their poms are parsed for further dependencies as they are found.
+    """
+    maven_repo_path = scanner.get_maven_repo_path()
+    roots = {(record.group_id, record.artifact_id, record.version) for record in inventory}
+    # Coordinates whose directory was already looked up
+    checked = set(dependency_graph) | roots
+    added = 0
+    while True:
+        pending = sorted(dependency_graph.closure(roots) - checked)
+        if not pending:
+            return added
+        checked.update(pending)
+        dir_paths = []
+        for coordinate in pending:
+            dir_path = os.path.dirname(pom_path(maven_repo_path, *coordinate))
+            if dir_path not in scanner.dir_records:
+                record = classify_entries(dir_path, list_directory(dir_path)[1])
+                if record is None:
+                    continue
+                scanner.dir_records[dir_path] = record
+            dir_paths.append(dir_path)
+        for dir_path, (pom_data, last_update_data) in zip(dir_paths, parse_directories(scanner, dir_paths, jobs,
+                                                                                       executor)):
+            if not pom_data:
+                continue
+            dependency_graph.add_pom(pom_data)
+            for filename in scanner.dir_records[dir_path].artifacts:
+                inventory.add(ArtifactRecord.from_parsed(filename, dir_path, pom_data, last_update_data))
+                added += 1
+
+
+def stream_repo(local_repo_dir, debug, use_index=False, index_file=None, dependency_filter=None, groups=(),
+                artifacts=(), engine='sync', in_flight=DEFAULT_IN_FLIGHT, collect_dependencies=False):
+    """
+    Create the scanner and start a lazy scan of the repository. Return the scanner and an iterator of
+    (filename, dir_path) tuples of the artifacts found. With collect_dependencies, the scanner reads the
+    dependencies of poms along with their coordinates.
+    """
+    local_repo_dir = repo_dir(local_repo_dir)
+    index = None
+    if use_index:
+        index = ScanIndex(index_file or default_index_path(local_repo_dir), local_repo_dir)
+    scanner = MavenScanner(debug, index, AsyncEngine(in_flight) if engine == 'async' else None, collect_dependencies)
+    sub_dirs = subtree_roots(local_repo_dir, groups, artifacts) if groups else None
+    return scanner, scanner.iter_maven_repo_artifacts(local_repo_dir, dependency_filter, sub_dirs)
+
+
+def scan_repo(local_repo_dir, debug, use_index=False, index_file=None, dependency_filter=None, groups=(),
+              artifacts=(), engine='sync', in_flight=DEFAULT_IN_FLIGHT, collect_dependencies=False):
+    scanner, found = stream_repo(local_repo_dir, debug, use_index, index_file, dependency_filter, groups, artifacts,
+                                 engine, in_flight, collect_dependencies)
+    for _ in found:
+        pass
     return scanner
 
 
-def filter_dependencies(scanner, filter_repo, filter_filename):
-    dependencies = []
-    for filename, dir_path in scanner.jar_dir_dict.items():
-        pom_data = scanner.parse_pom_file(dir_path)
+def scan_roots(roots, root_jobs=DEFAULT_ROOT_JOBS, debug=False, filter_repo='all', filter_filename='all',
+               filter_group='all', use_index=False, jobs=1, executor='thread', engine='sync',
+               in_flight=DEFAULT_IN_FLIGHT, groups=(), artifacts=()):
+    """
+    Scan each of the repositories of roots in its own process, root_jobs at the same time, and merge the listed
+    artifacts. Return a MergedInventory, holding the artifacts in the order of roots, and the ScanStats of all the
+    scans. A repository that does not exist is reported and skipped.
+    """
+    if executor == 'process':
+        # Each root already has its own process, its pom files are parsed by threads
+        executor = 'thread'
+    scan = partial(_scan_root, debug=debug, filter_repo=filter_repo, filter_filename=filter_filename,
+                   filter_group=filter_group, use_index=use_index, jobs=jobs, executor=executor, engine=engine,
+                   in_flight=in_flight, groups=groups, artifacts=artifacts)
+    inventory = MergedInventory()
+    stats = ScanStats()
+    with ProcessPoolExecutor(max(1, min(root_jobs, len(roots)))) as pool:
+        # Results come in the order of roots, so the representative record of an artifact does not depend on
+        # which scan finished first
+        for root, records, root_stats in pool.map(scan, roots):
+            stats.merge(root_stats)
+            stats.count('roots_scanned')
+            with stats.timer('merge'):
+                for record in records:
+                    inventory.add(root, record)
+    stats.count('artifacts_merged', len(inventory))
+    return inventory, stats
+
+
+def _scan_root(root, debug=False, filter_repo='all', filter_filename='all', filter_group='all', use_index=False,
+               jobs=1, executor='thread', engine='sync', in_flight=DEFAULT_IN_FLIGHT, groups=(), artifacts=()):
+    # Runs in a worker process of scan_roots, the records are sent back to the parent process
+    dependency_filter = DependencyFilter(filter_repo, filter_filename, filter_group, artifacts)
+    try:
+        scanner, found = stream_repo(root, debug, use_index, None, dependency_filter, groups, artifacts, engine,
+                                     in_flight)
+    except FileNotFoundError:
+        print(f"Maven repository path does not exist: {root}", file=sys.stderr)
+        stats = ScanStats()
+        stats.error('repository_missing')
+        return root, [], stats
+    if engine == 'async':
+        jobs, executor = in_flight, ASYNC_EXECUTOR
+    try:
+        records = list(iter_dependencies(scanner, found, dependency_filter, jobs, executor))
+    finally:
+        scanner.close()
+    return root, records, scanner.stats
+
+
+def filter_dependencies(scanner, filter_repo, filter_filename, jobs=1, executor='thread', filter_group='all'):
+    """
+    Parse and filter the artifacts of a completed scan and return them as an ArtifactIndex.
+    """
+    dependency_filter = DependencyFilter(filter_repo, filter_filename, filter_group)
+    return ArtifactIndex(iter_dependencies(scanner, scanner.artifacts(dependency_filter), dependency_filter, jobs,
+                                           executor))
+
+
+def iter_dependencies(scanner, artifacts, dependency_filter, jobs=1, executor='thread', batch_size=PARSE_BATCH_SIZE,
+                      graph=None):
+    """
+    Turn (filename, dir_path) tuples of scanned artifacts into ArtifactRecords, keeping their order. The artifacts
+    are expected to match the filename and groupId patterns of dependency_filter already, as found by a walk with
+    the filter; its repository filter is applied here.
+    Artifacts are taken in batches of directories which are filtered and parsed (in parallel with jobs > 1),
+    so the first dependencies are produced long before the whole repository has been walked.
+    The poms of the records are added to graph, a DependencyGraph, when given and the scanner collects
+    dependencies. All the batches are parsed by one pool of workers.
+    """
+    pool = create_pool(scanner, jobs, executor)
+    try:
+        batch = []
+        batch_dirs = set()
+        for filename, dir_path in artifacts:
+            if dir_path not in batch_dirs and len(batch_dirs) >= batch_size:
+                yield from _parse_batch(scanner, batch, dependency_filter, jobs, executor, graph, pool)
+                batch = []
+                batch_dirs = set()
+            batch.append((filename, dir_path))
+            batch_dirs.add(dir_path)
+        yield from _parse_batch(scanner, batch, dependency_filter, jobs, executor, graph, pool)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def _parse_batch(scanner, artifacts, dependency_filter, jobs, executor, graph=None, pool=None):
+    # Each directory is parsed once, even when it holds several artifacts
+    dir_paths = list(dict.fromkeys(dir_path for _, dir_path in artifacts))
+
+    if dependency_filter.filters_repo:
+        # Repository filter needs only the lastUpdated file, poms are parsed for matching directories only
+        last_updated = parse_directories(scanner, dir_paths, jobs, executor, 'parse_last_updated_file', pool)
+        with scanner.stats.timer('filter'):
+            matching = {dir_path: last_update_data for dir_path, last_update_data in zip(dir_paths, last_updated)
+                        if dependency_filter.matches_repo(last_update_data['repository_url']
+                                                          if last_update_data else "")}
+        scanner.stats.count('directories_filtered_out', len(dir_paths) - len(matching))
+        poms = parse_directories(scanner, list(matching), jobs, executor, 'parse_pom_file', pool)
+        parsed = {dir_path: (pom_data, matching[dir_path]) for dir_path, pom_data in zip(matching, poms)}
+    else:
+        parsed = dict(zip(dir_paths, parse_directories(scanner, dir_paths, jobs, executor, pool=pool)))
+
+    if graph is not None:
+        for pom_data, _ in parsed.values():
+            if pom_data:
+                graph.add_pom(pom_data)
+
+    for filename, dir_path in artifacts:
+        if dir_path not in parsed:
+            continue
+        pom_data, last_update_data = parsed[dir_path]
         if pom_data:
-            last_update_data = scanner.parse_last_updated_file(dir_path)
-            repo_url = last_update_data['repository_url'] if last_update_data else ""
-            update_date = last_update_data['update_date'] if last_update_data else ""
-            if (filter_repo == 'all' or filter_repo in repo_url) and (filter_filename == 'all' or filter_filename in filename):
-                dependencies.append({
-                    'groupId': pom_data['groupId'],
-                    'artifactId': pom_data['artifactId'],
-                    'version': pom_data['version'],
-                    'repository_url': repo_url,
-                    'last_update': update_date,
-                    'filename': filename,
-                    'file_path': os.path.join(dir_path, filename)
-                })
-    return dependencies
-
-
-def print_dependencies(dependencies):
-    if dependencies:
-        headers = ['GroupID', 'ArtifactID', 'Version', 'RepositoryURL', 'LastUpdate', 'FileName', 'FilePath']
-        table = [[d['groupId'], d['artifactId'], d['version'], d['repository_url'], d['last_update'], d['filename'], d['file_path']] for d in dependencies]
-        print(tabulate(table, headers=headers, tablefmt="plain"))
+            scanner.stats.count('artifacts_listed')
+            yield ArtifactRecord.from_parsed(filename, dir_path, pom_data, last_update_data)
+
+
+def start_profiler(profile_file):
+    """
+    Start profiling the run when profile_file is set and return the profiler, None otherwise.
+    """
+    if not profile_file:
+        return None
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def report_stats(stats, show_stats=False, stats_json=None, profiler=None, profile_file=None):
+    """
+    Write the profile and the run statistics as requested by the --profile, --stats and --stats-json options.
+    The summary goes to stderr, so it does not mix with dependencies listed on stdout.
+    """
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(profile_file)
+        click.echo(f"Profile written to {profile_file}", err=True)
+    if show_stats:
+        click.echo(stats.summary(), err=True)
+    if stats_json:
+        with click.open_file(stats_json, 'w') as file:
+            file.write(stats.to_json() + '\n')
+
+
+def _peek(iterable):
+    """
+    Return the first item of iterable (None when it is empty) and an iterator over all its items.
+    """
+    iterator = iter(iterable)
+    for first in iterator:
+        return first, chain([first], iterator)
+    return None, iterator
+
+
+def print_dependencies(dependencies, columns=COLUMNS):
+    first, dependencies = _peek(dependencies)
+    if first is not None:
+        write_table(dependencies, sys.stdout, columns=columns)
     else:
         print("No dependencies found.")
 
 
-def save_to_csv(dependencies, output_file):
-    if dependencies:
-        output_file_path = os.path.join(output_file, 'dependencies.csv')
+def print_tsv(dependencies, columns=COLUMNS):
+    first, dependencies = _peek(dependencies)
+    if first is not None:
+        write_tsv(dependencies, sys.stdout, columns)
+    else:
+        print("No dependencies found.")
+
+
+def save_to_file(dependencies, output_file, output_type='csv', columns=COLUMNS):
+    """
+    Export dependencies to the EXPORT_FILES file of output_type in the output_file directory.
+    """
+    first, dependencies = _peek(dependencies)
+    if first is not None:
+        output_file_path = os.path.join(output_file, EXPORT_FILES[output_type])
         try:
-            with open(output_file_path, mode='w', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow(['Sep=,'])
-                writer.writerow(['GroupID', 'ArtifactID', 'Version', 'RepositoryURL', 'LastUpdate', 'FileName', 'FilePath'])
-                for dependency in dependencies:
-                    writer.writerow([dependency['groupId'], dependency['artifactId'], dependency['version'],
-                                     dependency['repository_url'], dependency['last_update'],
-                                     dependency['filename'], dependency['file_path']])
+            if output_type == 'sqlite':
+                connection = sqlite3.connect(output_file_path, isolation_level=None)
+                try:
+                    write_sqlite(dependencies, connection, columns)
+                finally:
+                    connection.close()
+            else:
+                with open(output_file_path, mode='w', newline='', encoding='utf-8') as file:
+                    if output_type == 'jsonl':
+                        write_jsonl(dependencies, file, columns)
+                    else:
+                        write_csv(dependencies, file, columns)
             print(f"Dependencies list exported to {output_file_path}")
         except Exception as e:
             print(f"Error saving file {output_file_path}: {e}")
@@ -102,39 +820,70 @@ def save_to_csv(dependencies, output_file):
         print("No dependencies found.")
 
 
-def deploy_dependencies(dependencies, dst_repository_id, dst_repository_url):
+def deploy_dependencies(dependencies, dst_repository_id, dst_repository_url, backend='mvn', settings_file=None,
+                        jobs=1, retries=DEFAULT_RETRIES, journal_file=None, assume_yes=False, skip_existing=False,
+                        retry_mvn=False):
 
-    # Check if Maven is installed
-    result = os.system(f"mvn --version")
-    if result != 0:
-        print("Maven is not installed or not available in the system.")
-        return
+    if backend == 'mvn':
+        # Check if Maven is installed
+        result = os.system(f"mvn --version")
+        if result != 0:
+            print("Maven is not installed or not available in the system.")
+            return
 
     if dependencies:
         print("The following dependencies will be deployed:")
         print_dependencies(dependencies)
-        if input("Do you want to deploy these dependencies? (y/n): ").lower() == 'y':
-            for dependency in dependencies:
-                group_id = dependency['groupId']
-                artifact_id = dependency['artifactId']
-                version = dependency['version']
-                file_path = dependency['file_path']
-                print(f"\nDeploying {dependency['filename']} to repository ID: {dst_repository_id}\n")
-                # Execute deployment command using os.system
-                deploy_command = f"mvn deploy:deploy-file -DgroupId={group_id} -DartifactId={artifact_id} " \
-                                 f"-Dversion={version} -Dpackaging=jar -Dfile={file_path} " \
-                                 f"-DrepositoryId={dst_repository_id} -Durl={dst_repository_url} " \
-                                 f"-DgeneratePom=true"
-                print(deploy_command)
-                # Execute deployment command using os.system
-                result = os.system(deploy_command)
-                if result != 0:
-                    print(f"\nError deploying {dependency['filename']}. Command exited with status {result}\n")
+        if assume_yes or input("Do you want to deploy these dependencies? (y/n): ").lower() == 'y':
+            journal = DeployJournal(journal_file) if journal_file else None
+            deployer = None
+            if backend == 'http' or skip_existing:
+                # Credentials of the repository id are taken from settings.xml, like mvn deploy does. The HTTP client
+                # uploads with the http backend and checks the repository content with --skip-existing
+                username, password = read_server_credentials(dst_repository_id, settings_file) or (None, None)
+                deployer = HttpDeployer(dst_repository_url, username, password)
+            try:
+                if backend == 'http':
+                    deploy_one = partial(deploy_with_http, deployer, dst_repository_id)
                 else:
-                    print(f"\nDeployed {dependency['filename']} to repository ID: {dst_repository_id}\n")
+                    deploy_one = partial(deploy_with_mvn, dst_repository_id, dst_repository_url, retry=retry_mvn)
+                report = run_deploys(dependencies, deploy_one, dst_repository_url, jobs, retries, journal=journal,
+                                     compare_remote=deployer.compare_remote if skip_existing else None)
+            finally:
+                if deployer is not None:
+                    deployer.close()
+                if journal is not None:
+                    journal.close()
+            print(report.summary())
     else:
         print("No dependencies found to deploy.")
 
 
+def deploy_with_mvn(dst_repository_id, dst_repository_url, dependency, retry=False):
+    group_id = dependency['groupId']
+    artifact_id = dependency['artifactId']
+    version = dependency['version']
+    file_path = dependency['file_path']
+    print(f"\nDeploying {dependency['filename']} to repository ID: {dst_repository_id}\n")
+    # Execute deployment command using os.system
+    deploy_command = f"mvn deploy:deploy-file -DgroupId={group_id} -DartifactId={artifact_id} " \
+                     f"-Dversion={version} -Dpackaging=jar -Dfile={file_path} " \
+                     f"-DrepositoryId={dst_repository_id} -Durl={dst_repository_url} " \
+                     f"-DgeneratePom=true"
+    print(deploy_command)
+    # Execute deployment command using os.system
+    result = os.system(deploy_command)
+    if result != 0:
+        raise DeployError(f"Command exited with status {result}", transient=retry)
+    print(f"\nDeployed {dependency['filename']} to repository ID: {dst_repository_id}\n")
+
+
+def deploy_with_http(deployer, dst_repository_id, dependency):
+    print(f"\nDeploying {dependency['filename']} to repository ID: {dst_repository_id}\n")
+    remote_path = deployer.deploy(dependency)
+    print(f"\nDeployed {dependency['filename']} to repository ID: {dst_repository_id} as {remote_path}\n")
+    return remote_path
+
+
 if __name__ == '__main__':
     cli()
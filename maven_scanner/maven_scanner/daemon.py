@@ -0,0 +1,271 @@
+"""Daemon keeping a live inventory of a Maven repository and answering queries over a Unix socket."""
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from maven_scanner.filters import DependencyFilter, in_subtrees, subtree_patterns
+from maven_scanner.parallel import parse_directories
+from maven_scanner.records import ArtifactRecord
+from maven_scanner.walker import classify_entries, list_directory, walk_repository
+
+SOCKET_FILE_NAME = '.mvn-scn.sock'
+DEFAULT_TIMEOUT = 60.0
+# Changes are collected until none came for this number of seconds, so a download touching several files of a
+# directory is handled at once
+SETTLE_TIME = 0.2
+
+
+def default_socket_path(maven_repo_path):
+    """
+    Return the default socket location: next to the repository directory, eg. ~/.m2/.mvn-scn.sock
+    """
+    return os.path.join(os.path.dirname(os.path.abspath(maven_repo_path)), SOCKET_FILE_NAME)
+
+
+class LiveInventory:
+    """
+    ArtifactRecords of all artifacts of a repository, kept per directory so that a change re-parses only the
+    directories it touched. The inventory is read by the server threads while refresh() updates it.
+    """
+
+    def __init__(self, scanner, maven_repo_path, jobs=1, executor='thread'):
+        self.scanner = scanner
+        self.maven_repo_path = maven_repo_path
+        self.jobs = jobs
+        self.executor = executor
+        self.updates = 0
+        self._records = {}
+        self._sorted_dirs = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """
+        Scan and parse the whole repository.
+        """
+        self.scanner.scan_maven_repo_for_dependencies(self.maven_repo_path)
+        self._parse(sorted(set(dir_path for _, dir_path in self.scanner.artifacts())))
+
+    def _parse(self, dir_paths):
+        parsed = parse_directories(self.scanner, dir_paths, self.jobs, self.executor)
+        with self._lock:
+            for dir_path, (pom_data, last_update_data) in zip(dir_paths, parsed):
+                record = self.scanner.dir_records.get(dir_path)
+                if pom_data and record is not None and record.artifacts:
+                    self._records[dir_path] = [ArtifactRecord.from_parsed(filename, dir_path, pom_data,
+                                                                          last_update_data)
+                                               for filename in record.artifacts]
+                else:
+                    self._records.pop(dir_path, None)
+            self._sorted_dirs = None
+
+    def refresh(self, changed=(), created=()):
+        """
+        Bring the inventory up to date: changed directories are listed again, created ones are walked with their
+        sub trees, and directories that no longer exist are dropped with their sub trees. Return the number of
+        directories parsed again.
+        """
+        to_parse = []
+        created = set(created)
+        for dir_path in sorted(set(changed) | created):
+            if not os.path.isdir(dir_path):
+                self._forget(dir_path)
+                continue
+            if dir_path in created:
+                records = list(walk_repository(dir_path))
+            else:
+                record = classify_entries(dir_path, list_directory(dir_path)[1])
+                records = [record] if record is not None else []
+                if record is None:
+                    self._forget(dir_path, sub_dirs=False)
+            for record in records:
+                self.scanner.dir_records[record.path] = record
+                to_parse.append(record.path)
+        self._parse(to_parse)
+        self.updates += 1
+        return len(to_parse)
+
+    def _forget(self, dir_path, sub_dirs=True):
+        prefix = dir_path + os.sep
+        with self._lock:
+            for records in (self._records, self.scanner.dir_records):
+                for path in [path for path in records if path == dir_path or sub_dirs and path.startswith(prefix)]:
+                    del records[path]
+            self._sorted_dirs = None
+
+    def query(self, dependency_filter=None, groups=(), artifacts=()):
+        """
+        Return the records matching dependency_filter, a DependencyFilter, and in the sub trees of groups and
+        artifacts if groups are given, like a scan of subtree_roots, in the order of a repository scan.
+        """
+        patterns = subtree_patterns(groups, artifacts)
+        with self._lock:
+            if self._sorted_dirs is None:
+                # Depth-first sorted order of walk_repository
+                self._sorted_dirs = sorted(self._records, key=lambda path: path.split(os.sep))
+            selected = [(dir_path, self._records[dir_path]) for dir_path in self._sorted_dirs]
+        results = []
+        for dir_path, records in selected:
+            if patterns and not in_subtrees(self.maven_repo_path, dir_path, patterns):
+                continue
+            for record in records:
+                if dependency_filter is None or (
+                        dependency_filter.matches_artifact(self.maven_repo_path, dir_path, record.filename) and
+                        dependency_filter.matches_repo(record.repository_url or '')):
+                    results.append(record)
+        return results
+
+    def status(self):
+        with self._lock:
+            return {'directories': len(self._records), 'artifacts': sum(map(len, self._records.values())),
+                    'updates': self.updates}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """
+    Reads one JSON request line and writes a JSON status line, followed for 'list' requests by one JSON line per
+    dependency.
+    """
+
+    def handle(self):
+        server = self.server
+        try:
+            request = json.loads(self.rfile.readline())
+            if os.path.abspath(request.get('repository', '')) != os.path.abspath(server.inventory.maven_repo_path):
+                raise ValueError(f"Serving another repository: {server.inventory.maven_repo_path}")
+            command = request.get('command')
+            if command == 'list':
+                dependency_filter = DependencyFilter(request.get('filter_repo', 'all'),
+                                                     request.get('filter_filename', 'all'),
+                                                     request.get('filter_group', 'all'), request.get('artifacts', ()))
+                records = server.inventory.query(dependency_filter, request.get('groups', ()),
+                                                 request.get('artifacts', ()))
+                self._send({'ok': True, 'count': len(records)})
+                self.wfile.writelines(json.dumps(record.as_dict()).encode() + b'\n' for record in records)
+            elif command == 'status':
+                self._send(dict(server.inventory.status(), ok=True))
+            elif command == 'stop':
+                self._send({'ok': True})
+                server.stopped.set()
+            else:
+                raise ValueError(f"Unknown command: {command}")
+        except (ValueError, AttributeError) as e:
+            self._send({'ok': False, 'error': str(e)})
+
+    def _send(self, message):
+        self.wfile.write(json.dumps(message).encode() + b'\n')
+
+
+class InventoryServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix socket server answering queries on a LiveInventory, one thread per connection.
+    """
+    daemon_threads = True
+
+    def __init__(self, socket_path, inventory):
+        if os.path.exists(socket_path):
+            if is_daemon_running(socket_path):
+                raise OSError(f"A daemon is already listening on {socket_path}")
+            # Left over by a daemon that did not stop cleanly
+            os.unlink(socket_path)
+        super().__init__(socket_path, _RequestHandler)
+        self.socket_path = socket_path
+        self.inventory = inventory
+        self.stopped = threading.Event()
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+
+def serve_inventory(inventory, socket_path, watcher, debug=False):
+    """
+    Answer queries on socket_path and apply the changes reported by watcher to inventory until a 'stop' request
+    is received or the process is interrupted.
+    """
+    server = InventoryServer(socket_path, inventory)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        while not server.stopped.is_set():
+            changed, created = watcher.wait(1.0)
+            if not (changed or created):
+                continue
+            while True:
+                more_changed, more_created = watcher.wait(SETTLE_TIME)
+                if not (more_changed or more_created):
+                    break
+                changed |= more_changed
+                created |= more_created
+            start = time.perf_counter()
+            parsed = inventory.refresh(changed, created)
+            if debug:
+                print(f"Updated {parsed} directories in {time.perf_counter() - start:.3f}s")
+    finally:
+        server.shutdown()
+        server.server_close()
+        watcher.close()
+
+
+def _request(socket_path, request, timeout=DEFAULT_TIMEOUT):
+    """
+    Send request to the daemon and return its status line and the file the rest of the response is read from,
+    or None when no daemon listens on socket_path.
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    try:
+        client.connect(socket_path)
+    except OSError:
+        client.close()
+        return None
+    with client:
+        client.sendall(json.dumps(request).encode() + b'\n')
+        response = client.makefile('rb')
+    status = json.loads(response.readline() or b'null')
+    return status, response
+
+
+def is_daemon_running(socket_path):
+    answer = _request(socket_path, {'command': 'ping'}, timeout=1.0)
+    if answer is None:
+        return False
+    answer[1].close()
+    return True
+
+
+def query_dependencies(socket_path, maven_repo_path, filter_repo='all', filter_filename='all', filter_group='all',
+                       artifacts=(), groups=(), timeout=DEFAULT_TIMEOUT):
+    """
+    Ask the daemon listening on socket_path for the dependencies of maven_repo_path matching the filters, which
+    work like the list-dependencies options. Return a list of ArtifactRecords, or None when no daemon is running
+    or it serves another repository.
+    """
+    if not os.path.exists(socket_path):
+        return None
+    request = {'command': 'list', 'repository': os.path.abspath(maven_repo_path), 'filter_repo': filter_repo,
+               'filter_filename': filter_filename, 'filter_group': filter_group, 'artifacts': list(artifacts),
+               'groups': list(groups)}
+    answer = _request(socket_path, request, timeout)
+    if answer is None:
+        return None
+    status, response = answer
+    with response:
+        if not status or not status.get('ok'):
+            return None
+        return [ArtifactRecord.from_dict(json.loads(line)) for line in response]
+
+
+def stop_daemon(socket_path, maven_repo_path):
+    """
+    Ask the daemon listening on socket_path to stop. Return False when none is running.
+    """
+    answer = _request(socket_path, {'command': 'stop', 'repository': os.path.abspath(maven_repo_path)})
+    if answer is None:
+        return False
+    answer[1].close()
+    return bool(answer[0] and answer[0].get('ok'))
@@ -0,0 +1,597 @@
+"""Deployment of artifacts to a remote Maven repository with plain HTTP PUT requests."""
+import base64
+import hashlib
+import http.client
+import json
+import os
+import queue
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from datetime import datetime
+from urllib.parse import urlsplit, quote
+from maven_scanner import __version__
+from maven_scanner.records import artifact_classifier
+from maven_scanner.walker import POM_EXTENSION
+
+CHECKSUMS = (('sha1', hashlib.sha1), ('md5', hashlib.md5))
+METADATA_FILE = 'maven-metadata.xml'
+SNAPSHOT_SUFFIX = '-SNAPSHOT'
+XML_DECLARATION = b'<?xml version="1.0" encoding="UTF-8"?>\n'
+BUFFER_SIZE = 1024 * 1024
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+TRANSIENT_STATUSES = (408, 429)
+# Errors reading the local files of a dependency, they do not go away when the deploy is retried
+LOCAL_FILE_ERRORS = (FileNotFoundError, PermissionError, IsADirectoryError, NotADirectoryError)
+MISSING = 'missing'
+SAME = 'same'
+CHANGED = 'changed'
+
+
+class DeployError(Exception):
+    """
+    Raised when the remote repository rejects a request. transient, when set, tells whether the failure is worth
+    retrying; otherwise it is derived from the HTTP status.
+    """
+
+    def __init__(self, message, status=None, transient=None):
+        super().__init__(message)
+        self.status = status
+        self.transient = transient
+
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP(S) connections to the host of one repository URL. Connections are created on demand, returned
+    to the pool after each complete response and can be shared by several threads.
+    """
+
+    def __init__(self, url, timeout=60):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported repository URL: {url}")
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.timeout = timeout
+        self.created = 0
+        self._idle = queue.LifoQueue()
+
+    def _connect(self):
+        self.created += 1
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            return self._connect(), False
+
+    def request(self, method, path, body=None, headers=None):
+        """
+        Send a request and return (status, response_body, response_headers). body can be bytes or a callable
+        returning a fresh readable file object, so the request can be repeated once when a kept-alive connection
+        turned out stale.
+        """
+        connection, reused = self._acquire()
+        try:
+            response = self._send(connection, method, path, body, headers)
+        except (http.client.HTTPException, OSError):
+            connection.close()
+            if not reused:
+                raise
+            connection = self._connect()
+            response = self._send(connection, method, path, body, headers)
+
+        data = response.read()
+        if response.will_close:
+            connection.close()
+        else:
+            self._idle.put(connection)
+        return response.status, data, response.headers
+
+    @staticmethod
+    def _send(connection, method, path, body, headers):
+        if callable(body):
+            with body() as source:
+                connection.request(method, path, body=source, headers=headers)
+        else:
+            connection.request(method, path, body=body, headers=headers)
+        return connection.getresponse()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def file_checksums(file_path):
+    """
+    Return {'sha1': ..., 'md5': ...} hex digests of a file, read once in large blocks.
+    """
+    digests = [(name, factory()) for name, factory in CHECKSUMS]
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(BUFFER_SIZE), b''):
+            for _, digest in digests:
+                digest.update(block)
+    return {name: digest.hexdigest() for name, digest in digests}
+
+
+def bytes_checksums(data):
+    return {name: factory(data).hexdigest() for name, factory in CHECKSUMS}
+
+
+def generate_pom(group_id, artifact_id, version, packaging):
+    """
+    Minimal pom of a deployed file, the equivalent of deploy:deploy-file -DgeneratePom=true.
+    """
+    project = ET.Element('project', {'xmlns': 'http://maven.apache.org/POM/4.0.0'})
+    for tag, text in (('modelVersion', '4.0.0'), ('groupId', group_id), ('artifactId', artifact_id),
+                      ('version', version), ('packaging', packaging)):
+        ET.SubElement(project, tag).text = text
+    return XML_DECLARATION + ET.tostring(project, encoding='unicode').encode('utf-8')
+
+
+def local_pom(file_path, artifact_id, version):
+    """
+    Return the path of the pom next to an artifact file: <artifactId>-<version>.pom, else the first pom of the
+    directory like the scanner reads, or None when the directory holds no pom.
+    """
+    dir_path = os.path.dirname(file_path)
+    expected = os.path.join(dir_path, f"{artifact_id}-{version}{POM_EXTENSION}")
+    if os.path.isfile(expected):
+        return expected
+    try:
+        poms = sorted(name for name in os.listdir(dir_path) if name.endswith(POM_EXTENSION))
+    except OSError:
+        return None
+    return os.path.join(dir_path, poms[0]) if poms else None
+
+
+def _parse_metadata(data):
+    if not data:
+        return None
+    try:
+        return ET.fromstring(data)
+    except ET.ParseError:
+        return None
+
+
+def _element(parent, tag):
+    element = parent.find(tag)
+    if element is None:
+        element = ET.SubElement(parent, tag)
+    return element
+
+
+def merge_artifact_metadata(data, group_id, artifact_id, version, updated):
+    """
+    Add version to the artifact level maven-metadata.xml given as bytes (or None) and return the new document.
+    """
+    metadata = _parse_metadata(data)
+    if metadata is None:
+        metadata = ET.Element('metadata')
+        ET.SubElement(metadata, 'groupId').text = group_id
+        ET.SubElement(metadata, 'artifactId').text = artifact_id
+    versioning = _element(metadata, 'versioning')
+    versions = _element(versioning, 'versions')
+    if version not in [element.text for element in versions.findall('version')]:
+        ET.SubElement(versions, 'version').text = version
+    _element(versioning, 'latest').text = version
+    if not version.endswith(SNAPSHOT_SUFFIX):
+        _element(versioning, 'release').text = version
+    _element(versioning, 'lastUpdated').text = updated
+    return XML_DECLARATION + ET.tostring(metadata, encoding='unicode').encode('utf-8')
+
+
+def snapshot_build_number(data):
+    metadata = _parse_metadata(data)
+    if metadata is None:
+        return 0
+    build_number = metadata.find('versioning/snapshot/buildNumber')
+    return int(build_number.text) if build_number is not None and build_number.text else 0
+
+
+def merge_snapshot_metadata(data, group_id, artifact_id, version, timestamp, build_number, files, updated):
+    """
+    Return the version level maven-metadata.xml of a SNAPSHOT version after deploying files, a list of
+    (classifier, extension) tuples, as build timestamp-build_number.
+    """
+    metadata = _parse_metadata(data)
+    if metadata is None:
+        metadata = ET.Element('metadata')
+        ET.SubElement(metadata, 'groupId').text = group_id
+        ET.SubElement(metadata, 'artifactId').text = artifact_id
+        ET.SubElement(metadata, 'version').text = version
+    versioning = _element(metadata, 'versioning')
+    snapshot = _element(versioning, 'snapshot')
+    _element(snapshot, 'timestamp').text = timestamp
+    _element(snapshot, 'buildNumber').text = str(build_number)
+    _element(versioning, 'lastUpdated').text = updated
+    snapshot_versions = _element(versioning, 'snapshotVersions')
+
+    value = version[:-len(SNAPSHOT_SUFFIX)] + f"-{timestamp}-{build_number}"
+    for classifier, extension in files:
+        for existing in snapshot_versions.findall('snapshotVersion'):
+            if existing.findtext('classifier') == classifier and existing.findtext('extension') == extension:
+                snapshot_versions.remove(existing)
+        snapshot_version = ET.SubElement(snapshot_versions, 'snapshotVersion')
+        if classifier:
+            ET.SubElement(snapshot_version, 'classifier').text = classifier
+        ET.SubElement(snapshot_version, 'extension').text = extension
+        ET.SubElement(snapshot_version, 'value').text = value
+        ET.SubElement(snapshot_version, 'updated').text = updated
+    return XML_DECLARATION + ET.tostring(metadata, encoding='unicode').encode('utf-8')
+
+
+def _coordinates(dependency):
+    artifact_id = dependency['artifactId']
+    version = dependency['version']
+    extension = dependency['file_path'].rsplit('.', 1)[-1]
+    classifier = artifact_classifier(dependency['filename'], artifact_id, version, extension)
+    return dependency['groupId'], artifact_id, version, extension, classifier
+
+
+class HttpDeployer:
+    """
+    Upload artifacts to a Maven repository URL in the standard repository layout, with .sha1/.md5 checksums,
+    their pom and updated maven-metadata.xml files, reusing keep-alive connections between requests.
+    The pom of a version is uploaded once, along with its main artifact: the pom found next to it, or a generated
+    one when the directory has none. Files with a classifier are uploaded without a pom. All the files of a
+    SNAPSHOT version share one timestamp and buildNumber per deployer.
+    """
+
+    def __init__(self, repository_url, username=None, password=None, timeout=60):
+        self.repository_url = repository_url.rstrip('/')
+        self.base_path = urlsplit(self.repository_url).path
+        self.pool = ConnectionPool(self.repository_url, timeout)
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        # (groupId, artifactId, version) of the poms uploaded so far
+        self._uploaded_poms = set()
+        # (timestamp, buildNumber) of the SNAPSHOT versions deployed so far, per (groupId, artifactId, version)
+        self._snapshot_builds = {}
+        # Remote paths uploaded by failed deploys, per local file, skipped when the deploy is retried
+        self._partial_uploads = {}
+        self.headers = {'User-Agent': f"maven-scanner/{__version__}"}
+        if username is not None:
+            token = base64.b64encode(f"{username}:{password or ''}".encode('utf-8')).decode('ascii')
+            self.headers['Authorization'] = f"Basic {token}"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.pool.close()
+
+    def _artifact_lock(self, artifact_dir):
+        with self._locks_guard:
+            return self._locks.setdefault(artifact_dir, threading.Lock())
+
+    def _url_path(self, remote_path):
+        return quote(f"{self.base_path}/{remote_path}")
+
+    def get(self, remote_path):
+        """
+        Return the content of remote_path or None when it does not exist.
+        """
+        status, data, _ = self.pool.request('GET', self._url_path(remote_path), headers=self.headers)
+        if status == 404:
+            return None
+        if status >= 300:
+            raise DeployError(f"GET {remote_path} failed with HTTP status {status}", status)
+        return data
+
+    def head(self, remote_path):
+        """
+        Return the size of remote_path, -1 when the server does not tell it, or None when it does not exist.
+        """
+        status, _, headers = self.pool.request('HEAD', self._url_path(remote_path), headers=self.headers)
+        if status == 404:
+            return None
+        if status >= 300:
+            raise DeployError(f"HEAD {remote_path} failed with HTTP status {status}", status)
+        return int(headers.get('Content-Length', -1))
+
+    def put(self, remote_path, body, length):
+        headers = dict(self.headers)
+        headers['Content-Length'] = str(length)
+        status, _, _ = self.pool.request('PUT', self._url_path(remote_path), body=body, headers=headers)
+        if status >= 300:
+            raise DeployError(f"PUT {remote_path} failed with HTTP status {status}", status)
+
+    def _put_once(self, remote_path, body, length, uploaded):
+        # Files uploaded by a failed attempt of the same deploy are not sent again, release repositories refuse
+        # to overwrite them
+        if uploaded is not None and remote_path in uploaded:
+            return
+        self.put(remote_path, body, length)
+        if uploaded is not None:
+            uploaded.add(remote_path)
+
+    def upload_file(self, remote_path, file_path, length, uploaded=None):
+        self._put_once(remote_path, lambda: open(file_path, 'rb'), length, uploaded)
+        self._upload_checksums(remote_path, file_checksums(file_path), uploaded)
+
+    def upload_bytes(self, remote_path, data, uploaded=None):
+        self._put_once(remote_path, data, len(data), uploaded)
+        self._upload_checksums(remote_path, bytes_checksums(data), uploaded)
+
+    def _upload_checksums(self, remote_path, checksums, uploaded=None):
+        for name, value in checksums.items():
+            data = value.encode('ascii')
+            self._put_once(f"{remote_path}.{name}", data, len(data), uploaded)
+
+    def find_remote(self, dependency):
+        """
+        Return the remote path under which the dependency's file would already be deployed. SNAPSHOT files are
+        looked up through the version's maven-metadata.xml, falling back to the non-timestamped file name.
+        """
+        group_id, artifact_id, version, extension, classifier = _coordinates(dependency)
+        version_dir = f"{group_id.replace('.', '/')}/{artifact_id}/{version}"
+        suffix = f"{'-' + classifier if classifier else ''}.{extension}"
+        if version.endswith(SNAPSHOT_SUFFIX):
+            metadata = _parse_metadata(self.get(f"{version_dir}/{METADATA_FILE}"))
+            if metadata is not None:
+                for snapshot_version in metadata.findall('versioning/snapshotVersions/snapshotVersion'):
+                    if snapshot_version.findtext('classifier') == classifier and \
+                            snapshot_version.findtext('extension') == extension:
+                        return f"{version_dir}/{artifact_id}-{snapshot_version.findtext('value')}{suffix}"
+        return f"{version_dir}/{artifact_id}-{version}{suffix}"
+
+    def compare_remote(self, dependency):
+        """
+        Compare the dependency's file with the deployed one and return MISSING, SAME or CHANGED.
+        Sizes are compared first, the remote .sha1 checksum is compared when it is available.
+        """
+        remote_path = self.find_remote(dependency)
+        remote_size = self.head(remote_path)
+        if remote_size is None:
+            return MISSING
+        if remote_size >= 0 and remote_size != os.path.getsize(dependency['file_path']):
+            return CHANGED
+        remote_sha1 = self.get(f"{remote_path}.sha1")
+        if remote_sha1 is None:
+            return SAME
+        # Checksum files may hold the file name after the digest
+        words = remote_sha1.decode('ascii', 'replace').split()
+        return SAME if words and words[0].lower() == file_checksums(dependency['file_path'])['sha1'] else CHANGED
+
+    def deploy(self, dependency):
+        """
+        Deploy one dependency as listed by filter_dependencies and return the remote path of the uploaded file.
+        When a previous deploy of the dependency failed half way, the files it uploaded are not uploaded again.
+        """
+        group_id, artifact_id, version, extension, classifier = _coordinates(dependency)
+        file_path = dependency['file_path']
+        uploaded = self._partial_uploads.pop(file_path, set())
+        try:
+            return self._deploy(group_id, artifact_id, version, extension, classifier, file_path, uploaded)
+        except Exception:
+            self._partial_uploads[file_path] = uploaded
+            raise
+
+    def _claim_pom(self, gav):
+        # The pom of a version is uploaded by the first of its main artifacts deployed
+        with self._locks_guard:
+            if gav in self._uploaded_poms:
+                return False
+            self._uploaded_poms.add(gav)
+            return True
+
+    def _snapshot_build(self, gav, version_dir):
+        """
+        Return the (timestamp, buildNumber) of the files of a SNAPSHOT version deployed by this run, allocated
+        when the first of them is deployed and shared by the others, like the files deployed by one
+        deploy:deploy-file.
+        """
+        with self._artifact_lock(version_dir):
+            build = self._snapshot_builds.get(gav)
+            if build is None:
+                metadata = self.get(f"{version_dir}/{METADATA_FILE}")
+                build = (datetime.utcnow().strftime('%Y%m%d.%H%M%S'), snapshot_build_number(metadata) + 1)
+                self._snapshot_builds[gav] = build
+            return build
+
+    def _deploy(self, group_id, artifact_id, version, extension, classifier, file_path, uploaded):
+        artifact_dir = f"{group_id.replace('.', '/')}/{artifact_id}"
+        version_dir = f"{artifact_dir}/{version}"
+        gav = (group_id, artifact_id, version)
+
+        file_version = version
+        timestamp = build_number = None
+        if version.endswith(SNAPSHOT_SUFFIX):
+            timestamp, build_number = self._snapshot_build(gav, version_dir)
+            file_version = version[:-len(SNAPSHOT_SUFFIX)] + f"-{timestamp}-{build_number}"
+
+        base_name = f"{artifact_id}-{file_version}"
+        remote_path = f"{version_dir}/{base_name}{'-' + classifier if classifier else ''}.{extension}"
+        with_pom = classifier is None and self._claim_pom(gav)
+        try:
+            self.upload_file(remote_path, file_path, os.path.getsize(file_path), uploaded)
+            files = [(classifier, extension)]
+            if with_pom and extension != 'pom':
+                pom_file = local_pom(file_path, artifact_id, version)
+                pom_path = f"{version_dir}/{base_name}.pom"
+                if pom_file is not None:
+                    self.upload_file(pom_path, pom_file, os.path.getsize(pom_file), uploaded)
+                else:
+                    self.upload_bytes(pom_path, generate_pom(group_id, artifact_id, version, extension), uploaded)
+                files.append((None, 'pom'))
+        except Exception:
+            if with_pom:
+                with self._locks_guard:
+                    self._uploaded_poms.discard(gav)
+            raise
+
+        updated = datetime.utcnow().strftime('%Y%m%d%H%M%S')
+        # Metadata files are read, merged and written back, concurrent deploys of one artifact must not interleave
+        with self._artifact_lock(artifact_dir):
+            if timestamp is not None:
+                self.upload_bytes(f"{version_dir}/{METADATA_FILE}", merge_snapshot_metadata(
+                    self.get(f"{version_dir}/{METADATA_FILE}"), group_id, artifact_id, version, timestamp,
+                    build_number, files, updated))
+            self.upload_bytes(f"{artifact_dir}/{METADATA_FILE}", merge_artifact_metadata(
+                self.get(f"{artifact_dir}/{METADATA_FILE}"), group_id, artifact_id, version, updated))
+        return remote_path
+
+
+class DeployJournal:
+    """
+    Append-only record of successful deploys, one JSON line per artifact and target repository. A deploy
+    interrupted half way can be run again with the same journal and skips everything recorded in it.
+    """
+
+    def __init__(self, journal_path):
+        self.journal_path = journal_path
+        self._done = set()
+        self._lock = threading.Lock()
+        if os.path.exists(journal_path):
+            with open(journal_path, 'r') as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue        # Line cut short by an interrupted run
+                    self._done.add((entry['repository_url'], entry['file_path']))
+        self._file = open(journal_path, 'a')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def is_done(self, repository_url, dependency):
+        return (repository_url, dependency['file_path']) in self._done
+
+    def record(self, repository_url, dependency, remote_path=None):
+        entry = {'repository_url': repository_url, 'file_path': dependency['file_path'], 'remote_path': remote_path}
+        with self._lock:
+            self._done.add((repository_url, dependency['file_path']))
+            self._file.write(json.dumps(entry) + '\n')
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class DeployReport:
+    """
+    Outcome of run_deploys: number of deployed artifacts, artifacts skipped because the journal lists them or
+    because they are already present in the remote repository, artifacts whose remote copy differed, whether
+    deploying them again succeeded or not, and (dependency, error) pairs of failed deploys.
+    """
+
+    def __init__(self):
+        self.deployed = 0
+        self.resumed = 0
+        self.skipped = 0
+        self.mismatched = 0
+        self.failed = []
+
+    def summary(self):
+        return f"Deployed: {self.deployed}, mismatched remote copy: {self.mismatched}, " \
+               f"skipped as already present: {self.skipped}, already in journal: {self.resumed}, " \
+               f"failed: {len(self.failed)}"
+
+
+def is_transient(error):
+    """
+    Tell whether a failed deploy is worth retrying: connection problems, timeouts, throttling and server errors.
+    Failures of unknown cause, eg. a failed mvn command, are retried only when raised as transient, and local
+    files that cannot be read are not retried.
+    """
+    if isinstance(error, DeployError):
+        if error.transient is not None:
+            return error.transient
+        return error.status is not None and (error.status >= 500 or error.status in TRANSIENT_STATUSES)
+    if isinstance(error, LOCAL_FILE_ERRORS):
+        return False
+    return isinstance(error, (OSError, http.client.HTTPException))
+
+
+def run_deploys(dependencies, deploy_one, repository_url, jobs=1, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF,
+                journal=None, log=print, compare_remote=None):
+    """
+    Call deploy_one(dependency) for every dependency with at most jobs deploys running at once. Transient failures
+    are retried up to retries times, waiting backoff, 2 * backoff, 4 * backoff... seconds in between. Successful
+    deploys are recorded in the journal and dependencies already recorded there are skipped.
+    With compare_remote, eg. HttpDeployer.compare_remote, dependencies whose remote copy is the SAME are not
+    deployed again; the checks run in the same worker pool as the deploys.
+    On KeyboardInterrupt the deploys not started yet are cancelled and pending retries are given up, the journal
+    holds the deploys that completed. Return a DeployReport.
+    """
+    report = DeployReport()
+    lock = threading.Lock()
+    interrupted = threading.Event()
+
+    def deploy(dependency):
+        mismatched = False
+        for attempt in range(retries + 1):
+            try:
+                if compare_remote is not None:
+                    remote = compare_remote(dependency)
+                    if remote == SAME:
+                        with lock:
+                            report.skipped += 1
+                        log(f"Skipping {dependency['filename']}, already present in the repository")
+                        return
+                    if remote == CHANGED and not mismatched:
+                        # Counted before deploying, repositories refusing redeploys make the deploy fail
+                        mismatched = True
+                        with lock:
+                            report.mismatched += 1
+                        log(f"Remote copy of {dependency['filename']} differs from the local file")
+                remote_path = deploy_one(dependency)
+            except Exception as e:
+                if attempt < retries and is_transient(e) and not interrupted.is_set():
+                    delay = backoff * 2 ** attempt
+                    log(f"Retrying {dependency['filename']} in {delay:g}s after error: {e}")
+                    if not interrupted.wait(delay):
+                        continue
+                with lock:
+                    report.failed.append((dependency, e))
+                log(f"\nError deploying {dependency['filename']}: {e}\n")
+                return
+            if journal is not None:
+                journal.record(repository_url, dependency, remote_path)
+            with lock:
+                report.deployed += 1
+            return
+
+    pending = []
+    for dependency in dependencies:
+        if journal is not None and journal.is_done(repository_url, dependency):
+            report.resumed += 1
+        else:
+            pending.append(dependency)
+
+    if jobs <= 1:
+        for dependency in pending:
+            deploy(dependency)
+    else:
+        pool = ThreadPoolExecutor(max_workers=jobs)
+        futures = [pool.submit(deploy, dependency) for dependency in pending]
+        try:
+            # Deploys catch their errors, only an interrupt stops the wait early
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in done:
+                future.result()
+        except KeyboardInterrupt:
+            # Only the deploys already running are waited for, so the journal records them
+            interrupted.set()
+            for future in futures:
+                future.cancel()
+            pool.shutdown()
+            raise
+        pool.shutdown()
+    return report
@@ -0,0 +1,134 @@
+"""Comparison of two inventories saved by list-dependencies."""
+import csv
+import json
+import sqlite3
+from maven_scanner.records import artifact_classifier
+from maven_scanner.writers import HEADERS, ROOTS_COLUMNS, SQLITE_TABLE
+
+SQLITE_MAGIC = b'SQLite format 3\0'
+CSV_SEPARATOR_HINT = 'Sep='
+# Field names of the headers written to CSV and TSV files
+HEADER_FIELDS = dict(zip(*ROOTS_COLUMNS))
+
+
+def inventory_format(path):
+    """
+    Return the format of a saved inventory from its content: 'sqlite', 'jsonl', 'csv' or 'tsv'.
+    """
+    with open(path, 'rb') as file:
+        start = file.read(len(SQLITE_MAGIC))
+    if start == SQLITE_MAGIC:
+        return 'sqlite'
+    text = start.decode('utf-8', 'replace').lstrip()
+    if text.startswith('{'):
+        return 'jsonl'
+    # The separator hint is written quoted, as it holds the separator
+    if text.lstrip('"').startswith(CSV_SEPARATOR_HINT) or text.startswith(f'{HEADERS[0]},'):
+        return 'csv'
+    return 'tsv'
+
+
+def read_inventory(path):
+    """
+    Return an iterator of the (groupId, artifactId, version, filename, repository_url) tuples of the dependencies
+    of an inventory saved as JSON Lines, SQLite, CSV or TSV.
+    """
+    file_format = inventory_format(path)
+    if file_format == 'sqlite':
+        return _read_sqlite(path)
+    if file_format == 'jsonl':
+        return _read_jsonl(path)
+    return _read_table(path, ',' if file_format == 'csv' else '\t')
+
+
+def _read_sqlite(path):
+    connection = sqlite3.connect(path)
+    try:
+        yield from connection.execute(f"SELECT groupId, artifactId, version, filename, repository_url "
+                                      f"FROM {SQLITE_TABLE}")
+    finally:
+        connection.close()
+
+
+def _read_jsonl(path):
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                dependency = json.loads(line)
+                yield (dependency['groupId'], dependency['artifactId'], dependency['version'],
+                       dependency['filename'], dependency['repository_url'])
+
+
+def _read_table(path, delimiter):
+    with open(path, newline='', encoding='utf-8') as file:
+        reader = csv.reader(file, delimiter=delimiter)
+        header = next(reader, None)
+        if header and header[0].startswith(CSV_SEPARATOR_HINT):
+            header = next(reader, None)
+        if not header:
+            return
+        fields = [HEADER_FIELDS.get(name, name) for name in header]
+        positions = [fields.index(field) for field in ('groupId', 'artifactId', 'version', 'filename',
+                                                       'repository_url')]
+        for row in reader:
+            yield tuple(row[position] for position in positions)
+
+
+def load_inventory(path):
+    """
+    Return the dependencies of a saved inventory as a dict mapping their (groupId, artifactId, version,
+    classifier, extension) coordinates to the URL of the repository they were downloaded from. The first of
+    several files claiming the same coordinates is kept.
+    """
+    inventory = {}
+    # Few distinct repository URLs, shared instead of being kept once per dependency
+    repository_urls = {}
+    for group_id, artifact_id, version, filename, repository_url in read_inventory(path):
+        extension = filename.rsplit('.', 1)[-1]
+        coordinate = (group_id, artifact_id, version, artifact_classifier(filename, artifact_id, version, extension),
+                      extension)
+        if coordinate not in inventory:
+            repository_url = repository_url or ''
+            inventory[coordinate] = repository_urls.setdefault(repository_url, repository_url)
+    return inventory
+
+
+class InventoryDiff:
+    """
+    Differences between two inventories: coordinates only in the new one, only in the old one, and in both but
+    downloaded from another repository, as (coordinate, old repository URL, new repository URL) tuples.
+    """
+
+    def __init__(self, added, removed, resourced):
+        self.added = added
+        self.removed = removed
+        self.resourced = resourced
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.resourced)
+
+    def summary(self):
+        return f"Added: {len(self.added)}, removed: {len(self.removed)}, re-sourced: {len(self.resourced)}"
+
+
+def diff_inventories(old, new):
+    """
+    Compare two load_inventory results. Coordinates are compared as sets of hashed tuples, so the comparison takes
+    time linear in the number of dependencies; results keep the order of the inventories.
+    """
+    added_keys = new.keys() - old.keys()
+    removed_keys = old.keys() - new.keys()
+    added = [coordinate for coordinate in new if coordinate in added_keys]
+    removed = [coordinate for coordinate in old if coordinate in removed_keys]
+    resourced = [(coordinate, old[coordinate], repository_url) for coordinate, repository_url in new.items()
+                 if coordinate not in added_keys and old[coordinate] != repository_url]
+    return InventoryDiff(added, removed, resourced)
+
+
+def format_artifact(coordinate):
+    """
+    Return coordinate in Maven's groupId:artifactId:extension[:classifier]:version form.
+    """
+    group_id, artifact_id, version, classifier, extension = coordinate
+    parts = [group_id, artifact_id, extension] + ([classifier] if classifier else []) + [version]
+    return ':'.join(parts)
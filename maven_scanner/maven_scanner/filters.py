@@ -0,0 +1,129 @@
+"""Dependency filters applied while scanning, before any file is parsed."""
+import fnmatch
+import glob
+import os
+import re
+
+MATCH_ALL = 'all'
+REGEX_PREFIX = 're:'
+GLOB_CHARACTERS = ('*', '?', '[')
+
+
+def compile_pattern(pattern, separator=None):
+    """
+    Turn a filter pattern into a predicate on strings.
+
+    'all' (or an empty pattern) matches everything, 're:<expression>' is searched as a regular expression and a
+    pattern with wildcards (*, ?, [...]) is matched as a glob against the whole value. Any other pattern matches as
+    a substring or, when a separator is given, as the value itself or a separator delimited prefix of it.
+    """
+    if not pattern or pattern == MATCH_ALL:
+        return None
+    if pattern.startswith(REGEX_PREFIX):
+        return re.compile(pattern[len(REGEX_PREFIX):]).search
+    if any(character in pattern for character in GLOB_CHARACTERS):
+        return re.compile(fnmatch.translate(pattern)).match
+    if separator is not None:
+        prefix = pattern + separator
+        return lambda value: value == pattern or value.startswith(prefix)
+    return lambda value: pattern in value
+
+
+def relative_parts(maven_repo_path, dir_path):
+    """
+    Return the directory names of dir_path below the repository root.
+    """
+    relative = dir_path[len(maven_repo_path):] if dir_path.startswith(maven_repo_path) else dir_path
+    return [part for part in relative.split(os.sep) if part]
+
+
+def group_id_from_path(maven_repo_path, dir_path):
+    """
+    Derive the groupId from a <group>/<path>/<artifactId>/<version> directory of the repository layout.
+    """
+    return '.'.join(relative_parts(maven_repo_path, dir_path)[:-2])
+
+
+def artifact_id_from_path(maven_repo_path, dir_path):
+    """
+    Derive the artifactId from a <group>/<path>/<artifactId>/<version> directory of the repository layout.
+    """
+    parts = relative_parts(maven_repo_path, dir_path)
+    return parts[-2] if len(parts) >= 2 else ''
+
+
+def subtree_patterns(groups, artifacts=()):
+    """
+    Return the sub trees of the repository holding groupId and artifactId glob patterns, as tuples of directory
+    name patterns: ('org', 'springframework') for a group and its sub groups, ('org', 'springframework',
+    'spring-core') when artifacts are given, which then have to be directly in one of the groups.
+    """
+    patterns = []
+    for group in groups:
+        group_parts = tuple(group.split('.'))
+        if artifacts:
+            patterns.extend(group_parts + (artifact,) for artifact in artifacts)
+        else:
+            patterns.append(group_parts)
+    return patterns
+
+
+def in_subtrees(maven_repo_path, dir_path, patterns):
+    """
+    Tell whether dir_path is in one of the sub trees of subtree_patterns, matching directory names like glob does.
+    """
+    parts = relative_parts(maven_repo_path, dir_path)
+    return any(len(parts) >= len(pattern) and all(fnmatch.fnmatchcase(part, name) for part, name in zip(parts, pattern))
+               for pattern in patterns)
+
+
+def subtree_roots(maven_repo_path, groups=(), artifacts=()):
+    """
+    Map groupId and artifactId glob patterns to the repository directories that hold them, eg.
+    org.springframework and spring-core to <repository>/org/springframework/spring-core.
+    Without groups the whole repository has to be walked; directories nested in another root are dropped.
+    """
+    if not groups:
+        return [maven_repo_path]
+
+    roots = []
+    for pattern in subtree_patterns(groups, artifacts):
+        roots.extend(path for path in glob.glob(os.path.join(glob.escape(maven_repo_path), *pattern))
+                     if os.path.isdir(path))
+
+    selected = []
+    for root in sorted(set(roots)):
+        if not selected or not root.startswith(selected[-1] + os.sep):
+            selected.append(root)
+    return selected
+
+
+class DependencyFilter:
+    """
+    Filename, groupId, artifactId and repository URL predicates, ordered from the cheapest to evaluate to the most
+    expensive. Filenames, groupIds and artifactIds are known from the directory walk, the repository URL needs
+    the lastUpdated file. artifacts are glob patterns matched against the whole artifactId.
+    """
+
+    def __init__(self, filter_repo=MATCH_ALL, filter_filename=MATCH_ALL, filter_group=MATCH_ALL, artifacts=()):
+        self._repo = compile_pattern(filter_repo)
+        self._filename = compile_pattern(filter_filename)
+        self._group = compile_pattern(filter_group, separator='.')
+        self._artifacts = tuple(artifacts)
+
+    @property
+    def filters_repo(self):
+        return self._repo is not None
+
+    def matches_artifact(self, maven_repo_path, dir_path, filename):
+        if self._filename is not None and not self._filename(filename):
+            return False
+        if self._group is not None and not self._group(group_id_from_path(maven_repo_path, dir_path)):
+            return False
+        if self._artifacts:
+            artifact_id = artifact_id_from_path(maven_repo_path, dir_path)
+            return any(fnmatch.fnmatchcase(artifact_id, pattern) for pattern in self._artifacts)
+        return True
+
+    def matches_repo(self, repo_url):
+        return self._repo is None or bool(self._repo(repo_url))
@@ -0,0 +1,168 @@
+"""Dependency graph of the artifacts of a Maven repository, built from the <dependencies> of their poms."""
+from maven_scanner.resolver import DEFAULT_SCOPE
+
+SCOPES = ('compile', 'runtime', 'provided', 'test', 'system', 'import', 'parent')
+# Scopes followed by closures unless told otherwise: those Maven resolves transitively, plus the poms needed to
+# read the dependencies, ie. parents and imported BOMs
+TRANSITIVE_SCOPES = ('compile', 'runtime', 'import', 'parent')
+OPTIONAL_FLAG = 1 << 7
+
+
+def parse_coordinate(value):
+    """
+    Return the (groupId, artifactId, version) tuple of a "groupId:artifactId:version" string.
+    """
+    parts = value.split(':')
+    if len(parts) != 3 or not all(parts):
+        raise ValueError(f"Expected groupId:artifactId:version, got: {value}")
+    return tuple(parts)
+
+
+def format_coordinate(coordinate):
+    return ':'.join(coordinate)
+
+
+class DependencyGraph:
+    """
+    Directed graph of (groupId, artifactId, version) coordinates, with an edge from every pom to each of its
+    dependencies.
+
+    Coordinates are interned to consecutive integers when first seen; edges are kept as lists of these integers,
+    one list of dependencies and one of dependents per node, so forward and reverse closures are plain
+    breadth-first searches over integers. The scope and optional flag of every edge are packed into one small
+    integer kept next to it. Dependencies that are not in the repository are nodes too, reported by missing().
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._coordinates = []
+        self._present = bytearray()
+        self._forward = []
+        self._forward_kinds = []
+        self._reverse = []
+        self._reverse_kinds = []
+        self.edges = 0
+
+    def node(self, coordinate):
+        """
+        Return the integer id of coordinate, adding it to the graph when it is new.
+        """
+        node = self._ids.get(coordinate)
+        if node is None:
+            node = self._ids[coordinate] = len(self._coordinates)
+            self._coordinates.append(coordinate)
+            self._present.append(0)
+            self._forward.append([])
+            self._forward_kinds.append([])
+            self._reverse.append([])
+            self._reverse_kinds.append([])
+        return node
+
+    def add_pom(self, pom_data):
+        """
+        Add an artifact of the repository and its dependencies, from a parse_pom_file result having them.
+        Dependencies without a (resolved) version cannot be told apart and are left out; return their number.
+        """
+        source = self.node((pom_data['groupId'], pom_data['artifactId'], pom_data['version']))
+        if self._present[source]:
+            # Several files of one version directory share its pom
+            return 0
+        self._present[source] = 1
+        skipped = 0
+        targets = set()
+        for dependency in pom_data.get('dependencies', ()):
+            coordinate = (dependency['groupId'], dependency['artifactId'], dependency['version'])
+            if not all(coordinate) or any('${' in value for value in coordinate):
+                skipped += 1
+                continue
+            target = self.node(coordinate)
+            # Only the first declaration of a dependency counts, like in Maven
+            if target in targets:
+                continue
+            targets.add(target)
+            # Unknown scopes are taken as the default one
+            scope = dependency.get('scope')
+            kind = SCOPES.index(scope if scope in SCOPES else DEFAULT_SCOPE)
+            if dependency.get('optional'):
+                kind |= OPTIONAL_FLAG
+            self._forward[source].append(target)
+            self._forward_kinds[source].append(kind)
+            self._reverse[target].append(source)
+            self._reverse_kinds[target].append(kind)
+            self.edges += 1
+        return skipped
+
+    def __len__(self):
+        return len(self._coordinates)
+
+    def __contains__(self, coordinate):
+        node = self._ids.get(coordinate)
+        return node is not None and bool(self._present[node])
+
+    def __iter__(self):
+        """
+        Iterate over the coordinates of the artifacts in the repository.
+        """
+        return (coordinate for node, coordinate in enumerate(self._coordinates) if self._present[node])
+
+    def missing(self):
+        """
+        Return the coordinates depended on that are not in the repository, sorted.
+        """
+        return sorted(coordinate for node, coordinate in enumerate(self._coordinates) if not self._present[node])
+
+    def dependencies(self, coordinate, scopes=SCOPES, include_optional=True):
+        """
+        Return the direct dependencies of coordinate with one of scopes.
+        """
+        return self._neighbours(self._forward, self._forward_kinds, coordinate, scopes, include_optional)
+
+    def dependents(self, coordinate, scopes=SCOPES, include_optional=True):
+        """
+        Return the artifacts depending directly on coordinate with one of scopes.
+        """
+        return self._neighbours(self._reverse, self._reverse_kinds, coordinate, scopes, include_optional)
+
+    def closure(self, coordinates, scopes=TRANSITIVE_SCOPES, include_optional=False):
+        """
+        Return the set of coordinates coordinates depend on, directly or transitively, through dependencies with
+        one of scopes. Optional dependencies are not followed unless include_optional is set. The given
+        coordinates are part of the result when they are in the graph.
+        """
+        return self._closure(self._forward, self._forward_kinds, coordinates, scopes, include_optional)
+
+    def reverse_closure(self, coordinates, scopes=TRANSITIVE_SCOPES, include_optional=False):
+        """
+        Return the set of coordinates depending, directly or transitively, on coordinates, ie. those that would
+        be affected by removing or changing them.
+        """
+        return self._closure(self._reverse, self._reverse_kinds, coordinates, scopes, include_optional)
+
+    def _allowed_kinds(self, scopes, include_optional):
+        allowed = bytearray(2 * OPTIONAL_FLAG)
+        for scope in scopes:
+            allowed[SCOPES.index(scope)] = 1
+            if include_optional:
+                allowed[SCOPES.index(scope) | OPTIONAL_FLAG] = 1
+        return allowed
+
+    def _neighbours(self, edges, kinds, coordinate, scopes, include_optional):
+        node = self._ids.get(coordinate)
+        if node is None:
+            return []
+        allowed = self._allowed_kinds(scopes, include_optional)
+        return [self._coordinates[target] for target, kind in zip(edges[node], kinds[node]) if allowed[kind]]
+
+    def _closure(self, edges, kinds, coordinates, scopes, include_optional):
+        allowed = self._allowed_kinds(scopes, include_optional)
+        visited = bytearray(len(self._coordinates))
+        queue = [self._ids[coordinate] for coordinate in coordinates if coordinate in self._ids]
+        for node in queue:
+            visited[node] = 1
+        # The queue grows while it is iterated, every node is appended once
+        for node in queue:
+            for target, kind in zip(edges[node], kinds[node]):
+                if not visited[target] and allowed[kind]:
+                    visited[target] = 1
+                    queue.append(target)
+        return {self._coordinates[node] for node in queue}
@@ -0,0 +1,172 @@
+"""Persistent scan index used for incremental rescans of a Maven local repository."""
+import json
+import os
+import sqlite3
+import threading
+from maven_scanner.walker import list_directory
+
+INDEX_FILE_NAME = '.mvn-scn-index'
+SCHEMA_VERSION = '1'
+
+
+def default_index_path(maven_repo_path):
+    """
+    Return the default index location: next to the repository directory, eg. ~/.m2/.mvn-scn-index
+    """
+    return os.path.join(os.path.dirname(os.path.abspath(maven_repo_path)), INDEX_FILE_NAME)
+
+
+class ScanIndex:
+    """
+    SQLite backed index of directory listings and parse results of one Maven repository.
+
+    A directory is listed again only when its mtime changed since the last run; unchanged directories are served
+    from the index. Parse results are keyed by file path and invalidated when the file's mtime changes.
+    The whole index is loaded into memory on open and written back in a single transaction by save().
+    """
+
+    def __init__(self, index_path, maven_repo_path):
+        self.index_path = index_path
+        self.root = maven_repo_path
+        self.hits = 0
+        self.misses = 0
+        self._listings = {}
+        self._parsed = {}
+        self._dirty_listings = set()
+        self._dirty_parsed = set()
+        self._removed_listings = set()
+        # Directories are listed and parse results looked up from several threads, eg. by the async engine
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(index_path)
+        self._create_tables()
+        self._load()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _create_tables(self):
+        with self._connection:
+            self._connection.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS directories '
+                                     '(path TEXT PRIMARY KEY, mtime_ns INTEGER, sub_dirs TEXT, files TEXT)')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS parsed '
+                                     '(path TEXT PRIMARY KEY, mtime_ns INTEGER, result TEXT)')
+
+    def _load(self):
+        meta = dict(self._connection.execute('SELECT key, value FROM meta'))
+        root = os.path.abspath(self.root)
+        if meta.get('root') != root or meta.get('schema') != SCHEMA_VERSION:
+            # Index belongs to another repository or an older format, start from scratch
+            with self._connection:
+                self._connection.execute('DELETE FROM directories')
+                self._connection.execute('DELETE FROM parsed')
+                self._connection.executemany('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                                             [('root', root), ('schema', SCHEMA_VERSION)])
+            return
+
+        for path, mtime_ns, sub_dirs, files in self._connection.execute(
+                'SELECT path, mtime_ns, sub_dirs, files FROM directories'):
+            self._listings[path] = (mtime_ns, _split(sub_dirs), _split(files))
+        for path, mtime_ns, result in self._connection.execute('SELECT path, mtime_ns, result FROM parsed'):
+            self._parsed[path] = (mtime_ns, result)
+
+    def _key(self, path):
+        return path[len(self.root):].lstrip(os.sep)
+
+    def list_directory(self, path):
+        """
+        Return (sub_directories, file_names) of path, listing the directory only when its mtime changed.
+        """
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return [], []
+
+        key = self._key(path)
+        cached = self._listings.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            with self._lock:
+                self.hits += 1
+            return [os.path.join(path, name) for name in cached[1]], list(cached[2])
+
+        sub_dirs, file_names = list_directory(path)
+        sub_dir_names = [os.path.basename(sub_dir) for sub_dir in sub_dirs]
+        with self._lock:
+            self.misses += 1
+            if cached is not None:
+                for removed in set(cached[1]) - set(sub_dir_names):
+                    self._forget_subtree(os.path.join(key, removed) if key else removed)
+            self._listings[key] = (mtime_ns, sub_dir_names, file_names)
+            self._dirty_listings.add(key)
+        return sub_dirs, file_names
+
+    def _forget_subtree(self, key):
+        prefix = key + os.sep
+        for stale in [path for path in self._listings if path == key or path.startswith(prefix)]:
+            del self._listings[stale]
+            self._dirty_listings.discard(stale)
+            self._removed_listings.add(stale)
+
+    def lookup_parsed(self, file_path, mtime_ns=None):
+        """
+        Return (mtime_ns, result) for file_path. result is None when the file was not parsed yet or changed since.
+        mtime_ns is taken from the file unless given, eg. for results derived from several files.
+        """
+        if mtime_ns is None:
+            try:
+                mtime_ns = os.stat(file_path).st_mtime_ns
+            except OSError:
+                return None, None
+        cached = self._parsed.get(self._key(file_path))
+        with self._lock:
+            if cached is not None and cached[0] == mtime_ns:
+                self.hits += 1
+            else:
+                self.misses += 1
+                return mtime_ns, None
+        return mtime_ns, json.loads(cached[1])
+
+    def store_parsed(self, file_path, mtime_ns, result):
+        """
+        Remember the parse result of file_path as it was at mtime_ns.
+        """
+        if mtime_ns is None or result is None:
+            return
+        key = self._key(file_path)
+        self._parsed[key] = (mtime_ns, json.dumps(result))
+        self._dirty_parsed.add(key)
+
+    def save(self):
+        """
+        Write all changes made since the index was opened in a single transaction.
+        """
+        with self._connection:
+            self._connection.executemany('DELETE FROM directories WHERE path = ?',
+                                         [(path,) for path in self._removed_listings])
+            self._connection.executemany('DELETE FROM parsed WHERE path = ? OR path LIKE ?',
+                                         [(path, path + os.sep + '%') for path in self._removed_listings])
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO directories (path, mtime_ns, sub_dirs, files) VALUES (?, ?, ?, ?)',
+                [(path,) + _join_listing(self._listings[path]) for path in self._dirty_listings])
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO parsed (path, mtime_ns, result) VALUES (?, ?, ?)',
+                [(path,) + self._parsed[path] for path in self._dirty_parsed])
+        self._removed_listings.clear()
+        self._dirty_listings.clear()
+        self._dirty_parsed.clear()
+
+    def close(self):
+        self.save()
+        self._connection.close()
+
+
+def _split(value):
+    return value.split('\n') if value else []
+
+
+def _join_listing(listing):
+    mtime_ns, sub_dirs, files = listing
+    return mtime_ns, '\n'.join(sub_dirs), '\n'.join(files)
@@ -0,0 +1,149 @@
+"""In-memory index of listed artifacts, keyed by their Maven coordinates."""
+from bisect import bisect_left
+
+
+class ArtifactIndex:
+    """
+    Artifacts indexed by (groupId, artifactId, version, classifier, extension), with secondary indexes by repository
+    URL and groupId. Records are kept in insertion order, the indexes hold positions in that order so query results
+    come out in scan order. Two files with the same coordinates (eg. a pom declaring wrong coordinates) are both
+    kept, get() returns the first one.
+    """
+
+    def __init__(self, records=()):
+        self._records = []
+        self._by_coordinate = {}
+        self._by_repository = {}
+        self._by_group = {}
+        self._sorted_groups = None
+        for record in records:
+            self.add(record)
+
+    def add(self, record):
+        position = len(self._records)
+        self._records.append(record)
+        self._by_coordinate.setdefault(record.coordinate, []).append(position)
+        self._by_repository.setdefault(record.repository_url, []).append(position)
+        if record.group_id not in self._by_group:
+            self._by_group[record.group_id] = []
+            self._sorted_groups = None
+        self._by_group[record.group_id].append(position)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __contains__(self, coordinate):
+        return coordinate in self._by_coordinate
+
+    def get(self, group_id, artifact_id, version, classifier=None, extension='jar'):
+        """
+        Return the artifact with the given coordinates, or None.
+        """
+        positions = self._by_coordinate.get((group_id, artifact_id, version, classifier, extension))
+        return self._records[positions[0]] if positions else None
+
+    def get_all(self, group_id, artifact_id, version, classifier=None, extension='jar'):
+        """
+        Return all artifacts with the given coordinates, more than one only when several files claim them.
+        """
+        positions = self._by_coordinate.get((group_id, artifact_id, version, classifier, extension), [])
+        return [self._records[position] for position in positions]
+
+    def duplicates(self):
+        """
+        Return lists of artifacts sharing the same coordinates.
+        """
+        return [[self._records[position] for position in positions]
+                for positions in self._by_coordinate.values() if len(positions) > 1]
+
+    def repositories(self):
+        return list(self._by_repository)
+
+    def by_repository(self, repository_url):
+        return [self._records[position] for position in self._by_repository.get(repository_url, [])]
+
+    def by_group(self, group_prefix):
+        """
+        Return the artifacts of groupId group_prefix and of its sub groups, eg. 'org.apache' matches
+        'org.apache.commons' but not 'org.apachefoo'.
+        """
+        return [self._records[position] for position in sorted(self._group_positions(group_prefix))]
+
+    def query(self, group=None, repository_url=None, artifact_id=None, version=None):
+        """
+        Return the artifacts matching all given criteria, in insertion order. group matches sub groups too.
+        """
+        positions = None
+        if group is not None:
+            positions = set(self._group_positions(group))
+        if repository_url is not None:
+            in_repository = self._by_repository.get(repository_url, [])
+            positions = set(in_repository) if positions is None else positions.intersection(in_repository)
+        records = self._records if positions is None else [self._records[position] for position in sorted(positions)]
+        return [record for record in records
+                if (artifact_id is None or record.artifact_id == artifact_id) and
+                (version is None or record.version == version)]
+
+    def _group_positions(self, group_prefix):
+        if self._sorted_groups is None:
+            self._sorted_groups = sorted(group for group in self._by_group if group is not None)
+        groups = self._sorted_groups
+        # Sub groups sort right after their parent group, among other groups sharing the prefix
+        for group in groups[bisect_left(groups, group_prefix):]:
+            if not group.startswith(group_prefix):
+                break
+            if len(group) == len(group_prefix) or group[len(group_prefix)] == '.':
+                yield from self._by_group[group]
+
+
+class MergedInventory:
+    """
+    Deduplicated artifacts of several repository roots. Each coordinate is kept once, represented by the record of
+    the first root it was added from, along with the list of roots holding it. Artifacts keep the order in which
+    they were first added.
+    """
+
+    def __init__(self):
+        self._records = {}
+        self._roots = {}
+        self.added = 0
+
+    def add(self, root, record):
+        """
+        Add record found in root. Return True when its coordinates were not known yet.
+        """
+        self.added += 1
+        coordinate = record.coordinate
+        roots = self._roots.get(coordinate)
+        if roots is None:
+            self._records[coordinate] = record
+            self._roots[coordinate] = [root]
+            return True
+        if root not in roots:
+            roots.append(root)
+        return False
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self._records.values())
+
+    def __contains__(self, coordinate):
+        return coordinate in self._records
+
+    def roots(self, coordinate):
+        """
+        Return the roots holding the artifact with the given coordinates, in the order they were added.
+        """
+        return list(self._roots.get(coordinate, []))
+
+    def rows(self, separator=';'):
+        """
+        Return an iterator of the dependency fields of the artifacts, with a 'roots' field listing their roots.
+        """
+        for coordinate, record in self._records.items():
+            yield dict(record.as_dict(), roots=separator.join(self._roots[coordinate]))
@@ -0,0 +1,105 @@
+"""Parallel parsing of scanned artifact directories."""
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+from maven_scanner.async_engine import AsyncEngine
+from maven_scanner.resolver import PomResolver
+from maven_scanner.scanner import MavenScanner
+from maven_scanner.stats import ScanStats
+
+EXECUTORS = ('thread', 'process')
+# Executor of the async engine, selected with --engine rather than --executor
+ASYNC_EXECUTOR = 'async'
+
+
+def _parse_in_thread(scanner, method, dir_path):
+    worker = scanner.worker()
+    return getattr(worker, method)(dir_path), worker.error_counter, worker.stats
+
+
+# Scanner of a process worker, created once by _init_process so its parent pom and provenance caches are kept
+# from one directory to the next
+_process_scanner = None
+
+
+def _init_process(debug, maven_repo_path, collect_dependencies):
+    global _process_scanner
+    _process_scanner = MavenScanner(debug, collect_dependencies=collect_dependencies)
+    _process_scanner.maven_repo_path = maven_repo_path
+    _process_scanner.pom_resolver = PomResolver(maven_repo_path)
+
+
+def _parse_in_process(method, dir_path, record):
+    worker = _process_scanner
+    # Errors and stats are sent back per directory, the caches stay
+    worker.error_counter = 0
+    worker.stats = ScanStats()
+    if record is not None:
+        worker.dir_records[dir_path] = record
+    try:
+        result = getattr(worker, method)(dir_path)
+    finally:
+        worker.dir_records.pop(dir_path, None)
+    worker.close()
+    return result, worker.error_counter, worker.stats
+
+
+def create_pool(scanner, jobs=1, executor='thread'):
+    """
+    Return a pool of jobs threads or processes, or an AsyncEngine with jobs calls in flight, to be shared by
+    several parse_directories calls, eg. the batches of a stream, so its workers and their caches are kept from one
+    call to the next. Return None with jobs <= 1, directories are then parsed without a pool. The caller shuts the
+    pool down.
+    """
+    if executor not in EXECUTORS and executor != ASYNC_EXECUTOR:
+        raise ValueError(f"Unknown executor: {executor}, expected one of: {', '.join(EXECUTORS)}")
+    if jobs <= 1:
+        return None
+    if executor == ASYNC_EXECUTOR:
+        return AsyncEngine(jobs)
+    if executor == 'process':
+        return ProcessPoolExecutor(max_workers=jobs, initializer=_init_process,
+                                   initargs=(scanner.debug, scanner.maven_repo_path, scanner.collect_dependencies))
+    return ThreadPoolExecutor(max_workers=jobs)
+
+
+def parse_directories(scanner, dir_paths, jobs=1, executor='thread', method='parse_dependency_dir', pool=None):
+    """
+    Parse pom and lastUpdated files of dir_paths and return a list of (pom_data, last_update_data) tuples
+    in the order of dir_paths. Another MavenScanner parse method, eg. parse_pom_file, can be named by method.
+
+    With jobs > 1 the directories are parsed by a pool of threads (suited to slow, eg. network, filesystems) or
+    processes (suited to CPU bound pom parsing), or by the asyncio engine with jobs calls in flight when executor is
+    'async'. The pool is pool when given, as returned by create_pool for the same executor, a new one otherwise.
+    Errors counted by the workers are added to scanner.error_counter
+    and their stats to scanner.stats.
+    The scan index is consulted and updated only by thread workers, process workers always parse the files.
+    """
+    if executor not in EXECUTORS and executor != ASYNC_EXECUTOR:
+        raise ValueError(f"Unknown executor: {executor}, expected one of: {', '.join(EXECUTORS)}")
+
+    dir_paths = list(dir_paths)
+    if jobs <= 1 or len(dir_paths) <= 1:
+        return [getattr(scanner, method)(dir_path) for dir_path in dir_paths]
+
+    if pool is not None:
+        outcomes = _map(pool, scanner, dir_paths, jobs, executor, method)
+    else:
+        with create_pool(scanner, jobs, executor) as pool:
+            outcomes = _map(pool, scanner, dir_paths, jobs, executor, method)
+
+    results = []
+    for result, errors, stats in outcomes:
+        scanner.error_counter += errors
+        scanner.stats.merge(stats)
+        results.append(result)
+    return results
+
+
+def _map(pool, scanner, dir_paths, jobs, executor, method):
+    if executor == ASYNC_EXECUTOR:
+        return pool.parse_directories(scanner, dir_paths, method)
+    if executor == 'process':
+        records = [scanner.dir_records.get(dir_path) for dir_path in dir_paths]
+        chunk_size = max(1, len(dir_paths) // (jobs * 4))
+        return list(pool.map(partial(_parse_in_process, method), dir_paths, records, chunksize=chunk_size))
+    return list(pool.map(partial(_parse_in_thread, scanner, method), dir_paths))
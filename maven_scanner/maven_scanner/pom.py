@@ -0,0 +1,114 @@
+"""Incremental reading of Maven pom files."""
+import xml.etree.ElementTree as ET
+
+POM_NAMESPACE = 'http://maven.apache.org/POM/4.0.0'
+COORDINATES = ('groupId', 'artifactId', 'version')
+DEPENDENCY_FIELDS = COORDINATES + ('type', 'classifier', 'scope', 'optional')
+
+
+def read_pom_coordinates(pom_file_path):
+    """
+    Read the project's groupId, artifactId and version from a pom file, each falling back to the value declared
+    in the project's <parent> element.
+
+    The file is parsed incrementally: elements are discarded as soon as they are read and parsing stops once
+    the project declares all three coordinates itself, so large BOM and parent poms are not read completely.
+    Like the rest of the scanner, the POM namespace is honoured only when the root element uses it.
+    Raise ValueError when a coordinate is declared neither by the project nor by its parent.
+    """
+    project = {}
+    parent = {}
+    depth = 0
+    root = None
+    tags = {}
+    parent_tag = None
+    in_parent = False
+
+    with open(pom_file_path, 'rb') as source:
+        for event, elem in ET.iterparse(source, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                if depth == 1:
+                    root = elem
+                    prefix = '{' + POM_NAMESPACE + '}' if elem.tag.startswith('{' + POM_NAMESPACE + '}') else ''
+                    tags = {prefix + name: name for name in COORDINATES}
+                    parent_tag = prefix + 'parent'
+                elif depth == 2:
+                    in_parent = elem.tag == parent_tag
+                continue
+
+            if depth == 3 and in_parent:
+                name = tags.get(elem.tag)
+                if name is not None:
+                    parent[name] = elem.text
+            elif depth == 2:
+                name = tags.get(elem.tag)
+                if name is not None:
+                    project.setdefault(name, elem.text)
+                in_parent = False
+                root.clear()
+                if len(project) == len(COORDINATES):
+                    break
+            depth -= 1
+
+    coordinates = {}
+    for name in COORDINATES:
+        if name in project:
+            coordinates[name] = project[name]
+        elif name in parent:
+            coordinates[name] = parent[name]
+        else:
+            raise ValueError(f"No {name} declared in project or parent")
+    return coordinates
+
+
+def read_pom_model(pom_file_path):
+    """
+    Read what is needed to resolve the coordinates and dependencies of a project: a dict with the project's own
+    'coordinates', its 'parent' coordinates, its 'properties', its 'dependencies' and the dependencies of its
+    <dependencyManagement> as 'managed', all as declared, ie. possibly holding ${...} placeholders. Dependencies are
+    dicts of their DEPENDENCY_FIELDS that are set.
+    Unlike read_pom_coordinates the whole file is read, since properties can be declared anywhere in the project.
+    Dependencies of profiles and build plugins are not read.
+    """
+    sections = {'coordinates': {}, 'parent': {}, 'properties': {}, 'dependencies': [], 'managed': []}
+    # Local names of the open elements, from the project down
+    path = []
+    root = None
+    prefix = ''
+    dependency = {}
+
+    def local_name(tag):
+        return tag[len(prefix):] if tag.startswith(prefix) else None
+
+    with open(pom_file_path, 'rb') as source:
+        for event, elem in ET.iterparse(source, events=('start', 'end')):
+            if event == 'start':
+                if not path:
+                    root = elem
+                    prefix = '{' + POM_NAMESPACE + '}' if elem.tag.startswith('{' + POM_NAMESPACE + '}') else ''
+                path.append(local_name(elem.tag))
+                continue
+
+            depth = len(path)
+            if depth == 3 and path[1] == 'properties':
+                # Property names are element names, in the POM namespace when the project uses it
+                name = elem.tag[len(prefix):] if prefix and elem.tag.startswith(prefix) else elem.tag
+                sections['properties'][name] = (elem.text or '').strip()
+            elif depth == 3 and path[1] == 'parent':
+                if path[2] in COORDINATES:
+                    sections['parent'][path[2]] = elem.text
+            elif path[1:3] == ['dependencies', 'dependency'] and depth == 4 or \
+                    path[1:4] == ['dependencyManagement', 'dependencies', 'dependency'] and depth == 5:
+                if path[-1] in DEPENDENCY_FIELDS:
+                    dependency[path[-1]] = (elem.text or '').strip()
+            elif path[1:] == ['dependencies', 'dependency'] or \
+                    path[1:] == ['dependencyManagement', 'dependencies', 'dependency']:
+                sections['dependencies' if depth == 3 else 'managed'].append(dependency)
+                dependency = {}
+            elif depth == 2:
+                if path[1] in COORDINATES:
+                    sections['coordinates'].setdefault(path[1], elem.text)
+                root.clear()
+            path.pop()
+    return sections
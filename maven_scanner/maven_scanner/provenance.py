@@ -0,0 +1,161 @@
+"""Where artifacts were downloaded from, read from .lastUpdated and _remote.repositories files."""
+import os
+from datetime import datetime
+
+LAST_UPDATED_EXTENSION = '.lastUpdated'
+REMOTE_REPOSITORIES_FILE = '_remote.repositories'
+LAST_UPDATED_KEY_SUFFIX = '.lastUpdated'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+# Name under which the provenance of a directory is kept in the ScanIndex
+INDEX_ENTRY_NAME = '.provenance'
+
+
+def is_provenance_file(name):
+    return name.endswith(LAST_UPDATED_EXTENSION) or name == REMOTE_REPOSITORIES_FILE
+
+
+def unescape(text):
+    """
+    Undo Java properties escaping, eg. 'https\\://host' -> 'https://host'.
+    """
+    if '\\' not in text:
+        return text
+    chars = []
+    escaped = False
+    for char in text:
+        if escaped:
+            chars.append({'t': '\t', 'n': '\n', 'r': '\r', 'f': '\f'}.get(char, char))
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        else:
+            chars.append(char)
+    return ''.join(chars)
+
+
+def split_property(line):
+    """
+    Split a properties file line into its unescaped (key, value), or return None for comments and blank lines.
+    """
+    line = line.strip()
+    if not line or line[0] in '#!':
+        return None
+    position = 0
+    while True:
+        position = line.find('=', position)
+        if position < 0:
+            return unescape(line), ''
+        # The separator is the first '=' not escaped by an odd number of backslashes
+        backslashes = len(line[:position]) - len(line[:position].rstrip('\\'))
+        if backslashes % 2 == 0:
+            return unescape(line[:position]), unescape(line[position + 1:])
+        position += 1
+
+
+def repository_url_from_key(key):
+    """
+    Return the repository URL of a lastUpdated key, without the '.lastUpdated' suffix and the
+    '<hash>@<context>-<repositoryId>-' prefix Maven Resolver adds to keys of mirrored repositories.
+    """
+    url = key[:-len(LAST_UPDATED_KEY_SUFFIX)]
+    scheme = url.find('://')
+    if scheme > 0 and '@' in url[:scheme]:
+        url = url[url.rfind('-', 0, scheme) + 1:]
+    return url
+
+
+def read_last_updated(path):
+    """
+    Return (repository_url, timestamp_ms) of the most recent successful update recorded in a .lastUpdated file,
+    or None when it holds only errors.
+    """
+    latest = None
+    with open(path, 'r') as file:
+        for line in file:
+            pair = split_property(line)
+            if pair is None or not pair[0].endswith(LAST_UPDATED_KEY_SUFFIX):
+                continue
+            timestamp = int(pair[1])
+            if latest is None or timestamp > latest[1]:
+                latest = repository_url_from_key(pair[0]), timestamp
+    return latest
+
+
+def read_remote_repositories(path):
+    """
+    Return a {filename: repository_id} dict from a _remote.repositories file, whose lines look like
+    'artifact-1.0.jar>central='. Files installed locally have an empty repository id.
+    """
+    repositories = {}
+    with open(path, 'r') as file:
+        for line in file:
+            pair = split_property(line)
+            if pair is None:
+                continue
+            filename, _, repository_id = pair[0].partition('>')
+            repositories[filename] = repository_id
+    return repositories
+
+
+def read_provenance(file_paths):
+    """
+    Read the provenance files of one directory and return a dict with the repository_url and update_date of the
+    latest successful download and the repository id of every downloaded file, or None when nothing is recorded.
+    The repository URL comes from .lastUpdated files; when the directory has none, the repository id from
+    _remote.repositories is used instead, with the file's modification time as update date.
+    """
+    latest = None
+    repositories = {}
+    remote_mtime = None
+    for file_path in file_paths:
+        if os.path.basename(file_path) == REMOTE_REPOSITORIES_FILE:
+            repositories.update(read_remote_repositories(file_path))
+            remote_mtime = os.stat(file_path).st_mtime
+            continue
+        update = read_last_updated(file_path)
+        if update is not None and (latest is None or update[1] > latest[1]):
+            latest = update
+
+    if latest is not None:
+        repository_url = latest[0]
+        update_date = datetime.utcfromtimestamp(latest[1] // 1000).strftime(DATE_FORMAT)  # Milliseconds to seconds
+    elif any(repositories.values()):
+        repository_url = sorted(set(repository_id for repository_id in repositories.values() if repository_id))[0]
+        update_date = datetime.utcfromtimestamp(int(remote_mtime)).strftime(DATE_FORMAT)
+    else:
+        return None
+    return {'repository_url': repository_url, 'update_date': update_date, 'repositories': repositories}
+
+
+class ProvenanceCache:
+    """
+    Memoized read_provenance results per directory. An entry is reused as long as the newest modification time
+    of the directory's provenance files did not change, so repeated queries of a directory (eg. filtering by
+    repository before deploying) read its files once.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+
+    def read(self, dir_path, file_paths, index=None):
+        """
+        Return the provenance of dir_path from its file_paths. When a ScanIndex is given, results are also looked
+        up in and stored to it, so they are kept across runs.
+        """
+        mtime_ns = max(os.stat(file_path).st_mtime_ns for file_path in file_paths)
+        cached = self._entries.get(dir_path)
+        if cached is not None and cached[0] == mtime_ns:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        index_key = os.path.join(dir_path, INDEX_ENTRY_NAME)
+        result = index.lookup_parsed(index_key, mtime_ns)[1] if index is not None else None
+        if result is None:
+            result = read_provenance(file_paths)
+            if index is not None:
+                index.store_parsed(index_key, mtime_ns, result)
+        self._entries[dir_path] = (mtime_ns, result)
+        return result
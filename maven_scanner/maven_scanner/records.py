@@ -0,0 +1,123 @@
+"""Compact in-memory representation of listed artifacts."""
+import os
+import sys
+
+# Dependency field names used by the CLI writers and deployers, mapped to ArtifactRecord attributes
+FIELD_ATTRIBUTES = {
+    'groupId': 'group_id',
+    'artifactId': 'artifact_id',
+    'version': 'version',
+    'repository_url': 'repository_url',
+    'last_update': 'last_update',
+    'filename': 'filename',
+    'file_path': 'file_path',
+}
+
+
+def artifact_classifier(filename, artifact_id, version, extension):
+    """
+    Return the classifier of filename, eg. 'tests' for <artifactId>-<version>-tests.jar, or None.
+    """
+    stem = filename[:-(len(extension) + 1)]
+    prefix = f"{artifact_id}-{version}"
+    if stem.startswith(prefix + '-'):
+        return stem[len(prefix) + 1:]
+    return None
+
+
+def intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class ArtifactRecord:
+    """
+    One listed artifact. Strings repeated across many artifacts (groupId, artifactId, version, repository URL and
+    the artifact directory) are interned and shared, the file path is rebuilt on access instead of being stored.
+    Fields can be read as attributes or, like the dicts previously used for dependencies, by their field names,
+    eg. record['groupId'] or record['file_path'].
+    """
+    __slots__ = ('group_id', 'artifact_id', 'version', 'repository_url', 'last_update', 'filename',
+                 'artifact_dir', 'version_dir')
+
+    def __init__(self, group_id, artifact_id, version, repository_url, last_update, filename, dir_path):
+        self.group_id = intern(group_id)
+        self.artifact_id = intern(artifact_id)
+        self.version = intern(version)
+        self.repository_url = intern(repository_url)
+        self.last_update = last_update
+        self.filename = filename
+        artifact_dir, version_dir = os.path.split(dir_path)
+        self.artifact_dir = intern(artifact_dir)
+        # The version directory is named after the version in the repository layout, share the string then
+        self.version_dir = self.version if version_dir == self.version else version_dir
+
+    @classmethod
+    def from_parsed(cls, filename, dir_path, pom_data, last_update_data):
+        """
+        Build a record from parse_pom_file and parse_last_updated_file results.
+        """
+        repository_url = last_update_data['repository_url'] if last_update_data else ""
+        update_date = last_update_data['update_date'] if last_update_data else ""
+        return cls(pom_data['groupId'], pom_data['artifactId'], pom_data['version'], repository_url, update_date,
+                   filename, dir_path)
+
+    @classmethod
+    def from_dict(cls, dependency):
+        """
+        Build a record from the fields returned by as_dict.
+        """
+        return cls(dependency['groupId'], dependency['artifactId'], dependency['version'],
+                   dependency['repository_url'], dependency['last_update'], dependency['filename'],
+                   os.path.dirname(dependency['file_path']))
+
+    @property
+    def dir_path(self):
+        return os.path.join(self.artifact_dir, self.version_dir)
+
+    @property
+    def file_path(self):
+        return os.path.join(self.artifact_dir, self.version_dir, self.filename)
+
+    @property
+    def extension(self):
+        return self.filename.rsplit('.', 1)[-1]
+
+    @property
+    def classifier(self):
+        return artifact_classifier(self.filename, self.artifact_id, self.version, self.extension)
+
+    @property
+    def coordinate(self):
+        """
+        (groupId, artifactId, version, classifier, extension) tuple identifying the artifact.
+        """
+        return self.group_id, self.artifact_id, self.version, self.classifier, self.extension
+
+    def __getitem__(self, field):
+        try:
+            return getattr(self, FIELD_ATTRIBUTES[field])
+        except KeyError:
+            raise KeyError(field) from None
+
+    def get(self, field, default=None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return FIELD_ATTRIBUTES.keys()
+
+    def as_dict(self):
+        return {field: getattr(self, attribute) for field, attribute in FIELD_ATTRIBUTES.items()}
+
+    def __eq__(self, other):
+        if not isinstance(other, ArtifactRecord):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
+
+    def __hash__(self):
+        return hash((self.group_id, self.artifact_id, self.version, self.filename, self.file_path))
+
+    def __repr__(self):
+        return f"ArtifactRecord({self.group_id!r}, {self.artifact_id!r}, {self.version!r}, {self.filename!r})"
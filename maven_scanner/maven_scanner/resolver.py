@@ -0,0 +1,171 @@
+"""Resolution of ${...} placeholders in pom coordinates and dependencies, using parent poms of the repository."""
+import os
+import re
+import threading
+from collections import OrderedDict
+from maven_scanner.pom import COORDINATES, read_pom_model
+
+PLACEHOLDER = re.compile(r'\$\{([^}]+)\}')
+PARENT_CACHE_SIZE = 1024
+# Longest parent chain followed, guards against poms that are (indirectly) their own parent
+MAX_PARENT_DEPTH = 16
+MAX_INTERPOLATION_PASSES = 10
+DEFAULT_SCOPE = 'compile'
+
+
+def has_placeholder(value):
+    return value is not None and '${' in value
+
+
+def pom_path(maven_repo_path, group_id, artifact_id, version):
+    """
+    Return the path of the pom of the given coordinates in the repository layout.
+    """
+    return os.path.join(maven_repo_path, *group_id.split('.'), artifact_id, version, f"{artifact_id}-{version}.pom")
+
+
+def interpolate(value, properties):
+    """
+    Replace ${name} placeholders in value with properties, also in replaced values, leaving unknown ones as is.
+    """
+    for _ in range(MAX_INTERPOLATION_PASSES):
+        if not has_placeholder(value):
+            break
+        replaced = PLACEHOLDER.sub(lambda match: properties.get(match.group(1), match.group(0)), value)
+        if replaced == value:
+            break
+        value = replaced
+    return value
+
+
+class PomResolver:
+    """
+    Resolves the effective coordinates of poms whose groupId, artifactId or version use properties such as
+    ${project.version} or ${revision}, or inherit them from a parent, and their effective dependencies.
+
+    Parents are looked up in the local repository by their coordinates. What they pass on is kept in
+    an LRU cache keyed by coordinates, so the parent shared by thousands of artifacts (eg. spring-boot-parent) is
+    parsed once. The resolver can be shared by threads.
+    """
+
+    def __init__(self, maven_repo_path, cache_size=PARENT_CACHE_SIZE):
+        self.maven_repo_path = maven_repo_path
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._parents = OrderedDict()
+        self._lock = threading.Lock()
+
+    def resolve(self, pom_file_path):
+        """
+        Return the groupId, artifactId and version of the pom with all resolvable placeholders replaced.
+        Placeholders that cannot be resolved, eg. because the parent pom is not in the repository, are kept.
+        Raise ValueError when a coordinate is declared neither by the project nor by its parent.
+        """
+        return self._effective(read_pom_model(pom_file_path), 0)[0]
+
+    def resolve_dependencies(self, pom_file_path):
+        """
+        Return the resolved coordinates of the pom, like resolve, with the project's dependencies added as a list
+        under 'dependencies'. Dependencies are dicts of groupId, artifactId, version, scope and optional; those
+        inherited from parents are included, versions and scopes missing from a dependency are taken from the
+        <dependencyManagement> of the project and its parents. The parent and the BOMs imported by the
+        <dependencyManagement> are listed too, with the scopes 'parent' and 'import'.
+        """
+        model = read_pom_model(pom_file_path)
+        coordinates, inherited, properties = self._effective(model, 0)
+
+        managed = {}
+        imports = []
+        for declared in inherited['managed']:
+            dependency = {name: interpolate(value, properties) for name, value in declared.items()}
+            if dependency.get('scope') == 'import':
+                imports.append(_dependency(dependency, 'import'))
+            else:
+                # Declarations of the project come last and override those of its parents
+                managed[(dependency.get('groupId'), dependency.get('artifactId'))] = dependency
+
+        dependencies = []
+        if len(model['parent']) == len(COORDINATES):
+            parent = {name: interpolate(model['parent'][name], properties) for name in COORDINATES}
+            dependencies.append(_dependency(parent, 'parent'))
+        for declared in inherited['dependencies']:
+            dependency = {name: interpolate(value, properties) for name, value in declared.items()}
+            defaults = managed.get((dependency.get('groupId'), dependency.get('artifactId')), {})
+            dependency.setdefault('version', defaults.get('version'))
+            dependency.setdefault('scope', defaults.get('scope', DEFAULT_SCOPE))
+            dependencies.append(_dependency(dependency))
+        coordinates['dependencies'] = dependencies + imports
+        return coordinates
+
+    def _effective(self, model, depth):
+        """
+        Return (coordinates, inherited, properties) of a pom model: its coordinates with placeholders resolved,
+        what its children inherit and the properties its placeholders are resolved with. inherited is a dict of
+        the 'properties', 'managed' dependencies and 'dependencies' of the project and its parents.
+        """
+        # Properties of a project are inherited as declared and interpolated in the context of the child, so a
+        # parent's ${project.version} gives the version of the child
+        inherited = {'properties': {}, 'managed': [], 'dependencies': []}
+        # A parent version can use a property of the child, eg. ${revision} in CI friendly multi-module builds
+        parent = {name: interpolate(value, model['properties']) for name, value in model['parent'].items()}
+        if len(parent) == len(COORDINATES) and depth < MAX_PARENT_DEPTH:
+            parent_inherited = self._parent_model(tuple(parent[name] for name in COORDINATES), depth + 1)
+            if parent_inherited is not None:
+                for name, value in parent_inherited.items():
+                    inherited[name] = value.copy()
+        inherited['properties'].update(model['properties'])
+        inherited['managed'].extend(model['managed'])
+        inherited['dependencies'].extend(model['dependencies'])
+
+        raw = {}
+        for name in COORDINATES:
+            if model['coordinates'].get(name) is not None:
+                raw[name] = model['coordinates'][name]
+            elif parent.get(name) is not None:
+                raw[name] = parent[name]
+            else:
+                raise ValueError(f"No {name} declared in project or parent")
+
+        properties = dict(inherited['properties'])
+        # Built-in project properties, the bare names are deprecated but still found in older poms
+        for name in COORDINATES:
+            properties[f"project.{name}"] = properties[f"pom.{name}"] = properties[name] = raw[name]
+            if parent.get(name) is not None:
+                properties[f"project.parent.{name}"] = properties[f"parent.{name}"] = parent[name]
+        return {name: interpolate(raw[name], properties) for name in COORDINATES}, inherited, properties
+
+    def _parent_model(self, coordinates, depth):
+        """
+        Return what the parent with the given coordinates passes on, or None when its pom is missing.
+        """
+        with self._lock:
+            if coordinates in self._parents:
+                self.hits += 1
+                self._parents.move_to_end(coordinates)
+                return self._parents[coordinates]
+            self.misses += 1
+
+        # Parsed outside of the lock, two threads missing the same parent at once both parse it
+        inherited = None
+        if not any(has_placeholder(value) for value in coordinates):
+            try:
+                inherited = self._effective(read_pom_model(pom_path(self.maven_repo_path, *coordinates)), depth)[1]
+            except (OSError, ValueError, SyntaxError):
+                pass
+
+        with self._lock:
+            self._parents[coordinates] = inherited
+            if len(self._parents) > self.cache_size:
+                self._parents.popitem(last=False)
+        return inherited
+
+
+def _dependency(declared, scope=None):
+    return {
+        'groupId': declared.get('groupId'),
+        'artifactId': declared.get('artifactId'),
+        'version': declared.get('version'),
+        'scope': scope or declared.get('scope') or DEFAULT_SCOPE,
+        'optional': declared.get('optional') == 'true',
+    }
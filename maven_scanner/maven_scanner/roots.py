@@ -0,0 +1,44 @@
+"""Repository roots given on the command line, as paths, glob patterns or manifest files."""
+import glob
+import os
+
+MANIFEST_COMMENT = '#'
+
+
+def read_manifest(manifest_path):
+    """
+    Return the roots listed in a manifest file: one path or glob pattern per line, blank lines and lines starting
+    with '#' are skipped. Relative paths are relative to the manifest's directory.
+    """
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    roots = []
+    with open(manifest_path) as file:
+        for line in file:
+            line = line.strip()
+            if line and not line.startswith(MANIFEST_COMMENT):
+                roots.extend(_expand(os.path.join(base_dir, os.path.expanduser(line))))
+    return roots
+
+
+def _expand(root):
+    if not glob.has_magic(root):
+        return [root]
+    return sorted(path for path in glob.glob(root) if os.path.isdir(path))
+
+
+def expand_roots(roots=(), patterns=(), manifests=()):
+    """
+    Return the paths of the roots given as paths, glob patterns matching directories and manifest files, in that
+    order and without duplicates: a root given twice, eg. once relative and once absolute, is returned as first
+    given. Paths are returned even when they do not exist, so a missing root is reported by the scan instead of
+    being left out silently.
+    """
+    expanded = [os.path.expanduser(root) for root in roots]
+    for pattern in patterns:
+        expanded.extend(_expand(os.path.expanduser(pattern)))
+    for manifest_path in manifests:
+        expanded.extend(read_manifest(manifest_path))
+    unique = {}
+    for root in expanded:
+        unique.setdefault(os.path.abspath(root), root)
+    return list(unique.values())
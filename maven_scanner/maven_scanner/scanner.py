@@ -1,136 +1,248 @@
 """Main module."""
-import re
-from datetime import datetime
 import os
-import xml.etree.ElementTree as ET
+from maven_scanner.pom import COORDINATES, read_pom_coordinates
+from maven_scanner.provenance import ProvenanceCache, is_provenance_file
+from maven_scanner.resolver import PomResolver, has_placeholder
+from maven_scanner.stats import ScanStats
+from maven_scanner.walker import list_directory, walk_repository
+
+# Suffix of the index entries of poms parsed with their dependencies, kept apart from plain coordinates
+DEPENDENCIES_ENTRY_SUFFIX = '#dependencies'
 
 
 class MavenScanner:
-    def __init__(self, debug='True'):
+    def __init__(self, debug='True', index=None, engine=None, collect_dependencies=False):
         self.debug = debug
+        self.index = index
+        self.engine = engine
+        # Read the dependencies of poms together with their coordinates, eg. to build a DependencyGraph
+        self.collect_dependencies = collect_dependencies
         self.error_counter = 0
         self.jar_dir_dict = {}
+        self.dir_records = {}
+        self.provenance = ProvenanceCache()
+        self.stats = ScanStats()
         self.maven_repo_path = os.path.join(os.path.expanduser("~"), ".m2", "repository")
+        self.pom_resolver = PomResolver(self.maven_repo_path)
 
     def get_maven_repo_path(self):
         return self.maven_repo_path
 
-    def scan_maven_repo_for_dependencies(self, maven_repo_path):
+    def scan_maven_repo_for_dependencies(self, maven_repo_path, dependency_filter=None, sub_dirs=None):
+        """
+        Scan the Maven local repository and initialize jar_dir_dict, mapping the path of every JAR and ZIP file to
+        the directory it is stored in. Paths are used as keys since the same file name can be found in several
+        directories, eg. when a groupId was relocated.
+        Every directory is listed once; the per-directory records are kept in dir_records and reused by the parsers.
+        Directories are listed by the scanner engine, eg. an AsyncEngine, when one is set.
+        When a DependencyFilter is given, only artifacts matching its filename and groupId patterns are recorded.
+        When sub_dirs are given, only these directories of the repository are walked.
         """
-        Scan the Maven local repository and initialize jar_dir_list with directories where JAR files are stored.
+        for _ in self.iter_maven_repo_artifacts(maven_repo_path, dependency_filter, sub_dirs):
+            pass
+
+    def iter_maven_repo_artifacts(self, maven_repo_path, dependency_filter=None, sub_dirs=None):
+        """
+        Scan the Maven local repository like scan_maven_repo_for_dependencies, but lazily: return an iterator of
+        (filename, dir_path) tuples of all matching artifacts, each produced as soon as its directory was listed.
         """
         self.error_counter = 0
+        self.maven_repo_path = maven_repo_path
+        self.pom_resolver = PomResolver(maven_repo_path)
 
         if not os.path.exists(maven_repo_path):
             self.error_counter += 1
+            self.stats.error('repository_missing')
             raise FileNotFoundError("Maven repository path does not exist.")
 
+        return self._walk(maven_repo_path, dependency_filter, sub_dirs)
+
+    def _walk(self, maven_repo_path, dependency_filter, sub_dirs):
         # Traverse the Maven repository directory
-        for root, dirs, files in os.walk(maven_repo_path):
-            for jar_dir in dirs:
-                dir_full_path = os.path.join(root, jar_dir)
-                for file in os.listdir(dir_full_path):
-                    if file.endswith('.jar') or file.endswith('.zip'):
-                        if not file.endswith('-sources.jar'):       #Do not deploy source jar's
-                            self.jar_dir_dict[file] = dir_full_path
+        stats = self.stats
+        for root in sub_dirs if sub_dirs is not None else [maven_repo_path]:
+            if self.engine is not None:
+                lister = self.index.list_directory if self.index is not None else list_directory
+                records = self.engine.iter_walk(root, lister, stats)
+            else:
+                records = walk_repository(root, self.index, stats)
+            while True:
+                # Only the time spent walking is counted, not the time the consumer spends between artifacts
+                with stats.timer('walk'):
+                    record = next(records, None)
+                    if record is None:
+                        break
+                    self.dir_records[record.path] = record
+                    stats.count('artifact_directories')
+                    found = [file for file in record.artifacts if dependency_filter is None or
+                             dependency_filter.matches_artifact(maven_repo_path, record.path, file)]
+                    stats.count('artifacts_found', len(found))
+                    stats.count('artifacts_filtered_out', len(record.artifacts) - len(found))
+                for file in found:
+                    self.jar_dir_dict[os.path.join(record.path, file)] = record.path
+                    yield file, record.path
 
-    def parse_pom_file(self, dir_path):
+    def artifacts(self, dependency_filter=None):
         """
-        Parse the <dependencyname>.pom file in the given directory and retrieve groupId, artifactId, and version.
+        Return (filename, dir_path) tuples of all scanned artifacts, in scan order, or of those matching the
+        filename and groupId patterns of dependency_filter when given.
         """
-        pom_file_path = None
-        # Find the .pom file corresponding to the JAR or ZIP
-        for file in os.listdir(dir_path):
-            if file.endswith('.pom'):
-                pom_file_path = os.path.join(dir_path, file)
-                break
+        return [(os.path.basename(file_path), dir_path) for file_path, dir_path in self.jar_dir_dict.items()
+                if dependency_filter is None or
+                dependency_filter.matches_artifact(self.maven_repo_path, dir_path, os.path.basename(file_path))]
 
-        if not pom_file_path:
-            self.error_counter += 1
-            if self.debug:
-                print(f"No .pom file found in directory: {dir_path}")
-            return None
+    def _find_file(self, dir_path, attribute, extension):
+        """
+        Return the path of the first file with the given extension in dir_path. The scanned directory record is
+        used when available, the directory is listed only for paths that were not part of a scan.
+        """
+        record = self.dir_records.get(dir_path)
+        if record is not None:
+            names = getattr(record, attribute)
+        else:
+            names = [file for file in os.listdir(dir_path) if file.endswith(extension)]
+        return os.path.join(dir_path, names[0]) if names else None
 
+    def _lookup_parsed(self, file_path, key=None):
+        """
+        Look up the index entry of file_path, or the entry named key that is derived from file_path.
+        """
+        if self.index is None:
+            return None, None
+        if key is None:
+            return self.index.lookup_parsed(file_path)
         try:
-            tree = ET.parse(pom_file_path)
-            root = tree.getroot()
-
-            # Extracting groupId, artifactId, and version from the pom file
-            namespaces = {
-                '': '',
-                'ns': 'http://maven.apache.org/POM/4.0.0'
-            }
-
-            ns_prefix = "ns:" if root.tag.split('}')[0][1:] == 'http://maven.apache.org/POM/4.0.0' else ""
-
-            project_group_id_element = root.findall('./{ns}groupId'.format(ns=ns_prefix), namespaces)
-            project_artifact_id_element = root.findall('./{ns}artifactId'.format(ns=ns_prefix), namespaces)
-            project_version_element = root.findall('./{ns}version'.format(ns=ns_prefix), namespaces)
-
-            parent_group_id_element = root.findall('.//{ns}parent/{ns}groupId'.format(ns=ns_prefix), namespaces)
-            parent_artifact_id_element = root.findall('.//{ns}parent/{ns}artifactId'.format(ns=ns_prefix), namespaces)
-            parent_version_element = root.findall('.//{ns}parent/{ns}version'.format(ns=ns_prefix), namespaces)
-
-            group_id = project_group_id_element.pop().text if len(
-                project_group_id_element) != 0 else parent_group_id_element.pop().text
-            artifact_id = project_artifact_id_element.pop().text if len(
-                project_artifact_id_element) != 0 else parent_artifact_id_element.pop().text
-            version = project_version_element.pop().text if len(
-                project_version_element) != 0 else parent_version_element.pop().text
-
-            return {
-                'groupId': group_id,
-                'artifactId': artifact_id,
-                'version': version
-            }
-        except Exception as e:
-            self.error_counter += 1
-            if self.debug:
-                print(f"Error parsing pom file {pom_file_path}: {e}")
-            return None
+            mtime_ns = os.stat(file_path).st_mtime_ns
+        except OSError:
+            return None, None
+        return self.index.lookup_parsed(key, mtime_ns)
 
-    def parse_last_updated_file(self, dir_path):
+    def _store_parsed(self, file_path, mtime_ns, result):
+        if self.index is not None:
+            self.index.store_parsed(file_path, mtime_ns, result)
+        return result
+
+    def _error(self, category, message=None):
+        self.error_counter += 1
+        self.stats.error(category)
+        if self.debug and message:
+            print(message)
+
+    def worker(self):
         """
-        Parse the <artefactName>.lastUpdated file in the given directory and extract repository URL
-        of the latest successful update along with its timestamp/date.
+        Return a scanner that shares the scanned records and index of this one but counts its own errors and stats.
+        Used to parse from several threads without racing on error_counter.
         """
-        last_updated_file_path = None
-        filename = ""
-        # Find the .pom file corresponding to the JAR
-        for file in os.listdir(dir_path):
-            if file.endswith('.lastUpdated'):
-                filename = file
-                last_updated_file_path = os.path.join(dir_path, file)
-                break
+        worker = MavenScanner(self.debug, self.index, collect_dependencies=self.collect_dependencies)
+        worker.dir_records = self.dir_records
+        worker.provenance = self.provenance
+        worker.pom_resolver = self.pom_resolver
+        worker.maven_repo_path = self.maven_repo_path
+        return worker
 
-        if not last_updated_file_path:
-            self.error_counter += 1
-            if self.debug:
-                print(f"No .lastUpdated file found in directory: {dir_path}")
-            return None
+    def close(self):
+        """
+        Persist and close the scan index, if one is used, and add the cache hit counts to stats.
+        """
+        self.stats.count('provenance_hits', self.provenance.hits)
+        self.stats.count('provenance_misses', self.provenance.misses)
+        self.provenance.hits = self.provenance.misses = 0
+        self.stats.count('parent_pom_hits', self.pom_resolver.hits)
+        self.stats.count('parent_pom_misses', self.pom_resolver.misses)
+        self.pom_resolver.hits = self.pom_resolver.misses = 0
+        if self.index is not None:
+            self.stats.count('index_hits', self.index.hits)
+            self.stats.count('index_misses', self.index.misses)
+            self.index.close()
+            self.index = None
 
-        try:
-            with open(last_updated_file_path, 'r') as file:
-                content = file.read()
+    def parse_pom_file(self, dir_path):
+        """
+        Parse the <dependencyname>.pom file in the given directory and retrieve groupId, artifactId, and version.
+        With collect_dependencies, the resolved dependencies of the pom are read in the same pass and returned
+        under 'dependencies'.
+        """
+        with self.stats.timer('parse_pom'):
+            # Find the .pom file corresponding to the JAR or ZIP
+            pom_file_path = self._find_file(dir_path, 'poms', '.pom')
 
-            # Extracting repository URL and timestamp/date using named groups
-            pattern = r'(?P<repo_url>.+?).lastUpdated=(?P<last_updated>\d+)'
-            matches = re.finditer(pattern, content)
+            if not pom_file_path:
+                self._error('pom_missing', f"No .pom file found in directory: {dir_path}")
+                return None
 
-            latest_update = max(matches, key=lambda match: int(match.group('last_updated')))
+            key = pom_file_path + DEPENDENCIES_ENTRY_SUFFIX if self.collect_dependencies else pom_file_path
+            mtime_ns, cached = self._lookup_parsed(pom_file_path, key)
+            if cached is not None:
+                self.stats.count('poms_from_index')
+                return cached
 
-            repository_url = latest_update.group('repo_url')
-            timestamp = int(latest_update.group('last_updated')) // 1000  # Convert milliseconds to seconds
-            update_date = datetime.utcfromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+            try:
+                # Extracting groupId, artifactId, and version from the pom file
+                self.stats.count('poms_parsed')
+                if self.collect_dependencies:
+                    # The whole pom is read anyway, coordinates are resolved with the dependencies
+                    coordinates = self._resolve_pom(pom_file_path)
+                else:
+                    coordinates = read_pom_coordinates(pom_file_path)
+                    if any(has_placeholder(value) for value in coordinates.values()):
+                        coordinates = self._resolve_pom(pom_file_path)
+                return self._store_parsed(key, mtime_ns, coordinates)
+            except Exception as e:
+                self._error('pom_invalid', f"Error parsing pom file {pom_file_path}: {e}")
+                return None
 
-            return {
-                'repository_url': repository_url,
-                'update_date': update_date
-            }
-        except Exception as e:
+    def _resolve_pom(self, pom_file_path):
+        """
+        Resolve ${...} properties in the coordinates of a pom, with its parents from the repository, and its
+        dependencies with collect_dependencies.
+        """
+        if self.collect_dependencies:
+            coordinates = self.pom_resolver.resolve_dependencies(pom_file_path)
+            self.stats.count('dependencies_read', len(coordinates['dependencies']))
+        else:
+            self.stats.count('poms_resolved')
+            coordinates = self.pom_resolver.resolve(pom_file_path)
+        if any(has_placeholder(coordinates[name]) for name in COORDINATES):
+            self.stats.error('pom_unresolved')
             if self.debug:
-                print(f"Error parsing lastUpdated file {last_updated_file_path}: {e}")
-            return None
+                print(f"Unresolved properties in pom file {pom_file_path}: {coordinates}")
+        return coordinates
+
+    def parse_dependency_dir(self, dir_path):
+        """
+        Parse the pom file and, when it was readable, the lastUpdated file of an artifact directory.
+        Return a (pom_data, last_update_data) tuple.
+        """
+        pom_data = self.parse_pom_file(dir_path)
+        last_update_data = self.parse_last_updated_file(dir_path) if pom_data else None
+        return pom_data, last_update_data
+
+    def parse_last_updated_file(self, dir_path):
+        """
+        Parse the .lastUpdated and _remote.repositories files in the given directory and extract repository URL
+        of the latest successful update along with its timestamp/date. Results are memoized per directory until
+        the files change.
+        """
+        with self.stats.timer('parse_provenance'):
+            record = self.dir_records.get(dir_path)
+            if record is not None:
+                names = record.provenance
+            else:
+                names = sorted(file for file in os.listdir(dir_path) if is_provenance_file(file))
+
+            if not names:
+                self._error('last_updated_missing', f"No .lastUpdated file found in directory: {dir_path}")
+                return None
+
+            try:
+                self.stats.count('provenance_lookups')
+                return self.provenance.read(dir_path, [os.path.join(dir_path, name) for name in names], self.index)
+            except Exception as e:
+                # Unreadable provenance is reported, but not counted in error_counter
+                self.stats.error('last_updated_invalid')
+                if self.debug:
+                    print(f"Error parsing lastUpdated files in {dir_path}: {e}")
+                return None
 
 
 # Example usage:
@@ -143,7 +255,7 @@ if __name__ == "__main__":
 
     empty_entries_count = 0
 
-    for dir_path in scanner.jar_dir_list:
+    for dir_path in set(scanner.jar_dir_dict.values()):
         pom_data = scanner.parse_pom_file(dir_path)
         if pom_data:
             print("Directory:", dir_path)
@@ -0,0 +1,35 @@
+"""Reading of the Maven settings.xml file."""
+import os
+import xml.etree.ElementTree as ET
+
+
+def default_settings_path():
+    return os.path.join(os.path.expanduser("~"), ".m2", "settings.xml")
+
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _child_text(element, name):
+    for child in element:
+        if _local_name(child.tag) == name:
+            return child.text.strip() if child.text else ''
+    return None
+
+
+def read_server_credentials(server_id, settings_path=None):
+    """
+    Return (username, password) of the <server> with the given id in settings.xml, or None when the file or
+    the server entry does not exist. Works for every settings namespace version and for files without one.
+    Encrypted passwords are returned as they are stored.
+    """
+    settings_path = settings_path or default_settings_path()
+    if not os.path.exists(settings_path):
+        return None
+
+    root = ET.parse(settings_path).getroot()
+    for element in root.iter():
+        if _local_name(element.tag) == 'server' and _child_text(element, 'id') == server_id:
+            return _child_text(element, 'username'), _child_text(element, 'password')
+    return None
@@ -0,0 +1,107 @@
+"""Per-stage timings and counters of a scan."""
+import json
+import time
+from contextlib import contextmanager
+
+# Stages in the order they are reported
+STAGES = ('walk', 'parse_pom', 'parse_provenance', 'filter', 'merge', 'output', 'deploy', 'total')
+
+
+class ScanStats:
+    """
+    Durations per stage, named counters and error counts per category collected during a scan.
+
+    Durations of stages run by several workers at once are summed over the workers, so with jobs > 1 a stage
+    can take longer than the whole run. Stats of workers are combined with merge().
+    """
+
+    def __init__(self):
+        self.durations = {}
+        self.counters = {}
+        self.errors = {}
+
+    @contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_duration(stage, time.perf_counter() - start)
+
+    def add_duration(self, stage, seconds):
+        self.durations[stage] = self.durations.get(stage, 0.0) + seconds
+
+    def count(self, name, number=1):
+        self.counters[name] = self.counters.get(name, 0) + number
+
+    def error(self, category):
+        self.errors[category] = self.errors.get(category, 0) + 1
+
+    def merge(self, other):
+        for stage, seconds in other.durations.items():
+            self.add_duration(stage, seconds)
+        for name, number in other.counters.items():
+            self.count(name, number)
+        for category, number in other.errors.items():
+            self.errors[category] = self.errors.get(category, 0) + number
+
+    def hit_rate(self, cache):
+        """
+        Return the share of lookups answered by cache, from its '<cache>_hits' and '<cache>_misses' counters,
+        or None when it was not used.
+        """
+        hits = self.counters.get(f"{cache}_hits", 0)
+        lookups = hits + self.counters.get(f"{cache}_misses", 0)
+        return hits / lookups if lookups else None
+
+    def caches(self):
+        return sorted(name[:-len('_hits')] for name in self.counters if name.endswith('_hits'))
+
+    def as_dict(self):
+        return {
+            'durations': {stage: round(seconds, 6) for stage, seconds in self._ordered_durations()},
+            'counters': dict(sorted(self.counters.items())),
+            'cache_hit_rates': {cache: self.hit_rate(cache) for cache in self.caches()},
+            'errors': dict(sorted(self.errors.items())),
+        }
+
+    def to_json(self):
+        return json.dumps(self.as_dict(), indent=2)
+
+    def summary(self):
+        lines = ['Stage durations:']
+        lines += [f"  {stage:<18}{seconds:10.3f}s" for stage, seconds in self._ordered_durations()]
+        lines.append('Counters:')
+        lines += [f"  {name:<28}{number:10}" for name, number in sorted(self.counters.items())]
+        for cache in self.caches():
+            rate = self.hit_rate(cache)
+            if rate is not None:
+                lines.append(f"  {cache + ' cache hit rate':<28}{100 * rate:9.1f}%")
+        lines.append('Errors:' if self.errors else 'Errors: none')
+        lines += [f"  {category:<28}{number:10}" for category, number in sorted(self.errors.items())]
+        return '\n'.join(lines)
+
+    def _ordered_durations(self):
+        known = [(stage, self.durations[stage]) for stage in STAGES if stage in self.durations]
+        return known + sorted((stage, seconds) for stage, seconds in self.durations.items() if stage not in STAGES)
+
+
+class TimedIterator:
+    """
+    Iterator adding the time spent producing each item of iterable to seconds, eg. to tell the time spent in
+    a streaming pipeline apart from the time its consumer spends writing the items out.
+    """
+
+    def __init__(self, iterable):
+        self._iterator = iter(iterable)
+        self.seconds = 0.0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            return next(self._iterator)
+        finally:
+            self.seconds += time.perf_counter() - start
@@ -0,0 +1,239 @@
+"""Disk usage and staleness of the artifact versions of a Maven local repository, and pruning of old snapshots."""
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from maven_scanner.provenance import LAST_UPDATED_EXTENSION, read_last_updated
+from maven_scanner.walker import classify_entries
+
+SNAPSHOT_SUFFIX = '-SNAPSHOT'
+DEFAULT_USAGE_JOBS = 8
+# Depth below the repository root of the sub trees walked by separate workers, eg. org/apache
+SPLIT_DEPTH = 2
+
+
+class VersionUsage:
+    """
+    Disk usage of one version directory: total size and number of its files, modification time of its newest file
+    and the time of the latest successful download recorded in its .lastUpdated files, if any. Times are in
+    seconds since the epoch.
+    """
+    __slots__ = ('path', 'group_id', 'artifact_id', 'version', 'size', 'files', 'newest_mtime', 'last_updated')
+
+    def __init__(self, path, group_id, artifact_id, version, size, files, newest_mtime, last_updated=None):
+        self.path = path
+        self.group_id = group_id
+        self.artifact_id = artifact_id
+        self.version = version
+        self.size = size
+        self.files = files
+        self.newest_mtime = newest_mtime
+        self.last_updated = last_updated
+
+    def __repr__(self):
+        return f"VersionUsage({self.group_id!r}, {self.artifact_id!r}, {self.version!r}, size={self.size!r})"
+
+    @property
+    def last_used(self):
+        """
+        When the version was last downloaded: the .lastUpdated timestamp, or the newest file's mtime without one.
+        """
+        return self.last_updated if self.last_updated is not None else self.newest_mtime
+
+    @property
+    def is_snapshot(self):
+        return self.version.endswith(SNAPSHOT_SUFFIX)
+
+
+def _scan_directory(path):
+    """
+    List path once with os.scandir and return (sub_directories, file_names, total_size, newest_mtime).
+    The sizes come from the stat calls of the directory entries. Unreadable entries are skipped.
+    """
+    sub_dirs = []
+    file_names = []
+    size = 0
+    newest_mtime = 0.0
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        sub_dirs.append(entry.path)
+                        continue
+                    stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                file_names.append(entry.name)
+                size += stat.st_size
+                newest_mtime = max(newest_mtime, stat.st_mtime)
+    except OSError:
+        pass
+    sub_dirs.sort()
+    return sub_dirs, file_names, size, newest_mtime
+
+
+def _read_last_updated(dir_path, file_names):
+    latest = None
+    for name in file_names:
+        if not name.endswith(LAST_UPDATED_EXTENSION):
+            continue
+        try:
+            update = read_last_updated(os.path.join(dir_path, name))
+        except (OSError, ValueError):
+            continue
+        if update is not None and (latest is None or update[1] > latest):
+            latest = update[1]
+    return latest / 1000 if latest is not None else None  # Milliseconds to seconds
+
+
+class DiskUsage:
+    """
+    Sizes of the version directories of a repository, aggregated per groupId and per artifact on request.
+    size and files are the totals of the whole repository, including files outside of version directories such as
+    maven-metadata files of artifacts.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.versions = []
+        self.size = 0
+        self.files = 0
+
+    def _add_directory(self, path, scanned):
+        """
+        Record a directory listed by _scan_directory, a version directory when it holds artifacts, poms or
+        lastUpdated files.
+        """
+        _, file_names, size, newest_mtime = scanned
+        self.size += size
+        self.files += len(file_names)
+        if classify_entries(path, file_names) is None:
+            return
+        parts = os.path.relpath(path, self.root).split(os.sep)
+        if len(parts) < 3:
+            # Not in the <groupId path>/<artifactId>/<version> layout
+            return
+        self.versions.append(VersionUsage(path, '.'.join(parts[:-2]), parts[-2], parts[-1], size,
+                                          len(file_names), newest_mtime, _read_last_updated(path, file_names)))
+
+    def _walk(self, root):
+        usage = DiskUsage(self.root)
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            scanned = _scan_directory(path)
+            usage._add_directory(path, scanned)
+            stack.extend(reversed(scanned[0]))
+        return usage
+
+    def _merge(self, other):
+        self.versions.extend(other.versions)
+        self.size += other.size
+        self.files += other.files
+
+    def by_group(self):
+        """
+        Return {groupId: (size, files)} of the versions of each groupId, sub groups not included.
+        """
+        return self._aggregate(lambda version: version.group_id)
+
+    def by_artifact(self):
+        """
+        Return {(groupId, artifactId): (size, files)} over all versions of each artifact.
+        """
+        return self._aggregate(lambda version: (version.group_id, version.artifact_id))
+
+    def _aggregate(self, key):
+        totals = {}
+        for version in self.versions:
+            size, files = totals.get(key(version), (0, 0))
+            totals[key(version)] = (size + version.size, files + version.files)
+        return totals
+
+    def stalest(self, count):
+        """
+        Return the count versions that were downloaded the longest time ago.
+        """
+        return sorted(self.versions, key=lambda version: (version.last_used, version.path))[:count]
+
+
+def scan_usage(root, jobs=DEFAULT_USAGE_JOBS):
+    """
+    Walk the repository once and return its DiskUsage. Every directory is listed with os.scandir and the sizes of
+    its files are taken from the stat calls of its entries. Sub trees SPLIT_DEPTH levels below root, eg. org/apache,
+    are walked by a pool of jobs threads, so the stat calls of several directories are waiting on the file system at
+    the same time. Versions are returned in depth-first sorted order.
+    """
+    if not os.path.isdir(root):
+        raise FileNotFoundError("Maven repository path does not exist.")
+    usage = DiskUsage(root)
+    # The first levels are listed here, the sub trees below them are handed out to the workers
+    level = [root]
+    for _ in range(SPLIT_DEPTH):
+        next_level = []
+        for path in level:
+            scanned = _scan_directory(path)
+            usage._add_directory(path, scanned)
+            next_level.extend(scanned[0])
+        level = next_level
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        for sub_usage in pool.map(usage._walk, level):
+            usage._merge(sub_usage)
+    usage.versions.sort(key=lambda version: version.path.split(os.sep))
+    return usage
+
+
+def largest(totals, count):
+    """
+    Return the count (key, (size, files)) items of totals, eg. DiskUsage.by_group(), with the largest sizes.
+    """
+    return sorted(totals.items(), key=lambda item: (-item[1][0], item[0]))[:count]
+
+
+def snapshots_to_prune(usage, keep=1, older_than_days=30, now=None):
+    """
+    Return the SNAPSHOT versions of usage past the retention policy: those of an artifact that are not among its
+    keep most recently used ones and were last used more than older_than_days days ago, oldest first.
+    """
+    now = time.time() if now is None else now
+    cutoff = now - older_than_days * 24 * 3600
+    snapshots = {}
+    for version in usage.versions:
+        if version.is_snapshot:
+            snapshots.setdefault((version.group_id, version.artifact_id), []).append(version)
+
+    prunable = []
+    for versions in snapshots.values():
+        versions.sort(key=lambda version: version.last_used, reverse=True)
+        prunable.extend(version for version in versions[keep:] if version.last_used < cutoff)
+    return sorted(prunable, key=lambda version: (version.last_used, version.path))
+
+
+def remove_versions(versions):
+    """
+    Delete the directories of versions. Return the number of bytes freed and (path, error) pairs of the
+    directories that could not be deleted.
+    """
+    freed = 0
+    errors = []
+    for version in versions:
+        try:
+            shutil.rmtree(version.path)
+        except OSError as e:
+            errors.append((version.path, str(e)))
+            continue
+        freed += version.size
+    return freed, errors
+
+
+def format_size(size):
+    """
+    Return size in bytes as a human readable string, eg. '1.5 GiB'.
+    """
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
@@ -0,0 +1,189 @@
+"""Verification of artifact files against their .sha1 sidecars and detection of duplicate artifacts."""
+import hashlib
+import mmap
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+HASH_BUFFER_SIZE = 1024 * 1024
+# Files of at least this size are hashed from a memory map instead of buffered reads
+MMAP_THRESHOLD = 16 * 1024 * 1024
+SIDECAR_EXTENSION = '.sha1'
+
+
+def hash_file(file_path, size=None):
+    """
+    Return the sha1 hex digest of a file. Small files are read into a reused buffer, large ones are memory mapped.
+    hashlib releases the GIL while hashing large blocks, so several files can be hashed in parallel threads.
+    """
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as file:
+        if size is None:
+            size = os.fstat(file.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+            return digest.hexdigest()
+        buffer = bytearray(min(HASH_BUFFER_SIZE, max(size, 1)))
+        view = memoryview(buffer)
+        for read in iter(lambda: file.readinto(buffer), 0):
+            digest.update(view[:read])
+    return digest.hexdigest()
+
+
+def read_sidecar(file_path):
+    """
+    Return the checksum recorded in the .sha1 file next to file_path, or None when there is none. Sidecars hold
+    the hex digest alone or followed by the file name, like sha1sum output.
+    """
+    try:
+        with open(file_path + SIDECAR_EXTENSION, 'r') as file:
+            content = file.read(256).split()
+    except OSError:
+        return None
+    return content[0].lower() if content else ''
+
+
+class HashCache:
+    """
+    sha1 digests of files, reused as long as the file's size and mtime did not change. Kept in the ScanIndex, and
+    so across runs, when one is given, in memory otherwise.
+    """
+
+    def __init__(self, index=None):
+        self.index = index
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+
+    def lookup(self, file_path, size, mtime_ns):
+        if self.index is not None:
+            cached = self.index.lookup_parsed(file_path, mtime_ns)[1]
+        else:
+            cached = self._entries.get(file_path)
+            cached = cached[1] if cached is not None and cached[0] == mtime_ns else None
+        if cached is not None and cached['size'] == size:
+            self.hits += 1
+            return cached['sha1']
+        self.misses += 1
+        return None
+
+    def store(self, file_path, size, mtime_ns, sha1):
+        entry = {'size': size, 'sha1': sha1}
+        if self.index is not None:
+            self.index.store_parsed(file_path, mtime_ns, entry)
+        else:
+            self._entries[file_path] = (mtime_ns, entry)
+
+
+class VerifyReport:
+    """
+    Outcome of verify_artifacts: (file_path, reason) pairs of corrupted files, (file_path, expected, actual) of
+    files differing from their .sha1 sidecar, lists of byte-identical files, and counts of files checked against a
+    sidecar, files without one, files hashed and hashes taken from the cache.
+    """
+
+    def __init__(self):
+        self.corrupted = []
+        self.mismatched = []
+        self.duplicates = []
+        self.verified = 0
+        self.unverified = 0
+        self.hashed = 0
+        self.cached = 0
+
+    @property
+    def ok(self):
+        return not (self.corrupted or self.mismatched)
+
+    def summary(self):
+        duplicate_files = sum(len(group) for group in self.duplicates)
+        return f"Verified against .sha1: {self.verified}, without .sha1: {self.unverified}, " \
+               f"mismatched: {len(self.mismatched)}, corrupted: {len(self.corrupted)}, " \
+               f"duplicates: {duplicate_files} files in {len(self.duplicates)} groups, " \
+               f"hashed: {self.hashed}, hashes from cache: {self.cached}"
+
+
+def verify_artifacts(file_paths, jobs=1, check_sidecars=True, find_duplicates=True, cache=None):
+    """
+    Check artifact files and return a VerifyReport.
+
+    With check_sidecars, every file is checked to be a readable zip archive and hashed when it has a .sha1 sidecar
+    to compare with. With find_duplicates, files are grouped by size first and only files sharing their size with
+    another one are hashed; byte-identical files are reported as duplicates. Hashes are computed by jobs threads
+    and reused from cache, a HashCache, when the file's size and mtime match.
+    """
+    report = VerifyReport()
+    cache = cache if cache is not None else HashCache()
+
+    stats = {}
+    for file_path in dict.fromkeys(file_paths):
+        try:
+            stat = os.stat(file_path)
+        except OSError as e:
+            report.corrupted.append((file_path, f"Not readable: {e.strerror}"))
+            continue
+        stats[file_path] = (stat.st_size, stat.st_mtime_ns)
+
+    expected = {}
+    if check_sidecars:
+        for file_path in list(stats):
+            if not zipfile.is_zipfile(file_path):
+                report.corrupted.append((file_path, "Not a valid zip archive"))
+                del stats[file_path]
+                continue
+            sidecar = read_sidecar(file_path)
+            if sidecar is None:
+                report.unverified += 1
+            else:
+                expected[file_path] = sidecar
+
+    by_size = {}
+    if find_duplicates:
+        for file_path, (size, _) in stats.items():
+            by_size.setdefault(size, []).append(file_path)
+        by_size = {size: paths for size, paths in by_size.items() if len(paths) > 1}
+
+    to_hash = set(expected).union(*by_size.values())
+    digests = {}
+    missing = []
+    for file_path in sorted(to_hash):
+        size, mtime_ns = stats[file_path]
+        sha1 = cache.lookup(file_path, size, mtime_ns)
+        if sha1 is None:
+            missing.append(file_path)
+        else:
+            digests[file_path] = sha1
+            report.cached += 1
+
+    def hash_one(file_path):
+        try:
+            return file_path, hash_file(file_path, stats[file_path][0]), None
+        except (OSError, ValueError) as e:
+            return file_path, None, e
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        for file_path, sha1, error in pool.map(hash_one, missing):
+            if error is not None:
+                report.corrupted.append((file_path, f"Not readable: {error}"))
+                continue
+            report.hashed += 1
+            digests[file_path] = sha1
+            cache.store(file_path, *stats[file_path], sha1)
+
+    for file_path, sidecar in expected.items():
+        if file_path not in digests:
+            continue
+        report.verified += 1
+        if digests[file_path] != sidecar:
+            report.mismatched.append((file_path, sidecar, digests[file_path]))
+
+    for size, paths in sorted(by_size.items()):
+        groups = {}
+        for file_path in paths:
+            if file_path in digests:
+                groups.setdefault(digests[file_path], []).append(file_path)
+        report.duplicates.extend(sorted(group) for group in groups.values() if len(group) > 1)
+    report.corrupted.sort()
+    report.mismatched.sort()
+    return report
@@ -0,0 +1,112 @@
+"""Single-pass walker over a Maven local repository."""
+import os
+from maven_scanner.provenance import LAST_UPDATED_EXTENSION, REMOTE_REPOSITORIES_FILE
+
+ARTIFACT_EXTENSIONS = ('.jar', '.zip')
+POM_EXTENSION = '.pom'
+
+
+class ArtifactDir:
+    """
+    Compact record of a single repository directory, holding only the file names the scanner is interested in.
+    """
+    __slots__ = ('path', 'artifacts', 'poms', 'last_updated', 'remote_repositories')
+
+    def __init__(self, path, artifacts=(), poms=(), last_updated=(), remote_repositories=()):
+        self.path = path
+        self.artifacts = tuple(artifacts)
+        self.poms = tuple(poms)
+        self.last_updated = tuple(last_updated)
+        self.remote_repositories = tuple(remote_repositories)
+
+    def __repr__(self):
+        return f"ArtifactDir({self.path!r}, artifacts={self.artifacts!r}, poms={self.poms!r}, " \
+               f"last_updated={self.last_updated!r}, remote_repositories={self.remote_repositories!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, ArtifactDir):
+            return NotImplemented
+        return (self.path, self.artifacts, self.poms, self.last_updated, self.remote_repositories) == \
+               (other.path, other.artifacts, other.poms, other.last_updated, other.remote_repositories)
+
+    @property
+    def pom_file(self):
+        return os.path.join(self.path, self.poms[0]) if self.poms else None
+
+    @property
+    def last_updated_file(self):
+        return os.path.join(self.path, self.last_updated[0]) if self.last_updated else None
+
+    @property
+    def provenance(self):
+        """
+        Names of the files recording where the artifacts were downloaded from.
+        """
+        return self.last_updated + self.remote_repositories
+
+
+def classify_entries(path, file_names):
+    """
+    Sort the file names of a directory into artifacts, poms, lastUpdated and _remote.repositories files.
+    Return None when the directory holds no artifacts, poms or lastUpdated files.
+    """
+    artifacts = []
+    poms = []
+    last_updated = []
+    remote_repositories = []
+    for name in file_names:
+        if name.endswith(ARTIFACT_EXTENSIONS):
+            if not name.endswith('-sources.jar'):       # Do not deploy source jar's
+                artifacts.append(name)
+        elif name.endswith(POM_EXTENSION):
+            poms.append(name)
+        elif name.endswith(LAST_UPDATED_EXTENSION):
+            last_updated.append(name)
+        elif name == REMOTE_REPOSITORIES_FILE:
+            remote_repositories.append(name)
+
+    if not (artifacts or poms or last_updated):
+        return None
+    return ArtifactDir(path, sorted(artifacts), sorted(poms), sorted(last_updated), remote_repositories)
+
+
+def list_directory(path):
+    """
+    List a directory once with os.scandir and return (sub_directories, file_names), both sorted.
+    Unreadable directories are reported as empty.
+    """
+    sub_dirs = []
+    file_names = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    sub_dirs.append(entry.path)
+                else:
+                    file_names.append(entry.name)
+    except OSError:
+        return [], []
+    sub_dirs.sort()
+    file_names.sort()
+    return sub_dirs, file_names
+
+
+def walk_repository(root, index=None, stats=None):
+    """
+    Walk the repository depth-first, listing every directory exactly once, and yield an ArtifactDir for each
+    directory that contains artifact, pom or lastUpdated files. Directories are visited in sorted order.
+    When a ScanIndex is given, listings of directories whose mtime did not change are taken from the index.
+    Listed directories and files are counted in stats, a ScanStats, when given.
+    """
+    lister = index.list_directory if index is not None else list_directory
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        sub_dirs, file_names = lister(path)
+        if stats is not None:
+            stats.count('directories_listed')
+            stats.count('files_listed', len(file_names))
+        record = classify_entries(path, file_names)
+        if record is not None:
+            yield record
+        stack.extend(reversed(sub_dirs))
@@ -0,0 +1,188 @@
+"""Notification of changes to the directories of a Maven repository, with inotify or by polling."""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from maven_scanner.walker import list_directory
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR
+EVENT_HEADER = struct.Struct('iIII')
+READ_SIZE = 64 * 1024
+DEFAULT_POLL_INTERVAL = 5.0
+
+
+class InotifyWatcher:
+    """
+    Watches every directory of a tree with inotify, called through ctypes. wait() returns the directories whose
+    entries changed and the directories created since the last call; created directories are watched as soon as
+    they are reported, before their content is read. Raise OSError when inotify is not available or the
+    fs.inotify.max_user_watches limit is reached.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"inotify_init1 failed: {os.strerror(error)}")
+        self._watches = {}
+        try:
+            self._watch_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch(self, path):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error == errno.ENOSPC:
+                raise OSError(error, "inotify watch limit reached, see fs.inotify.max_user_watches")
+            # The directory was removed or replaced by a file meanwhile
+            return
+        self._watches[wd] = path
+
+    def _watch_tree(self, root):
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            self._watch(path)
+            stack.extend(list_directory(path)[0])
+
+    def wait(self, timeout):
+        """
+        Wait up to timeout seconds for changes and return (changed, created) sets of directory paths.
+        """
+        changed = set()
+        created = set()
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return changed, created
+        while True:
+            try:
+                data = os.read(self._fd, READ_SIZE)
+            except BlockingIOError:
+                break
+            self._read_events(data, changed, created)
+        return changed, created
+
+    def _read_events(self, data, changed, created):
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = os.fsdecode(data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b'\0'))
+            offset += EVENT_HEADER.size + length
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost, everything has to be looked at again
+                created.add(self.root)
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            path = self._watches.get(wd)
+            if path is None:
+                continue
+            if mask & IN_DELETE_SELF:
+                changed.add(path)
+            elif mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                sub_dir = os.path.join(path, name)
+                self._watch_tree(sub_dir)
+                created.add(sub_dir)
+            elif mask & IN_ISDIR:
+                changed.add(os.path.join(path, name))
+            else:
+                changed.add(path)
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher:
+    """
+    Finds changes by comparing the mtimes of all directories of a tree every interval seconds. Only directories
+    whose mtime changed are listed again. A directory's mtime changes when entries are added, removed or renamed,
+    which covers Maven downloads, written to a temporary file that is renamed when complete.
+    """
+
+    def __init__(self, root, interval=DEFAULT_POLL_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self._directories = {}
+        self._last_poll = 0.0
+        self._poll(report=False)
+
+    def wait(self, timeout):
+        """
+        Wait up to timeout seconds, polling at most every interval seconds, and return (changed, created) sets of
+        directory paths.
+        """
+        next_poll = self._last_poll + self.interval
+        time.sleep(max(0.0, min(timeout, next_poll - time.monotonic())))
+        if time.monotonic() < next_poll:
+            return set(), set()
+        return self._poll()
+
+    def _poll(self, report=True):
+        self._last_poll = time.monotonic()
+        changed = set()
+        created = set()
+        seen = set()
+        # (path, inside a created tree) pairs
+        stack = [(self.root, False)]
+        while stack:
+            path, in_created = stack.pop()
+            seen.add(path)
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                self._directories.pop(path, None)
+                changed.add(path)
+                continue
+            known = self._directories.get(path)
+            if known is None and not in_created and report:
+                created.add(path)
+                in_created = True
+            elif known is not None and known[0] != mtime_ns:
+                changed.add(path)
+            if known is None or known[0] != mtime_ns:
+                known = self._directories[path] = (mtime_ns, list_directory(path)[0])
+            stack.extend((sub_dir, in_created) for sub_dir in known[1])
+        for path in set(self._directories) - seen:
+            del self._directories[path]
+            changed.add(path)
+        return changed, created
+
+    def close(self):
+        pass
+
+
+def create_watcher(root, polling=False, interval=DEFAULT_POLL_INTERVAL, debug=False):
+    """
+    Return an InotifyWatcher of root on Linux, a PollingWatcher when polling is requested or inotify cannot be used.
+    """
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError) as e:
+            # AttributeError: the C library has no inotify functions
+            if debug:
+                print(f"Cannot watch {root} with inotify, polling every {interval}s instead: {e}")
+    return PollingWatcher(root, interval)
@@ -0,0 +1,123 @@
+"""Streaming writers for listed dependencies."""
+import csv
+import json
+from itertools import chain, islice
+
+HEADERS = ['GroupID', 'ArtifactID', 'Version', 'RepositoryURL', 'LastUpdate', 'FileName', 'FilePath']
+FIELDS = ['groupId', 'artifactId', 'version', 'repository_url', 'last_update', 'filename', 'file_path']
+# (headers, fields) of the written columns, ROOTS_COLUMNS adds the roots of artifacts listed from several roots
+COLUMNS = (HEADERS, FIELDS)
+ROOTS_COLUMNS = (HEADERS + ['Roots'], FIELDS + ['roots'])
+TABLE_SAMPLE_SIZE = 1000
+TABLE_COLUMN_SEPARATOR = '  '
+EXPORT_BATCH_SIZE = 10000
+SQLITE_TABLE = 'dependencies'
+
+
+def dependency_row(dependency, fields=FIELDS):
+    return ['' if dependency[field] is None else str(dependency[field]) for field in fields]
+
+
+def write_table(dependencies, out, sample_size=TABLE_SAMPLE_SIZE, columns=COLUMNS):
+    """
+    Write dependencies as a plain text table and return the number of rows written. Column widths are computed
+    from the first sample_size rows only, so rows are written as they come and only the sample is held in memory;
+    a longer value later on shifts the rest of its row.
+    """
+    headers, fields = columns
+    rows = (dependency_row(dependency, fields) for dependency in dependencies)
+    sample = list(islice(rows, sample_size))
+    if not sample:
+        return 0
+
+    widths = [max([len(header)] + [len(row[column]) for row in sample]) for column, header in enumerate(headers)]
+    count = 0
+    for row in chain([headers], sample, rows):
+        out.write(TABLE_COLUMN_SEPARATOR.join(value.ljust(width) for value, width in zip(row, widths)).rstrip())
+        out.write('\n')
+        count += 1
+    return count - 1
+
+
+def write_csv(dependencies, out, columns=COLUMNS):
+    """
+    Write dependencies as CSV, starting with an Excel separator hint, and return the number of rows written.
+    """
+    headers, fields = columns
+    writer = csv.writer(out)
+    writer.writerow(['Sep=,'])
+    writer.writerow(headers)
+    count = 0
+    for dependency in dependencies:
+        writer.writerow(dependency_row(dependency, fields))
+        count += 1
+    return count
+
+
+def write_tsv(dependencies, out, columns=COLUMNS):
+    """
+    Write dependencies as tab separated lines after a header line, flushing every line so the output can be
+    piped into other tools while the scan is still running. Return the number of rows written.
+    """
+    headers, fields = columns
+    out.write('\t'.join(headers) + '\n')
+    count = 0
+    for dependency in dependencies:
+        out.write('\t'.join(dependency_row(dependency, fields)) + '\n')
+        out.flush()
+        count += 1
+    return count
+
+
+def write_jsonl(dependencies, out, columns=COLUMNS, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Write dependencies as JSON Lines, one object with the fields of the columns per dependency, and return the
+    number of lines written. Lines are buffered and written batch_size at a time.
+    """
+    _, fields = columns
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    batch = []
+    count = 0
+    for dependency in dependencies:
+        batch.append(encode({field: dependency[field] for field in fields}) + '\n')
+        if len(batch) >= batch_size:
+            out.write(''.join(batch))
+            count += len(batch)
+            batch = []
+    out.write(''.join(batch))
+    return count + len(batch)
+
+
+def write_sqlite(dependencies, connection, columns=COLUMNS, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Write dependencies to the SQLITE_TABLE table of connection, a sqlite3 connection, replacing its previous
+    content, and return the number of rows written. Rows are inserted batch_size at a time with executemany, all
+    in a single transaction with the replacement of the table: when dependencies raises, the previous content is
+    kept.
+    """
+    _, fields = columns
+    quoted = [f'"{field}"' for field in fields]
+    insert = f"INSERT INTO {SQLITE_TABLE} ({', '.join(quoted)}) VALUES ({', '.join('?' * len(fields))})"
+    rows = (tuple(dependency[field] for field in fields) for dependency in dependencies)
+    count = 0
+    # sqlite3 commits DROP and CREATE statements on its own unless the transaction is managed explicitly
+    isolation_level = connection.isolation_level
+    connection.isolation_level = None
+    try:
+        connection.execute("BEGIN")
+        try:
+            connection.execute(f"DROP TABLE IF EXISTS {SQLITE_TABLE}")
+            connection.execute(f"CREATE TABLE {SQLITE_TABLE} ({', '.join(f'{name} TEXT' for name in quoted)})")
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                connection.executemany(insert, batch)
+                count += len(batch)
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+    finally:
+        connection.isolation_level = isolation_level
+    return count
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+
+"""Tests for `maven_scanner.async_engine` module."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from click.testing import CliRunner
+from maven_scanner.async_engine import AsyncEngine
+from maven_scanner.cli import cli, filter_dependencies, iter_dependencies
+from maven_scanner.filters import DependencyFilter
+from maven_scanner.index import ScanIndex
+from maven_scanner.parallel import parse_directories
+from maven_scanner.scanner import MavenScanner
+from maven_scanner.walker import walk_repository
+
+
+class TestAsyncEngine(unittest.TestCase):
+    """Tests for `maven_scanner.async_engine` module."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repo = os.path.join(self.temp_dir.name, 'repository')
+        # Copies of the fixture at several depths, so listings ahead span sub trees
+        for group in ('a', 'b/c', 'b/d/e', 'f'):
+            shutil.copytree('dir/', os.path.join(self.repo, group))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_walk_matches_sync(self):
+        expected = list(walk_repository(self.repo))
+        for in_flight in (1, 3, 32):
+            self.assertEqual(list(AsyncEngine(in_flight).iter_walk(self.repo)), expected)
+
+    def test_stopped_walk(self):
+        records = AsyncEngine(2).iter_walk(self.repo)
+        first = next(records)
+        records.close()
+        self.assertEqual(first, next(walk_repository(self.repo)))
+
+    def test_scan_matches_sync(self):
+        sync = MavenScanner(debug=False)
+        sync.scan_maven_repo_for_dependencies(self.repo)
+        expected = list(filter_dependencies(sync, 'all', 'all'))
+
+        scanner = MavenScanner(debug=False, engine=AsyncEngine(4))
+        scanner.scan_maven_repo_for_dependencies(self.repo)
+        self.assertEqual(scanner.jar_dir_dict, sync.jar_dir_dict)
+        self.assertEqual(list(filter_dependencies(scanner, 'all', 'all', jobs=4, executor='async')), expected)
+        self.assertEqual(scanner.error_counter, sync.error_counter)
+
+    def test_stream_batches_share_engine(self):
+        sync = MavenScanner(debug=False)
+        expected = list(iter_dependencies(sync, sync.iter_maven_repo_artifacts(self.repo), DependencyFilter()))
+
+        scanner = MavenScanner(debug=False)
+        found = scanner.iter_maven_repo_artifacts(self.repo)
+        with patch('maven_scanner.async_engine.ThreadPoolExecutor', wraps=ThreadPoolExecutor) as pools:
+            records = list(iter_dependencies(scanner, found, DependencyFilter(), jobs=4, executor='async',
+                                             batch_size=2))
+        self.assertEqual(records, expected)
+        # One pool of worker threads for the 8 batches
+        self.assertEqual(pools.call_count, 1)
+
+    def test_scan_with_index(self):
+        index_path = os.path.join(self.temp_dir.name, 'index')
+        for _ in range(2):
+            scanner = MavenScanner(debug=False, index=ScanIndex(index_path, self.repo), engine=AsyncEngine(8))
+            scanner.scan_maven_repo_for_dependencies(self.repo)
+            parse_directories(scanner, sorted(set(scanner.jar_dir_dict.values())), 8, 'async')
+            scanner.close()
+        self.assertEqual(scanner.stats.counters['index_misses'], 0)
+        self.assertEqual(len(scanner.jar_dir_dict), 16)
+
+    def test_invalid_in_flight(self):
+        with self.assertRaises(ValueError):
+            AsyncEngine(0)
+
+    def test_cli_engine_option(self):
+        runner = CliRunner()
+        sync = runner.invoke(cli, ['list-dependencies', '-r', self.repo, '-t', 'tsv'])
+        async_ = runner.invoke(cli, ['list-dependencies', '-r', self.repo, '-t', 'tsv', '--engine', 'async',
+                                     '--in-flight', '4'])
+        self.assertEqual(async_.exit_code, 0, async_.output)
+        self.assertEqual(async_.output, sync.output)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+
+"""Tests for `maven_scanner.daemon` and `maven_scanner.watcher` modules."""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from click.testing import CliRunner
+from maven_scanner.cli import cli, filter_dependencies, iter_dependencies, scan_repo, stream_repo
+from maven_scanner.daemon import LiveInventory, query_dependencies, serve_inventory, stop_daemon
+from maven_scanner.filters import DependencyFilter
+from maven_scanner.scanner import MavenScanner
+from maven_scanner.watcher import InotifyWatcher, PollingWatcher
+
+
+class TestDaemon(unittest.TestCase):
+    """Tests for `maven_scanner.daemon` module."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repo = os.path.join(self.temp_dir.name, 'repository')
+        shutil.copytree('dir/', os.path.join(self.repo, 'org', 'example'))
+        self.socket_path = os.path.join(self.temp_dir.name, 'daemon.sock')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def inventory(self):
+        inventory = LiveInventory(MavenScanner(debug=False), self.repo)
+        inventory.load()
+        return inventory
+
+    def add_version(self, version):
+        dir_path = os.path.join(self.repo, 'org', 'example', 'test-jar', version)
+        os.makedirs(dir_path)
+        shutil.copy('dir/test-jar/xom-1.3.7.pom', os.path.join(dir_path, 'xom-1.3.7.pom'))
+        shutil.copy('dir/test-jar/xom-1.3.7.jar', os.path.join(dir_path, f'xom-{version}.jar'))
+        return dir_path
+
+    def test_query_matches_scan(self):
+        expected = list(filter_dependencies(scan_repo(self.repo, False), 'all', 'all'))
+        inventory = self.inventory()
+        self.assertEqual(inventory.query(), expected)
+        self.assertEqual(inventory.status()['artifacts'], len(expected))
+        zips = inventory.query(DependencyFilter(filter_filename='*.zip'))
+        self.assertEqual([record.filename for record in zips], ['xom-1.3.7.zip'])
+        self.assertEqual(inventory.query(groups=['org.other']), [])
+
+    def test_group_and_artifact_query_matches_scan(self):
+        for path in ('org/example/lib1', 'org/example/sub/lib2'):
+            dir_path = os.path.join(self.repo, *path.split('/'), '1.3.7')
+            os.makedirs(dir_path)
+            for name in ('xom-1.3.7.pom', 'xom-1.3.7.jar'):
+                shutil.copy(os.path.join('dir/test-jar', name), dir_path)
+        inventory = self.inventory()
+        for groups, artifacts in ((['org.example'], ['lib*']), (['org.*'], ['lib*']), (['org.example'], [])):
+            dependency_filter = DependencyFilter(artifacts=artifacts)
+            scanner, found = stream_repo(self.repo, False, dependency_filter=dependency_filter, groups=groups,
+                                         artifacts=artifacts)
+            expected = list(iter_dependencies(scanner, found, dependency_filter))
+            self.assertEqual(inventory.query(dependency_filter, groups, artifacts), expected)
+        # The artifacts have to be directly in the group, lib2 is in a sub group
+        self.assertEqual([record.dir_path for record in inventory.query(DependencyFilter(artifacts=['lib*']),
+                                                                         ['org.example'], ['lib*'])],
+                         [os.path.join(self.repo, 'org', 'example', 'lib1', '1.3.7')])
+
+    def test_refresh(self):
+        inventory = self.inventory()
+        before = len(inventory.query())
+        dir_path = self.add_version('2.0')
+        self.assertEqual(inventory.refresh(created=[dir_path]), 1)
+        self.assertEqual(len(inventory.query()), before + 1)
+
+        os.remove(os.path.join(dir_path, 'xom-2.0.jar'))
+        inventory.refresh(changed=[dir_path])
+        self.assertEqual(len(inventory.query()), before)
+
+        removed = os.path.join(self.repo, 'org', 'example', 'test4-zip')
+        shutil.rmtree(removed)
+        self.assertEqual(inventory.refresh(changed=[removed]), 0)
+        self.assertEqual(len(inventory.query()), before - 1)
+        self.assertNotIn(removed, inventory.scanner.dir_records)
+
+    def test_polling_watcher(self):
+        watcher = PollingWatcher(self.repo, interval=0)
+        self.assertEqual(watcher.wait(0), (set(), set()))
+        dir_path = self.add_version('2.0')
+        changed, created = watcher.wait(0)
+        self.assertEqual(created, {dir_path})
+        self.assertIn(os.path.dirname(dir_path), changed)
+        shutil.rmtree(dir_path)
+        self.assertIn(dir_path, watcher.wait(0)[0])
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'inotify is Linux only')
+    def test_inotify_watcher(self):
+        watcher = InotifyWatcher(self.repo)
+        try:
+            dir_path = self.add_version('2.0')
+            changed, created = watcher.wait(1.0)
+            self.assertEqual(created, {dir_path})
+            with open(os.path.join(dir_path, 'xom-2.0.jar'), 'a') as file:
+                file.write('x')
+            self.assertEqual(watcher.wait(1.0), ({dir_path}, set()))
+        finally:
+            watcher.close()
+
+    def test_serve(self):
+        inventory = self.inventory()
+        watcher = PollingWatcher(self.repo, interval=0.05)
+        thread = threading.Thread(target=serve_inventory, args=(inventory, self.socket_path, watcher))
+        thread.start()
+        try:
+            for _ in range(100):
+                if os.path.exists(self.socket_path):
+                    break
+                time.sleep(0.01)
+            self.assertEqual(query_dependencies(self.socket_path, self.repo), inventory.query())
+            # Another repository is not answered from this inventory
+            self.assertIsNone(query_dependencies(self.socket_path, self.temp_dir.name))
+
+            runner = CliRunner()
+            args = ['list-dependencies', '-r', self.repo, '-t', 'tsv', '-fn', '*.jar']
+            through_daemon = runner.invoke(cli, args + ['--socket', self.socket_path, '--stats'])
+            self.assertEqual(through_daemon.exit_code, 0, through_daemon.output)
+            self.assertNotIn('directories_listed', through_daemon.output)
+            self.assertEqual(through_daemon.output.split('Stage durations')[0],
+                             runner.invoke(cli, args + ['--no-daemon']).output)
+
+            before = len(inventory.query())
+            self.add_version('2.0')
+            for _ in range(100):
+                if len(query_dependencies(self.socket_path, self.repo)) > before:
+                    break
+                time.sleep(0.02)
+            self.assertIn('xom-2.0.jar', [record.filename for record in query_dependencies(self.socket_path,
+                                                                                            self.repo)])
+        finally:
+            self.assertTrue(stop_daemon(self.socket_path, self.repo))
+            thread.join(5)
+        self.assertFalse(os.path.exists(self.socket_path))
+        self.assertIsNone(query_dependencies(self.socket_path, self.repo))
+
+    def test_no_daemon(self):
+        self.assertIsNone(query_dependencies(self.socket_path, self.repo))
+        # A socket file left over by a stopped daemon
+        open(self.socket_path, 'w').close()
+        self.assertIsNone(query_dependencies(self.socket_path, self.repo))
+        result = CliRunner().invoke(cli, ['list-dependencies', '-r', self.repo, '--socket', self.socket_path])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('xom-1.3.7.jar', result.output)
+        self.assertFalse(stop_daemon(self.socket_path, self.repo))
@@ -0,0 +1,335 @@
+#!/usr/bin/env python
+
+"""Tests for `maven_scanner.deploy` and `maven_scanner.settings` modules."""
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+import unittest
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from maven_scanner.deploy import HttpDeployer, DeployError, DeployJournal, artifact_classifier, run_deploys, \
+    MISSING, SAME, CHANGED, METADATA_FILE
+from maven_scanner.settings import read_server_credentials
+
+
+class RepositoryHandler(BaseHTTPRequestHandler):
+    """Stand-in for a Maven repository manager keeping uploaded files in memory."""
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, status, body=b''):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        data = self.server.files.get(self.path)
+        self._respond(404) if data is None else self._respond(200, data)
+
+    def do_HEAD(self):
+        data = self.server.files.get(self.path)
+        self.send_response(404 if data is None else 200)
+        self.send_header('Content-Length', str(len(data or b'')))
+        self.end_headers()
+
+    def do_PUT(self):
+        data = self.rfile.read(int(self.headers['Content-Length']))
+        if self.server.required_auth and self.headers.get('Authorization') != self.server.required_auth:
+            self._respond(401)
+            return
+        if self.path in self.server.fail_once:
+            # Transient failure of the repository manager, the file is accepted when sent again
+            self.server.fail_once.remove(self.path)
+            self._respond(503)
+            return
+        if self.server.release and self.path in self.server.files and METADATA_FILE not in self.path:
+            # Release repositories refuse to overwrite deployed files, metadata files excepted
+            self._respond(400)
+            return
+        self.server.files[self.path] = data
+        self.server.connections.add(self.client_address)
+        self._respond(201)
+
+
+class TestHttpDeployer(unittest.TestCase):
+    """Tests for `maven_scanner.deploy` module."""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), RepositoryHandler)
+        self.server.files = {}
+        self.server.connections = set()
+        self.server.required_auth = None
+        self.server.release = False
+        self.server.fail_once = set()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/repository/releases"
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.temp_dir.cleanup()
+
+    def dependency(self, version='1.3.7', filename=None):
+        filename = filename or f"xom-{version}.jar"
+        file_path = os.path.join(self.temp_dir.name, filename)
+        with open(file_path, 'wb') as file:
+            file.write(b'jar content')
+        return {'groupId': 'com.example', 'artifactId': 'xom', 'version': version, 'filename': filename,
+                'file_path': file_path}
+
+    def test_deploy_release(self):
+        with HttpDeployer(self.url) as deployer:
+            deployer.deploy(self.dependency())
+            deployer.deploy(self.dependency('1.3.8'))
+        files = self.server.files
+        prefix = '/repository/releases/com/example/xom'
+        self.assertEqual(files[f'{prefix}/1.3.7/xom-1.3.7.jar'], b'jar content')
+        self.assertEqual(files[f'{prefix}/1.3.7/xom-1.3.7.jar.sha1'].decode(),
+                         hashlib.sha1(b'jar content').hexdigest())
+        self.assertEqual(files[f'{prefix}/1.3.7/xom-1.3.7.jar.md5'].decode(), hashlib.md5(b'jar content').hexdigest())
+        self.assertIn(f'{prefix}/1.3.7/xom-1.3.7.pom.sha1', files)
+        metadata = ET.fromstring(files[f'{prefix}/maven-metadata.xml'])
+        self.assertEqual([version.text for version in metadata.findall('versioning/versions/version')],
+                         ['1.3.7', '1.3.8'])
+        self.assertEqual(metadata.findtext('versioning/release'), '1.3.8')
+        # All requests went through one kept-alive connection
+        self.assertEqual(len(self.server.connections), 1)
+
+    def test_local_pom_is_deployed_once_per_version(self):
+        self.server.release = True
+        pom = b'<project><dependencies><dependency>...</dependency></dependencies></project>'
+        with open(os.path.join(self.temp_dir.name, 'xom-1.3.7.pom'), 'wb') as file:
+            file.write(pom)
+        dependencies = [self.dependency(filename='xom-1.3.7.jar'), self.dependency(filename='xom-1.3.7-tests.jar'),
+                        self.dependency(filename='xom-1.3.7.zip')]
+        with HttpDeployer(self.url) as deployer:
+            report = run_deploys(dependencies, deployer.deploy, self.url, log=lambda message: None)
+        self.assertEqual((report.deployed, report.failed), (3, []))
+        prefix = '/repository/releases/com/example/xom/1.3.7'
+        self.assertEqual(self.server.files[f'{prefix}/xom-1.3.7.pom'], pom)
+        self.assertIn(f'{prefix}/xom-1.3.7-tests.jar', self.server.files)
+
+    def test_classifier_file_is_deployed_without_pom(self):
+        with HttpDeployer(self.url) as deployer:
+            deployer.deploy(self.dependency(filename='xom-1.3.7-tests.jar'))
+        self.assertNotIn('/repository/releases/com/example/xom/1.3.7/xom-1.3.7.pom', self.server.files)
+
+    def test_deploy_snapshot(self):
+        # Each run deploys a new build
+        with HttpDeployer(self.url) as deployer:
+            first = deployer.deploy(self.dependency('2.0-SNAPSHOT'))
+        with HttpDeployer(self.url) as deployer:
+            second = deployer.deploy(self.dependency('2.0-SNAPSHOT'))
+        self.assertRegex(first, r'xom-2\.0-\d{8}\.\d{6}-1\.jar$')
+        self.assertRegex(second, r'xom-2\.0-\d{8}\.\d{6}-2\.jar$')
+        metadata = ET.fromstring(self.server.files['/repository/releases/com/example/xom/2.0-SNAPSHOT/'
+                                                   'maven-metadata.xml'])
+        self.assertEqual(metadata.findtext('versioning/snapshot/buildNumber'), '2')
+        self.assertEqual(len(metadata.findall('versioning/snapshotVersions/snapshotVersion')), 2)
+
+    def test_snapshot_files_share_build_number(self):
+        dependencies = [self.dependency('2.0-SNAPSHOT'),
+                        self.dependency('2.0-SNAPSHOT', 'xom-2.0-SNAPSHOT-tests.jar')]
+        with HttpDeployer(self.url) as deployer:
+            report = run_deploys(dependencies, deployer.deploy, self.url, jobs=2, log=lambda message: None)
+        self.assertEqual(report.deployed, 2)
+        prefix = '/repository/releases/com/example/xom/2.0-SNAPSHOT'
+        deployed = sorted(path[len(prefix) + 1:] for path in self.server.files
+                          if path.startswith(prefix) and path.endswith(('.jar', '.pom')))
+        self.assertEqual(len(deployed), 3)
+        build = re.match(r'xom-2\.0-(\d{8}\.\d{6}-1)-tests\.jar$', deployed[0]).group(1)
+        self.assertEqual(deployed, [f'xom-2.0-{build}-tests.jar', f'xom-2.0-{build}.jar', f'xom-2.0-{build}.pom'])
+        metadata = ET.fromstring(self.server.files[f'{prefix}/maven-metadata.xml'])
+        self.assertEqual(metadata.findtext('versioning/snapshot/buildNumber'), '1')
+        values = metadata.findall('versioning/snapshotVersions/snapshotVersion/value')
+        self.assertEqual({value.text for value in values}, {f'2.0-{build}'})
+
+    def test_concurrent_deploys_keep_all_versions_in_metadata(self):
+        dependencies = [self.dependency(f'1.{minor}') for minor in range(8)]
+        with HttpDeployer(self.url) as deployer:
+            report = run_deploys(dependencies, deployer.deploy, self.url, jobs=4, log=lambda message: None)
+        self.assertEqual(report.deployed, 8)
+        metadata = ET.fromstring(self.server.files['/repository/releases/com/example/xom/maven-metadata.xml'])
+        self.assertEqual(len(metadata.findall('versioning/versions/version')), 8)
+
+    def test_compare_remote(self):
+        release = self.dependency()
+        snapshot = self.dependency('2.0-SNAPSHOT')
+        with HttpDeployer(self.url) as deployer:
+            self.assertEqual(deployer.compare_remote(release), MISSING)
+            deployer.deploy(release)
+            deployer.deploy(snapshot)
+            self.assertEqual(deployer.compare_remote(release), SAME)
+            self.assertEqual(deployer.compare_remote(snapshot), SAME)
+            with open(release['file_path'], 'wb') as file:
+                file.write(b'jar CONTENT')
+            self.assertEqual(deployer.compare_remote(release), CHANGED)
+
+    def test_skip_existing(self):
+        dependencies = [self.dependency(f'1.{minor}') for minor in range(3)]
+        with HttpDeployer(self.url) as deployer:
+            deployer.deploy(dependencies[0])
+            deployer.deploy(dependencies[1])
+            with open(dependencies[1]['file_path'], 'wb') as file:
+                file.write(b'changed content')
+            report = run_deploys(dependencies, deployer.deploy, self.url, jobs=2, log=lambda message: None,
+                                 compare_remote=deployer.compare_remote)
+        self.assertEqual((report.skipped, report.deployed, report.mismatched), (1, 2, 1))
+        self.assertEqual(self.server.files['/repository/releases/com/example/xom/1.1/xom-1.1.jar'],
+                         b'changed content')
+
+    def test_mismatch_refused_by_release_repository(self):
+        self.server.release = True
+        dependency = self.dependency()
+        with HttpDeployer(self.url) as deployer:
+            deployer.deploy(dependency)
+            with open(dependency['file_path'], 'wb') as file:
+                file.write(b'changed content')
+            report = run_deploys([dependency], deployer.deploy, self.url, log=lambda message: None,
+                                 compare_remote=deployer.compare_remote)
+        self.assertEqual((report.deployed, report.mismatched, len(report.failed)), (0, 1, 1))
+        self.assertEqual(report.failed[0][1].status, 400)
+
+    def test_retry_skips_files_already_uploaded(self):
+        self.server.release = True
+        prefix = '/repository/releases/com/example/xom/1.3.7'
+        self.server.fail_once.add(f'{prefix}/xom-1.3.7.pom')
+        with HttpDeployer(self.url) as deployer:
+            report = run_deploys([self.dependency()], deployer.deploy, self.url, backoff=0, log=lambda message: None)
+        self.assertEqual((report.deployed, report.failed), (1, []))
+        self.assertEqual(self.server.files[f'{prefix}/xom-1.3.7.jar'], b'jar content')
+        self.assertIn(f'{prefix}/xom-1.3.7.pom.sha1', self.server.files)
+
+    def test_deploy_with_credentials(self):
+        self.server.required_auth = 'Basic dXNlcjpzZWNyZXQ='
+        with HttpDeployer(self.url) as deployer:
+            with self.assertRaises(DeployError) as context:
+                deployer.deploy(self.dependency())
+            self.assertEqual(context.exception.status, 401)
+        with HttpDeployer(self.url, 'user', 'secret') as deployer:
+            deployer.deploy(self.dependency())
+
+    def test_artifact_classifier(self):
+        self.assertEqual(artifact_classifier('xom-1.3.7-tests.jar', 'xom', '1.3.7', 'jar'), 'tests')
+        self.assertIsNone(artifact_classifier('xom-1.3.7.jar', 'xom', '1.3.7', 'jar'))
+
+    def test_read_server_credentials(self):
+        settings_path = os.path.join(self.temp_dir.name, 'settings.xml')
+        with open(settings_path, 'w') as file:
+            file.write('<settings xmlns="http://maven.apache.org/SETTINGS/1.0.0"><servers>'
+                       '<server><id>other</id><username>x</username><password>y</password></server>'
+                       '<server><id>local_snapshots</id><username>nexus_user</username><password>hard_pasword'
+                       '</password></server></servers></settings>')
+        self.assertEqual(read_server_credentials('local_snapshots', settings_path), ('nexus_user', 'hard_pasword'))
+        self.assertIsNone(read_server_credentials('missing', settings_path))
+        self.assertIsNone(read_server_credentials('local_snapshots', os.path.join(self.temp_dir.name, 'none.xml')))
+
+
+class TestRunDeploys(unittest.TestCase):
+    """Tests for `maven_scanner.deploy.run_deploys`."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dependencies = [{'filename': f'a-{number}.jar', 'file_path': f'/repo/a/{number}/a-{number}.jar'}
+                             for number in range(5)]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def run_deploys(self, deploy_one, **kwargs):
+        return run_deploys(self.dependencies, deploy_one, 'http://target', backoff=0, log=lambda message: None,
+                           **kwargs)
+
+    def test_transient_errors_are_retried(self):
+        attempts = []
+
+        def deploy_one(dependency):
+            attempts.append(dependency['filename'])
+            if attempts.count(dependency['filename']) < 3:
+                raise DeployError('Service Unavailable', 503)
+
+        report = self.run_deploys(deploy_one, jobs=3)
+        self.assertEqual(report.deployed, 5)
+        self.assertEqual(len(attempts), 15)
+
+    def test_permanent_errors_are_not_retried(self):
+        attempts = []
+
+        def deploy_one(dependency):
+            attempts.append(dependency)
+            raise DeployError('Bad Request', 400)
+
+        report = self.run_deploys(deploy_one)
+        self.assertEqual(len(report.failed), 5)
+        self.assertEqual(len(attempts), 5)
+
+    def test_errors_of_unknown_cause_are_retried_on_request(self):
+        attempts = []
+
+        def deploy_one(dependency):
+            attempts.append(dependency)
+            raise DeployError('Command exited with status 1')
+
+        self.assertEqual(len(self.run_deploys(deploy_one).failed), 5)
+        self.assertEqual(len(attempts), 5)
+
+        def retried(dependency):
+            attempts.append(dependency)
+            raise DeployError('Command exited with status 1', transient=True)
+
+        del attempts[:]
+        self.run_deploys(retried, retries=2)
+        self.assertEqual(len(attempts), 15)
+
+    def test_missing_local_file_is_not_retried(self):
+        attempts = []
+
+        def deploy_one(dependency):
+            attempts.append(dependency)
+            open(dependency['file_path'], 'rb')
+
+        report = self.run_deploys(deploy_one)
+        self.assertEqual(len(report.failed), 5)
+        self.assertEqual(len(attempts), 5)
+
+    def test_interrupt_stops_queued_deploys_and_retries(self):
+        self.dependencies *= 20
+        started = []
+
+        def deploy_one(dependency):
+            started.append(dependency)
+            if len(started) == 1:
+                raise DeployError('Service Unavailable', 503)
+            time.sleep(0.05)
+            raise KeyboardInterrupt
+
+        start = time.monotonic()
+        with self.assertRaises(KeyboardInterrupt):
+            run_deploys(self.dependencies, deploy_one, 'http://target', jobs=2, backoff=30, log=lambda message: None)
+        # Neither the retry of the first deploy nor the queued deploys are waited for
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertLess(len(started), 10)
+
+    def test_journal_resumes_interrupted_deploy(self):
+        journal_path = os.path.join(self.temp_dir.name, 'deploy.journal')
+
+        def interrupted(dependency):
+            if dependency['filename'] == 'a-3.jar':
+                raise DeployError('Forbidden', 403)
+
+        with DeployJournal(journal_path) as journal:
+            self.assertEqual(self.run_deploys(interrupted, journal=journal).deployed, 4)
+
+        deployed = []
+        with DeployJournal(journal_path) as journal:
+            report = self.run_deploys(deployed.append, journal=journal)
+        self.assertEqual([dependency['filename'] for dependency in deployed], ['a-3.jar'])
+        self.assertEqual(report.resumed, 4)
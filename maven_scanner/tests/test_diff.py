@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+
+"""Tests for `maven_scanner.diff` module."""
+
+import os
+import tempfile
+import unittest
+from click.testing import CliRunner
+from maven_scanner.cli import cli
+from maven_scanner.diff import diff_inventories, format_artifact, inventory_format, load_inventory
+
+
+class TestDiff(unittest.TestCase):
+    """Tests for `maven_scanner.diff` module."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.runner = CliRunner()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def export(self, output_type, *options):
+        output_dir = tempfile.mkdtemp(dir=self.temp_dir.name)
+        result = self.runner.invoke(cli, ['list-dependencies', '-r', 'dir/', '--no-daemon', '-t', output_type,
+                                          '-o', output_dir] + list(options))
+        self.assertEqual(result.exit_code, 0, result.output)
+        return os.path.join(output_dir, os.listdir(output_dir)[0])
+
+    def test_formats_load_the_same_inventory(self):
+        exported = {output_type: self.export(output_type) for output_type in ('csv', 'jsonl', 'sqlite')}
+        tsv_path = os.path.join(self.temp_dir.name, 'dependencies.tsv')
+        with open(tsv_path, 'w') as file:
+            file.write(self.runner.invoke(cli, ['list-dependencies', '-r', 'dir/', '--no-daemon', '-t', 'tsv']).output)
+        exported['tsv'] = tsv_path
+
+        inventories = {}
+        for output_type, path in exported.items():
+            self.assertEqual(inventory_format(path), output_type)
+            inventories[output_type] = load_inventory(path)
+        self.assertEqual(len(inventories['csv']), 3)
+        self.assertIn(('xom', 'xom', '1.3.7', None, 'zip'), inventories['csv'])
+        for inventory in inventories.values():
+            self.assertEqual(inventory, inventories['csv'])
+
+    def test_diff_inventories(self):
+        jar = ('org.example', 'lib', '1.0', None, 'jar')
+        sources = ('org.example', 'lib', '1.0', 'sources', 'jar')
+        old = {jar: 'https://central/', sources: 'https://central/'}
+        new = {('org.example', 'lib', '2.0', None, 'jar'): 'https://central/', jar: 'https://mirror/'}
+        differences = diff_inventories(old, new)
+        self.assertEqual(differences.added, [('org.example', 'lib', '2.0', None, 'jar')])
+        self.assertEqual(differences.removed, [sources])
+        self.assertEqual(differences.resourced, [(jar, 'https://central/', 'https://mirror/')])
+        self.assertEqual(differences.summary(), "Added: 1, removed: 1, re-sourced: 1")
+        self.assertFalse(diff_inventories(old, dict(old)))
+        self.assertEqual(format_artifact(sources), 'org.example:lib:jar:sources:1.0')
+
+    def test_diff_command(self):
+        old = self.export('jsonl', '-fn', '*.jar')
+        new = self.export('sqlite')
+        result = self.runner.invoke(cli, ['diff', old, new])
+        self.assertEqual(result.exit_code, 0, result.output)
+        lines = result.output.splitlines()
+        self.assertEqual(lines[0], '+ xom:xom:zip:1.3.7  ')
+        self.assertTrue(lines[-1].startswith('Added: 1, removed: 0, re-sourced: 0 (2 -> 3 artifacts'))
+
+        result = self.runner.invoke(cli, ['diff', new, old, '--summary'])
+        self.assertTrue(result.output.startswith('Added: 0, removed: 1, re-sourced: 0'))
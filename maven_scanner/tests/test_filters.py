@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+
+"""Tests for `maven_scanner.filters` module."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from maven_scanner.cli import filter_dependencies, iter_dependencies
+from maven_scanner.filters import compile_pattern, group_id_from_path, subtree_roots, DependencyFilter
+from maven_scanner.scanner import MavenScanner
+
+
+class TestFilters(unittest.TestCase):
+    """Tests for `maven_scanner.filters` module."""
+
+    def test_compile_pattern(self):
+        self.assertIsNone(compile_pattern('all'))
+        self.assertTrue(compile_pattern('example')('https://example.com/repo'))
+        self.assertTrue(compile_pattern('*-SNAPSHOT.jar')('lib-1.0-SNAPSHOT.jar'))
+        self.assertFalse(compile_pattern('*-SNAPSHOT.jar')('lib-1.0-SNAPSHOT.jar.sha1'))
+        self.assertTrue(compile_pattern(r're:example\d\.com')('https://example2.com/'))
+        self.assertFalse(compile_pattern(r're:example\d\.com')('https://example.com/'))
+
+    def test_group_pattern_matches_sub_groups(self):
+        matches = compile_pattern('org.apache', separator='.')
+        self.assertTrue(matches('org.apache'))
+        self.assertTrue(matches('org.apache.commons'))
+        self.assertFalse(matches('org.apachex'))
+
+    def test_group_id_from_path(self):
+        repo = os.path.join('m2', 'repository')
+        dir_path = os.path.join(repo, 'org', 'apache', 'commons', 'commons-lang3', '3.12.0')
+        self.assertEqual(group_id_from_path(repo, dir_path), 'org.apache.commons')
+
+    def test_scan_records_only_matching_artifacts(self):
+        scanner = MavenScanner(debug=False)
+        scanner.scan_maven_repo_for_dependencies('dir/', DependencyFilter(filter_filename='*.zip'))
+        self.assertEqual(scanner.artifacts(), [('xom-1.3.7.zip', 'dir/test4-zip')])
+
+    def test_artifacts_are_matched_once(self):
+        scanner = MavenScanner(debug=False)
+        dependency_filter = DependencyFilter(filter_filename='*.zip')
+        with patch.object(dependency_filter, 'matches_artifact', wraps=dependency_filter.matches_artifact) as matches:
+            found = scanner.iter_maven_repo_artifacts('dir/', dependency_filter)
+            dependencies = list(iter_dependencies(scanner, found, dependency_filter))
+        self.assertEqual([dependency['filename'] for dependency in dependencies], ['xom-1.3.7.zip'])
+        self.assertEqual(matches.call_count, scanner.stats.counters['artifacts_found'] +
+                         scanner.stats.counters['artifacts_filtered_out'])
+        # A completed scan is filtered when its artifacts are listed
+        scanner = MavenScanner(debug=False)
+        scanner.scan_maven_repo_for_dependencies('dir/')
+        self.assertEqual([dependency['filename'] for dependency in filter_dependencies(scanner, 'all', '*.zip')],
+                         ['xom-1.3.7.zip'])
+
+    def test_repo_filter_runs_before_pom_parsing(self):
+        scanner = MavenScanner(debug=False)
+        scanner.scan_maven_repo_for_dependencies('dir/')
+        with patch.object(scanner, 'parse_pom_file', wraps=scanner.parse_pom_file) as mock_parse_pom:
+            dependencies = filter_dependencies(scanner, 'no-such-repository', 'all')
+        self.assertEqual(len(dependencies), 0)
+        mock_parse_pom.assert_not_called()
+
+    def test_subtree_roots(self):
+        with tempfile.TemporaryDirectory() as repo:
+            for path in ('org/springframework/spring-core/5.3.0', 'org/springframework/spring-beans/5.3.0',
+                         'org/springframework/boot/spring-boot/2.7.0', 'org/apache/commons/commons-lang3/3.12.0'):
+                os.makedirs(os.path.join(repo, path))
+            spring = os.path.join(repo, 'org', 'springframework')
+            self.assertEqual(subtree_roots(repo), [repo])
+            self.assertEqual(subtree_roots(repo, ['org.springframework']), [spring])
+            self.assertEqual(subtree_roots(repo, ['org.springframework', 'org.springframework.boot']), [spring])
+            self.assertEqual(subtree_roots(repo, ['org.spring*'], ['spring-core']),
+                             [os.path.join(spring, 'spring-core')])
+            self.assertEqual(subtree_roots(repo, ['org.springframework'], ['spring-b*', 'missing']),
+                             [os.path.join(spring, 'spring-beans')])
+            self.assertEqual(subtree_roots(repo, ['com.example']), [])
+
+    def test_scan_walks_only_sub_dirs(self):
+        scanner = MavenScanner(debug=False)
+        with patch('maven_scanner.walker.os.scandir', wraps=os.scandir) as mock_scandir:
+            scanner.scan_maven_repo_for_dependencies('dir/', sub_dirs=['dir/test4-zip'])
+        self.assertEqual([call.args[0] for call in mock_scandir.call_args_list], ['dir/test4-zip'])
+        self.assertEqual(scanner.jar_dir_dict, {os.path.join('dir/test4-zip', 'xom-1.3.7.zip'): 'dir/test4-zip'})
+
+    def test_artifact_filter_without_group(self):
+        dependency_filter = DependencyFilter(artifacts=['spring-*'])
+        repo = os.path.join('m2', 'repository')
+        self.assertTrue(dependency_filter.matches_artifact(
+            repo, os.path.join(repo, 'org', 'springframework', 'spring-core', '5.3.0'), 'spring-core-5.3.0.jar'))
+        self.assertFalse(dependency_filter.matches_artifact(
+            repo, os.path.join(repo, 'org', 'apache', 'commons-io', '2.0'), 'commons-io-2.0.jar'))
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+
+"""Tests for `maven_scanner.graph` module."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from click.testing import CliRunner
+from maven_scanner.cli import cli, build_dependency_graph, scan_repo
+from maven_scanner.graph import DependencyGraph, parse_coordinate
+from maven_scanner.index import ScanIndex
+from maven_scanner.pom import read_pom_model
+from maven_scanner.resolver import PomResolver, pom_path
+from maven_scanner.scanner import MavenScanner
+
+APP = """<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <parent><groupId>org.example</groupId><artifactId>parent</artifactId><version>1</version></parent>
+  <artifactId>app</artifactId>
+  <properties><a.version>1.0</a.version></properties>
+  <dependencies>
+    <dependency>
+      <groupId>com.other</groupId><artifactId>lib-a</artifactId><version>${a.version}</version>
+      <exclusions><exclusion><groupId>x</groupId><artifactId>y</artifactId></exclusion></exclusions>
+    </dependency>
+    <dependency><groupId>${project.groupId}</groupId><artifactId>lib-b</artifactId></dependency>
+    <dependency>
+      <groupId>junit</groupId><artifactId>junit</artifactId><version>4</version><scope>test</scope>
+    </dependency>
+    <dependency>
+      <groupId>org.opt</groupId><artifactId>opt</artifactId><version>1</version><optional>true</optional>
+    </dependency>
+  </dependencies>
+  <build><plugins><plugin><dependencies><dependency><groupId>p</groupId><artifactId>p</artifactId>
+    <version>1</version></dependency></dependencies></plugin></plugins></build>
+</project>
+"""
+
+PARENT = """<project>
+  <groupId>org.example</groupId><artifactId>parent</artifactId><version>1</version>
+  <dependencyManagement><dependencies>
+    <dependency><groupId>org.example</groupId><artifactId>lib-b</artifactId><version>2.0</version></dependency>
+    <dependency><groupId>org.bom</groupId><artifactId>bom</artifactId><version>3</version><type>pom</type>
+      <scope>import</scope></dependency>
+  </dependencies></dependencyManagement>
+</project>
+"""
+
+
+def simple_pom(group_id, artifact_id, version, dependencies=''):
+    return f"<project><groupId>{group_id}</groupId><artifactId>{artifact_id}</artifactId>" \
+           f"<version>{version}</version><dependencies>{dependencies}</dependencies></project>"
+
+
+class TestDependencyGraph(unittest.TestCase):
+    """Tests for `maven_scanner.graph` module."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repo = os.path.join(self.temp_dir.name, 'repository')
+        self.app = self.write('org.example', 'app', '1', APP)
+        self.write('org.example', 'parent', '1', PARENT, jar=False)
+        self.write('com.other', 'lib-a', '1.0', simple_pom(
+            'com.other', 'lib-a', '1.0', '<dependency><groupId>net.third</groupId><artifactId>lib-c</artifactId>'
+                                         '<version>1.0</version><scope>runtime</scope></dependency>'))
+        self.write('org.example', 'lib-b', '2.0', simple_pom('org.example', 'lib-b', '2.0'))
+        self.write('net.third', 'lib-c', '1.0', simple_pom('net.third', 'lib-c', '1.0'))
+        self.write('junit', 'junit', '4', simple_pom('junit', 'junit', '4'))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, group_id, artifact_id, version, content, jar=True):
+        path = pom_path(self.repo, group_id, artifact_id, version)
+        os.makedirs(os.path.dirname(path))
+        with open(path, 'w') as file:
+            file.write(content)
+        if jar:
+            open(path[:-len('.pom')] + '.jar', 'w').close()
+        return path
+
+    def test_read_pom_model_dependencies(self):
+        model = read_pom_model(self.app)
+        self.assertEqual([dependency['artifactId'] for dependency in model['dependencies']],
+                         ['lib-a', 'lib-b', 'junit', 'opt'])
+        self.assertEqual(model['dependencies'][0], {'groupId': 'com.other', 'artifactId': 'lib-a',
+                                                    'version': '${a.version}'})
+        self.assertEqual(model['coordinates'], {'artifactId': 'app'})
+        self.assertEqual(len(read_pom_model(pom_path(self.repo, 'org.example', 'parent', '1'))['managed']), 2)
+
+    def test_resolve_dependencies(self):
+        resolved = PomResolver(self.repo).resolve_dependencies(self.app)
+        self.assertEqual(resolved['version'], '1')
+        dependencies = {dependency['artifactId']: dependency for dependency in resolved['dependencies']}
+        self.assertEqual(dependencies['lib-a']['version'], '1.0')
+        # Version from the dependencyManagement of the parent
+        self.assertEqual(dependencies['lib-b'], {'groupId': 'org.example', 'artifactId': 'lib-b', 'version': '2.0',
+                                                 'scope': 'compile', 'optional': False})
+        self.assertEqual(dependencies['junit']['scope'], 'test')
+        self.assertTrue(dependencies['opt']['optional'])
+        self.assertEqual((dependencies['parent']['scope'], dependencies['bom']['scope']), ('parent', 'import'))
+
+    def test_closures(self):
+        scanner = scan_repo(self.repo, False, collect_dependencies=True)
+        graph = build_dependency_graph(scanner)
+        app = ('org.example', 'app', '1')
+        lib_c = ('net.third', 'lib-c', '1.0')
+        self.assertIn(app, graph)
+        self.assertIn(('org.example', 'parent', '1'), graph)
+        self.assertEqual(graph.closure([app]), {app, ('org.example', 'parent', '1'), ('com.other', 'lib-a', '1.0'),
+                                                ('org.example', 'lib-b', '2.0'), lib_c, ('org.bom', 'bom', '3')})
+        self.assertIn(('junit', 'junit', '4'), graph.closure([app], scopes=('compile', 'test')))
+        self.assertIn(('org.opt', 'opt', '1'), graph.closure([app], include_optional=True))
+        self.assertEqual(graph.reverse_closure([lib_c]), {lib_c, ('com.other', 'lib-a', '1.0'), app})
+        self.assertEqual(graph.dependents(('junit', 'junit', '4')), [app])
+        self.assertEqual(graph.missing(), [('org.bom', 'bom', '3'), ('org.opt', 'opt', '1')])
+        self.assertEqual(graph.edges, 8)
+
+    def test_interned_nodes(self):
+        graph = DependencyGraph()
+        dependency = {'groupId': 'g', 'artifactId': 'b', 'version': '1', 'scope': 'compile', 'optional': False}
+        graph.add_pom({'groupId': 'g', 'artifactId': 'a', 'version': '1', 'dependencies': [dependency, dependency]})
+        graph.add_pom({'groupId': 'g', 'artifactId': 'b', 'version': '1', 'dependencies': []})
+        self.assertEqual((len(graph), graph.edges), (2, 1))
+        self.assertEqual(graph.node(('g', 'b', '1')), 1)
+        unversioned = dict(dependency, version=None)
+        self.assertEqual(graph.add_pom({'groupId': 'g', 'artifactId': 'c', 'version': '1',
+                                        'dependencies': [unversioned]}), 1)
+
+    def test_parse_coordinate(self):
+        self.assertEqual(parse_coordinate('g:a:1'), ('g', 'a', '1'))
+        with self.assertRaises(ValueError):
+            parse_coordinate('g:a')
+
+    def test_dependencies_cached_in_index(self):
+        index_path = os.path.join(self.temp_dir.name, 'index')
+        dir_path = os.path.dirname(self.app)
+        scanner = MavenScanner(debug=False, index=ScanIndex(index_path, self.repo), collect_dependencies=True)
+        first = scanner.parse_pom_file(dir_path)
+        scanner.close()
+        scanner = MavenScanner(debug=False, index=ScanIndex(index_path, self.repo))
+        # Plain coordinates are kept apart from the entries with dependencies
+        self.assertNotIn('dependencies', scanner.parse_pom_file(dir_path))
+        scanner.collect_dependencies = True
+        self.assertEqual(scanner.parse_pom_file(dir_path), first)
+        self.assertEqual(scanner.stats.counters['poms_from_index'], 1)
+        scanner.close()
+
+    def test_graph_command(self):
+        result = CliRunner().invoke(cli, ['graph', '-r', self.repo, '--dependents-of', 'net.third:lib-c:1.0',
+                                          '--dependencies-of', 'org.example:app:1', '--missing'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Depending on net.third:lib-c:1.0:\n    com.other:lib-a:1.0\n    org.example:app:1\n',
+                      result.output)
+        self.assertIn('    org.bom:bom:3 (missing)\n', result.output)
+        self.assertIn('Artifacts: 6, dependencies: 8, missing artifacts: 2', result.output)
+
+    def test_deploy_with_transitive(self):
+        with patch('maven_scanner.cli.deploy_dependencies') as mock_deploy:
+            result = CliRunner().invoke(cli, ['list-dependencies', '-r', self.repo, '-g', 'org.example', '-a', 'app',
+                                              '-d', 'id,http://localhost', '--with-transitive'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Transitive dependencies added: 3', result.output)
+        deployed = sorted(record['filename'] for record in mock_deploy.call_args[0][0])
+        self.assertEqual(deployed, ['app-1.jar', 'lib-a-1.0.jar', 'lib-b-2.0.jar', 'lib-c-1.0.jar'])
+
+    def test_with_transitive_needs_deploy(self):
+        result = CliRunner().invoke(cli, ['list-dependencies', '-r', self.repo, '--with-transitive'])
+        self.assertNotEqual(result.exit_code, 0)
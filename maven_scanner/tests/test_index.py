@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+"""Tests for `maven_scanner.index` module."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from maven_scanner.index import ScanIndex, default_index_path
+from maven_scanner.scanner import MavenScanner
+
+
+class TestScanIndex(unittest.TestCase):
+    """Tests for `maven_scanner.index` module."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repo = os.path.join(self.temp_dir.name, 'repository')
+        shutil.copytree('dir/', self.repo)
+        self.index_path = os.path.join(self.temp_dir.name, 'index')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def scan(self):
+        scanner = MavenScanner(index=ScanIndex(self.index_path, self.repo))
+        scanner.scan_maven_repo_for_dependencies(self.repo)
+        for dir_path in scanner.jar_dir_dict.values():
+            scanner.parse_pom_file(dir_path)
+            scanner.parse_last_updated_file(dir_path)
+        return scanner
+
+    def test_default_index_path(self):
+        self.assertEqual(default_index_path(self.repo), os.path.join(self.temp_dir.name, '.mvn-scn-index'))
+
+    def test_unchanged_repository_is_not_listed_again(self):
+        first = self.scan()
+        first.close()
+        with patch('maven_scanner.walker.os.scandir') as mock_scandir, \
+                patch('maven_scanner.scanner.read_pom_coordinates') as mock_parse:
+            second = self.scan()
+        mock_scandir.assert_not_called()
+        mock_parse.assert_not_called()
+        self.assertEqual(first.jar_dir_dict, second.jar_dir_dict)
+        self.assertEqual(second.index.misses, 0)
+        second.close()
+
+    def test_changed_directory_is_listed_again(self):
+        self.scan().close()
+        changed = os.path.join(self.repo, 'test-no-jar')
+        open(os.path.join(changed, 'xom-1.3.7.jar'), 'w').close()
+        os.utime(changed, ns=(0, 1))
+        with patch('maven_scanner.walker.os.scandir', wraps=os.scandir) as mock_scandir:
+            scanner = self.scan()
+        self.assertEqual([call.args[0] for call in mock_scandir.call_args_list], [changed])
+        self.assertEqual(scanner.dir_records[changed].artifacts, ('xom-1.3.7.jar',))
+        scanner.close()
+
+    def test_removed_directory_is_forgotten(self):
+        self.scan().close()
+        shutil.rmtree(os.path.join(self.repo, 'test-jar'))
+        os.utime(self.repo, ns=(0, 1))
+        scanner = self.scan()
+        self.assertNotIn(os.path.join(self.repo, 'test-jar'), scanner.dir_records)
+        scanner.close()
+        with ScanIndex(self.index_path, self.repo) as index:
+            self.assertNotIn('test-jar', index._listings)
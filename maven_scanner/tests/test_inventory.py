@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+
+"""Tests for `maven_scanner.inventory` module."""
+
+import os
+import unittest
+from maven_scanner.cli import filter_dependencies
+from maven_scanner.inventory import ArtifactIndex
+from maven_scanner.records import ArtifactRecord
+from maven_scanner.scanner import MavenScanner
+
+
+def record(group_id, artifact_id, version, filename=None, url='https://repo.example.com/'):
+    filename = filename or f'{artifact_id}-{version}.jar'
+    dir_path = os.path.join('repo', *group_id.split('.'), artifact_id, version)
+    return ArtifactRecord(group_id, artifact_id, version, url, '', filename, dir_path)
+
+
+class TestArtifactIndex(unittest.TestCase):
+    """Tests for `maven_scanner.inventory` module."""
+
+    def setUp(self):
+        self.core = record('org.apache.commons', 'commons-lang3', '3.12.0')
+        self.tests = record('org.apache.commons', 'commons-lang3', '3.12.0', 'commons-lang3-3.12.0-tests.jar')
+        self.zip = record('org.apache', 'dist', '1.0', 'dist-1.0.zip', url='https://other.example.com/')
+        self.other = record('org.apachefoo', 'foo', '1.0')
+        self.index = ArtifactIndex([self.core, self.tests, self.zip, self.other])
+
+    def test_lookup_by_coordinate(self):
+        self.assertIs(self.index.get('org.apache.commons', 'commons-lang3', '3.12.0'), self.core)
+        self.assertIs(self.index.get('org.apache.commons', 'commons-lang3', '3.12.0', 'tests'), self.tests)
+        self.assertIs(self.index.get('org.apache', 'dist', '1.0', extension='zip'), self.zip)
+        self.assertIsNone(self.index.get('org.apache', 'dist', '1.0'))
+        self.assertIn(('org.apachefoo', 'foo', '1.0', None, 'jar'), self.index)
+
+    def test_group_prefix(self):
+        self.assertEqual(self.index.by_group('org.apache'), [self.core, self.tests, self.zip])
+        self.assertEqual(self.index.by_group('org.apache.commons'), [self.core, self.tests])
+        self.assertEqual(self.index.by_group('org.apachefoo'), [self.other])
+        self.assertEqual(self.index.by_group('com'), [])
+
+    def test_query(self):
+        self.assertEqual(self.index.by_repository('https://other.example.com/'), [self.zip])
+        self.assertEqual(self.index.query(group='org.apache', repository_url='https://repo.example.com/'),
+                         [self.core, self.tests])
+        self.assertEqual(self.index.query(artifact_id='foo'), [self.other])
+        self.assertEqual(self.index.query(), [self.core, self.tests, self.zip, self.other])
+
+    def test_duplicate_coordinates_are_kept(self):
+        relocated = ArtifactRecord('org.apache.commons', 'commons-lang3', '3.12.0', '', '', 'commons-lang3-3.12.0.jar',
+                                   os.path.join('repo', 'commons-lang', 'commons-lang3', '3.12.0'))
+        self.index.add(relocated)
+        self.assertEqual(len(self.index), 5)
+        self.assertIs(self.index.get('org.apache.commons', 'commons-lang3', '3.12.0'), self.core)
+        self.assertEqual(self.index.duplicates(), [[self.core, relocated]])
+
+    def test_same_file_name_in_several_directories(self):
+        scanner = MavenScanner(debug=False)
+        scanner.scan_maven_repo_for_dependencies('dir/')
+        self.assertEqual(len(scanner.artifacts()), 4)
+        dependencies = filter_dependencies(scanner, 'all', 'all')
+        self.assertEqual(sorted(dependency.dir_path for dependency in dependencies),
+                         [os.path.join('dir', name) for name in ('test-jar', 'test-lastUpdated', 'test4-zip')])
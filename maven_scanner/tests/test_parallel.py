@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+
+"""Tests for `maven_scanner.parallel` module."""
+
+import os
+import tempfile
+import unittest
+from maven_scanner.cli import iter_dependencies
+from maven_scanner.filters import DependencyFilter
+from maven_scanner.scanner import MavenScanner
+from maven_scanner.parallel import parse_directories
+from maven_scanner.resolver import pom_path
+
+
+class TestParallel(unittest.TestCase):
+    """Tests for `maven_scanner.parallel` module."""
+
+    def setUp(self):
+        self.scanner = MavenScanner(debug=False)
+        self.scanner.scan_maven_repo_for_dependencies('dir/')
+        self.dir_paths = sorted(self.scanner.dir_records)
+
+    def serial(self):
+        scanner = MavenScanner(debug=False)
+        scanner.scan_maven_repo_for_dependencies('dir/')
+        return parse_directories(scanner, self.dir_paths), scanner.error_counter
+
+    def test_thread_pool_matches_serial(self):
+        expected, expected_errors = self.serial()
+        result = parse_directories(self.scanner, self.dir_paths, jobs=4, executor='thread')
+        self.assertEqual(result, expected)
+        self.assertEqual(self.scanner.error_counter, expected_errors)
+
+    def test_process_pool_matches_serial(self):
+        expected, expected_errors = self.serial()
+        result = parse_directories(self.scanner, self.dir_paths, jobs=2, executor='process')
+        self.assertEqual(result, expected)
+        self.assertEqual(self.scanner.error_counter, expected_errors)
+
+    def write_children_repo(self, repo):
+        # 20 artifacts taking their version from the same parent pom
+        poms = [('parent', '<project><groupId>org.example</groupId><artifactId>parent</artifactId>'
+                           '<version>1.0</version><properties><revision>1.0</revision></properties>'
+                           '</project>')]
+        poms += [(f'child{number}', f'<project><parent><groupId>org.example</groupId><artifactId>parent'
+                                    f'</artifactId><version>1.0</version></parent><artifactId>child{number}'
+                                    f'</artifactId><version>${{revision}}</version></project>')
+                  for number in range(20)]
+        for artifact_id, content in poms:
+            path = pom_path(repo, 'org.example', artifact_id, '1.0')
+            os.makedirs(os.path.dirname(path))
+            with open(path, 'w') as file:
+                file.write(content)
+            with open(os.path.join(os.path.dirname(path), f'{artifact_id}-1.0.jar'), 'wb') as file:
+                file.write(b'jar content')
+
+    def test_process_workers_keep_parent_pom_cache(self):
+        with tempfile.TemporaryDirectory() as repo:
+            self.write_children_repo(repo)
+            scanner = MavenScanner(debug=False)
+            scanner.scan_maven_repo_for_dependencies(repo)
+            dir_paths = sorted(path for path in scanner.dir_records if 'child' in path)
+            results = parse_directories(scanner, dir_paths, jobs=2, executor='process', method='parse_pom_file')
+        self.assertEqual({result['version'] for result in results}, {'1.0'})
+        counters = scanner.stats.counters
+        self.assertEqual(counters['parent_pom_hits'] + counters['parent_pom_misses'], 20)
+        # The parent is parsed once per worker process, not once per child
+        self.assertLessEqual(counters['parent_pom_misses'], 2)
+
+    def test_stream_batches_share_process_pool(self):
+        with tempfile.TemporaryDirectory() as repo:
+            self.write_children_repo(repo)
+            scanner = MavenScanner(debug=False)
+            found = scanner.iter_maven_repo_artifacts(repo)
+            records = list(iter_dependencies(scanner, found, DependencyFilter(), jobs=2, executor='process',
+                                             batch_size=2))
+        self.assertEqual(len(records), 21)
+        counters = scanner.stats.counters
+        self.assertEqual(counters['parent_pom_hits'] + counters['parent_pom_misses'], 20)
+        # One pool for the 11 batches, so the parent is still parsed once per worker process
+        self.assertLessEqual(counters['parent_pom_misses'], 2)
+
+    def test_unknown_executor(self):
+        with self.assertRaises(ValueError):
+            parse_directories(self.scanner, self.dir_paths, jobs=2, executor='fiber')
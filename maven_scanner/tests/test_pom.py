@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+
+"""Tests for `maven_scanner.pom` module."""
+
+import os
+import tempfile
+import unittest
+from maven_scanner.pom import read_pom_coordinates
+
+
+class TestPom(unittest.TestCase):
+    """Tests for `maven_scanner.pom` module."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_pom(self, content):
+        pom_file_path = os.path.join(self.temp_dir.name, 'test.pom')
+        with open(pom_file_path, 'w') as file:
+            file.write(content)
+        return pom_file_path
+
+    def test_namespaced_pom_with_parent_fallback(self):
+        result = read_pom_coordinates('dir/test-jar/xom-1.3.7.pom')
+        self.assertEqual(result, {'groupId': 'xom', 'artifactId': 'xom.project', 'version': '1.3.7'})
+
+    def test_non_namespaced_pom(self):
+        pom_file_path = self.write_pom('<project><parent><groupId>org.example</groupId><artifactId>parent'
+                                       '</artifactId><version>1</version></parent><artifactId>child</artifactId>'
+                                       '</project>')
+        result = read_pom_coordinates(pom_file_path)
+        self.assertEqual(result, {'groupId': 'org.example', 'artifactId': 'child', 'version': '1'})
+
+    def test_foreign_namespace_is_ignored_in_pom_namespace(self):
+        pom_file_path = self.write_pom('<project xmlns="http://maven.apache.org/POM/4.0.0" xmlns:x="urn:x">'
+                                       '<x:groupId>wrong</x:groupId><groupId>g</groupId><artifactId>a</artifactId>'
+                                       '<version>1</version></project>')
+        self.assertEqual(read_pom_coordinates(pom_file_path), {'groupId': 'g', 'artifactId': 'a', 'version': '1'})
+
+    def test_nested_coordinates_are_ignored(self):
+        pom_file_path = self.write_pom('<project><groupId>g</groupId><dependencies><dependency><artifactId>dep'
+                                       '</artifactId><version>2</version></dependency></dependencies>'
+                                       '<artifactId>a</artifactId><version>1</version></project>')
+        self.assertEqual(read_pom_coordinates(pom_file_path), {'groupId': 'g', 'artifactId': 'a', 'version': '1'})
+
+    def test_stops_after_project_coordinates(self):
+        # Everything after the coordinates is malformed, it must never be read
+        pom_file_path = self.write_pom('<project><groupId>g</groupId><artifactId>a</artifactId><version>1</version>'
+                                       '<dependencies><oops></project>')
+        self.assertEqual(read_pom_coordinates(pom_file_path), {'groupId': 'g', 'artifactId': 'a', 'version': '1'})
+
+    def test_missing_coordinate(self):
+        pom_file_path = self.write_pom('<project><groupId>g</groupId><artifactId>a</artifactId></project>')
+        with self.assertRaises(ValueError):
+            read_pom_coordinates(pom_file_path)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+
+"""Tests for `maven_scanner.provenance` module."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from maven_scanner.index import ScanIndex
+from maven_scanner.provenance import (ProvenanceCache, read_last_updated, read_provenance, read_remote_repositories,
+                                      split_property)
+
+REMOTE_REPOSITORIES = """#NOTE: This is a Maven Resolver internal implementation file, \
+its format can be changed without prior notice.
+#Wed Feb 28 10:00:00 CET 2024
+xom-1.3.7.jar>central=
+xom-1.3.7.pom>central=
+"""
+
+
+class TestProvenance(unittest.TestCase):
+    """Tests for `maven_scanner.provenance` module."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, 'w') as file:
+            file.write(content)
+        return path
+
+    def test_split_property(self):
+        self.assertEqual(split_property('https\\://host/path/.lastUpdated=1'), ('https://host/path/.lastUpdated', '1'))
+        self.assertEqual(split_property('a\\=b=c\\:d'), ('a=b', 'c:d'))
+        self.assertIsNone(split_property('#Thu Nov 30 17:19:49 CET 2023'))
+        self.assertIsNone(split_property('   '))
+
+    def test_read_last_updated(self):
+        latest = read_last_updated('dir/test-lastUpdated/xom-1.3.7.pom.lastUpdated')
+        self.assertEqual(latest, ('https://example2.com/repository/Public_Repositories_Releases/', 1701361189226))
+
+    def test_mirror_prefix_is_removed(self):
+        path = self.write('a.pom.lastUpdated', '5ccaae95@default-tst_releases-https\\://example.com/releases/'
+                                               '.lastUpdated=1701361188812\n')
+        self.assertEqual(read_last_updated(path), ('https://example.com/releases/', 1701361188812))
+
+    def test_remote_repositories(self):
+        path = self.write('_remote.repositories', REMOTE_REPOSITORIES)
+        self.assertEqual(read_remote_repositories(path), {'xom-1.3.7.jar': 'central', 'xom-1.3.7.pom': 'central'})
+        provenance = read_provenance([path])
+        self.assertEqual(provenance['repository_url'], 'central')
+        self.assertEqual(provenance['repositories']['xom-1.3.7.jar'], 'central')
+
+    def test_last_updated_wins_over_remote_repositories(self):
+        paths = [self.write('a.jar.lastUpdated', 'https\\://example.com/.lastUpdated=1701361189226\n'),
+                 self.write('_remote.repositories', REMOTE_REPOSITORIES)]
+        provenance = read_provenance(paths)
+        self.assertEqual(provenance['repository_url'], 'https://example.com/')
+        self.assertEqual(provenance['update_date'], '2023-11-30 16:19:49')
+
+    def test_only_errors(self):
+        path = self.write('a.jar.lastUpdated', 'https\\://example.com/.error=Could not transfer\n')
+        self.assertIsNone(read_provenance([path]))
+
+    def test_memoized_until_files_change(self):
+        path = self.write('a.jar.lastUpdated', 'https\\://example.com/.lastUpdated=1701361189226\n')
+        cache = ProvenanceCache()
+        with patch('maven_scanner.provenance.read_provenance', wraps=read_provenance) as mock_read:
+            first = cache.read(self.temp_dir.name, [path])
+            self.assertIs(cache.read(self.temp_dir.name, [path]), first)
+            self.assertEqual(mock_read.call_count, 1)
+            self.write('a.jar.lastUpdated', 'https\\://other.example.com/.lastUpdated=1701361189227\n')
+            os.utime(path, ns=(0, 1))
+            self.assertEqual(cache.read(self.temp_dir.name, [path])['repository_url'], 'https://other.example.com/')
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_kept_in_scan_index(self):
+        path = self.write('a.jar.lastUpdated', 'https\\://example.com/.lastUpdated=1701361189226\n')
+        index_path = os.path.join(self.temp_dir.name, 'index')
+        with ScanIndex(index_path, self.temp_dir.name) as index:
+            ProvenanceCache().read(self.temp_dir.name, [path], index)
+        with ScanIndex(index_path, self.temp_dir.name) as index, \
+                patch('maven_scanner.provenance.read_provenance') as mock_read:
+            result = ProvenanceCache().read(self.temp_dir.name, [path], index)
+        mock_read.assert_not_called()
+        self.assertEqual(result['repository_url'], 'https://example.com/')
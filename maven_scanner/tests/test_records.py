@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+
+"""Tests for `maven_scanner.records` module."""
+
+import os
+import unittest
+from maven_scanner.records import ArtifactRecord
+from maven_scanner.writers import dependency_row
+
+
+class TestArtifactRecord(unittest.TestCase):
+    """Tests for `maven_scanner.records` module."""
+
+    def record(self, version='1.0', url='https://example.com/'):
+        dir_path = os.path.join('repo', 'com', 'example', 'lib', version)
+        return ArtifactRecord.from_parsed(f'lib-{version}.jar', dir_path,
+                                          {'groupId': 'com.example', 'artifactId': 'lib', 'version': version},
+                                          {'repository_url': ''.join(url), 'update_date': '2024-02-28 10:00:00'})
+
+    def test_fields(self):
+        record = self.record()
+        self.assertEqual(record['groupId'], 'com.example')
+        self.assertEqual(record['file_path'], os.path.join('repo', 'com', 'example', 'lib', '1.0', 'lib-1.0.jar'))
+        self.assertEqual(record.dir_path, os.path.join('repo', 'com', 'example', 'lib', '1.0'))
+        self.assertEqual(record.as_dict()['repository_url'], 'https://example.com/')
+        self.assertEqual(dependency_row(record)[:3], ['com.example', 'lib', '1.0'])
+        with self.assertRaises(KeyError):
+            record['unknown']
+
+    def test_repeated_strings_are_shared(self):
+        first = self.record('1.0', 'https://example.com/' + 'x')
+        second = self.record('2.0', 'https://example.com/' + 'x')
+        self.assertIs(first.group_id, second.group_id)
+        self.assertIs(first.repository_url, second.repository_url)
+        self.assertIs(first.artifact_dir, second.artifact_dir)
+        self.assertIs(first.version_dir, first.version)
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(self.record(), '__dict__'))
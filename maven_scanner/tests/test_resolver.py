@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+
+"""Tests for `maven_scanner.resolver` module."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from maven_scanner.pom import read_pom_model
+from maven_scanner.resolver import PomResolver, interpolate, pom_path
+from maven_scanner.scanner import MavenScanner
+
+PARENT = """<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <groupId>org.example</groupId>
+  <artifactId>parent</artifactId>
+  <version>${revision}</version>
+  <properties>
+    <revision>2.1.0</revision>
+    <lib.version>${project.version}</lib.version>
+  </properties>
+</project>
+"""
+
+
+class TestPomResolver(unittest.TestCase):
+    """Tests for `maven_scanner.resolver` module."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repo = self.temp_dir.name
+        self.write('org.example', 'parent', '2.1.0', PARENT)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, group_id, artifact_id, version, content):
+        path = pom_path(self.repo, group_id, artifact_id, version)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            file.write(content)
+        return path
+
+    def child(self, artifact_id, version_element='', parent_version='2.1.0', properties=''):
+        return self.write('org.example', artifact_id, '2.1.0', f"""<project>
+  <parent><groupId>org.example</groupId><artifactId>parent</artifactId><version>{parent_version}</version></parent>
+  <artifactId>{artifact_id}</artifactId>
+  {version_element}
+  <properties>{properties}</properties>
+</project>""")
+
+    def test_interpolate(self):
+        self.assertEqual(interpolate('${a}-${b}', {'a': '${b}', 'b': '1'}), '1-1')
+        self.assertEqual(interpolate('${missing}', {}), '${missing}')
+        self.assertEqual(interpolate('${a}', {'a': '${a}'}), '${a}')
+
+    def test_read_pom_model(self):
+        model = read_pom_model(pom_path(self.repo, 'org.example', 'parent', '2.1.0'))
+        self.assertEqual(model['coordinates']['version'], '${revision}')
+        self.assertEqual(model['properties'], {'revision': '2.1.0', 'lib.version': '${project.version}'})
+        self.assertEqual(model['parent'], {})
+
+    def test_properties_of_project_and_parent(self):
+        resolver = PomResolver(self.repo)
+        self.assertEqual(resolver.resolve(pom_path(self.repo, 'org.example', 'parent', '2.1.0'))['version'], '2.1.0')
+        self.assertEqual(resolver.resolve(self.child('a', '<version>${revision}</version>'))['version'], '2.1.0')
+        self.assertEqual(resolver.resolve(self.child('b', '<version>${project.parent.version}</version>'))['version'],
+                         '2.1.0')
+        # Inherited properties are interpolated in the context of the child
+        own = self.write('org.example', 'c', '3.0', """<project>
+  <parent><groupId>org.example</groupId><artifactId>parent</artifactId><version>2.1.0</version></parent>
+  <artifactId>c-${lib.version}-${own}</artifactId><version>3.0</version><properties><own>x</own></properties>
+</project>""")
+        self.assertEqual(resolver.resolve(own)['artifactId'], 'c-3.0-x')
+
+    def test_parent_version_from_child_property(self):
+        path = self.child('d', parent_version='${revision}', properties='<revision>2.1.0</revision>')
+        self.assertEqual(PomResolver(self.repo).resolve(path),
+                         {'groupId': 'org.example', 'artifactId': 'd', 'version': '2.1.0'})
+
+    def test_missing_parent_keeps_placeholder(self):
+        path = self.child('e', '<version>${revision}</version>', parent_version='9.9')
+        self.assertEqual(PomResolver(self.repo).resolve(path)['version'], '${revision}')
+
+    def test_parent_parsed_once(self):
+        resolver = PomResolver(self.repo)
+        paths = [self.child(f'lib{number}', '<version>${revision}</version>') for number in range(5)]
+        with patch('maven_scanner.resolver.read_pom_model', wraps=read_pom_model) as mock_read:
+            for path in paths:
+                resolver.resolve(path)
+        self.assertEqual(mock_read.call_count, len(paths) + 1)
+        self.assertEqual((resolver.hits, resolver.misses), (4, 1))
+
+    def test_lru_eviction(self):
+        resolver = PomResolver(self.repo, cache_size=1)
+        self.write('org.example', 'other-parent', '1', '<project><groupId>org.example</groupId>'
+                                                       '<artifactId>other-parent</artifactId><version>1</version>'
+                                                       '</project>')
+        resolver._parent_model(('org.example', 'parent', '2.1.0'), 1)
+        resolver._parent_model(('org.example', 'other-parent', '1'), 1)
+        self.assertEqual(list(resolver._parents), [('org.example', 'other-parent', '1')])
+
+    def test_scanner_resolves_coordinates(self):
+        self.child('f', '<version>${revision}</version>')
+        scanner = MavenScanner(debug=False)
+        scanner.scan_maven_repo_for_dependencies(self.repo)
+        pom_data = scanner.parse_pom_file(os.path.join(self.repo, 'org', 'example', 'f', '2.1.0'))
+        self.assertEqual(pom_data['version'], '2.1.0')
+        self.assertEqual(scanner.stats.counters['poms_resolved'], 1)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+
+"""Tests for `maven_scanner.roots` module and multi-root scans."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from click.testing import CliRunner
+from maven_scanner.cli import cli, filter_dependencies, scan_repo, scan_roots
+from maven_scanner.inventory import MergedInventory
+from maven_scanner.roots import expand_roots, read_manifest
+from tests.test_inventory import record
+
+
+class TestRoots(unittest.TestCase):
+    """Tests for `maven_scanner.roots` module."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.agents = os.path.join(self.temp_dir.name, 'agents')
+        self.roots = []
+        for agent in ('agent1', 'agent2', 'agent3'):
+            root = os.path.join(self.agents, agent, 'repository')
+            shutil.copytree('dir/', os.path.join(root, 'org', 'example'))
+            self.roots.append(root)
+        # An artifact only the last agent downloaded
+        only_dir = os.path.join(self.roots[2], 'org', 'example', 'test-jar', '2.0')
+        os.makedirs(only_dir)
+        with open('dir/test-jar/xom-1.3.7.pom') as source, open(os.path.join(only_dir, 'xom-2.0.pom'), 'w') as pom:
+            pom.write(source.read().replace('<version>1.3.7</version>', '<version>2.0</version>', 1))
+        shutil.copy('dir/test-jar/xom-1.3.7.jar', os.path.join(only_dir, 'xom-2.0.jar'))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_expand_roots(self):
+        pattern = os.path.join(self.agents, '*', 'repository')
+        self.assertEqual(expand_roots(patterns=[pattern]), self.roots)
+        # Duplicates are dropped, missing roots are kept
+        missing = os.path.join(self.agents, 'missing')
+        self.assertEqual(expand_roots([self.roots[1], missing], [pattern]), [self.roots[1], missing] +
+                         [self.roots[0], self.roots[2]])
+
+    def test_read_manifest(self):
+        manifest = os.path.join(self.agents, 'roots.txt')
+        with open(manifest, 'w') as file:
+            file.write("# Build agents\nagent1/repository\n\n  agent*/repository  \n")
+        self.assertEqual(read_manifest(manifest), [self.roots[0]] + self.roots)
+        self.assertEqual(expand_roots(manifests=[manifest]), self.roots)
+
+    def test_merged_inventory(self):
+        inventory = MergedInventory()
+        first = record('org.example', 'lib', '1.0')
+        self.assertTrue(inventory.add('a', first))
+        self.assertFalse(inventory.add('b', record('org.example', 'lib', '1.0')))
+        self.assertFalse(inventory.add('b', first))
+        self.assertTrue(inventory.add('b', record('org.example', 'lib', '1.0', 'lib-1.0-sources.jar')))
+        self.assertEqual(len(inventory), 2)
+        self.assertEqual(inventory.added, 4)
+        self.assertIs(next(iter(inventory)), first)
+        self.assertEqual(inventory.roots(first.coordinate), ['a', 'b'])
+        self.assertEqual([row['roots'] for row in inventory.rows()], ['a;b', 'b'])
+
+    def test_scan_roots(self):
+        single = list(filter_dependencies(scan_repo(self.roots[0], False), 'all', 'all'))
+        missing = os.path.join(self.agents, 'missing')
+        inventory, stats = scan_roots(self.roots + [missing], root_jobs=2)
+        self.assertEqual(len(inventory), len(single) + 1)
+        self.assertEqual(list(inventory)[:len(single)], single)
+        self.assertEqual(inventory.roots(single[0].coordinate), self.roots)
+        only = list(inventory)[-1]
+        self.assertEqual((only.version, inventory.roots(only.coordinate)), ('2.0', [self.roots[2]]))
+        self.assertEqual(stats.counters['roots_scanned'], 4)
+        self.assertEqual(stats.counters['artifacts_listed'], 3 * len(single) + 1)
+        self.assertEqual(stats.errors['repository_missing'], 1)
+
+    def test_list_dependencies(self):
+        runner = CliRunner()
+        result = runner.invoke(cli, ['list-dependencies', '-r', self.roots[0], '--roots-glob',
+                                     os.path.join(self.agents, '*', 'repository'), '-t', 'tsv', '-fn', '*.jar'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        lines = result.output.splitlines()
+        self.assertEqual(lines[0].split('\t')[-1], 'Roots')
+        self.assertIn(';'.join(self.roots), lines[1])
+        self.assertEqual(lines[-1].split('\t')[-1], self.roots[2])
+
+        # A single root is listed as before, without the Roots column
+        result = runner.invoke(cli, ['list-dependencies', '-r', self.roots[0], '-t', 'tsv', '--no-daemon'])
+        self.assertNotIn('Roots', result.output)
+
+        result = runner.invoke(cli, ['list-dependencies', '--roots-glob', os.path.join(self.agents, 'none*')])
+        self.assertNotEqual(result.exit_code, 0)
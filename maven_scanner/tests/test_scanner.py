@@ -38,7 +38,7 @@ class TestMavenScanner(unittest.TestCase):
     def test_parse_pom_file_exception(self):
         # Test parse_pom_file method when an exception occurs
         with tempfile.TemporaryDirectory() as temp_dir:
-            with patch('maven_scanner.scanner.ET.parse') as mock_parse:
+            with patch('maven_scanner.scanner.read_pom_coordinates') as mock_parse:
                 mock_parse.side_effect = Exception('Test exception')
                 result = self.scanner.parse_pom_file(temp_dir)
             self.assertIsNone(result)  # Ensure None is returned when an exception occurs
@@ -51,7 +51,7 @@ class TestMavenScanner(unittest.TestCase):
         result = self.scanner.parse_last_updated_file('dir/test-lastUpdated')
         print(result)
         # Ensure the result dictionary contains expected keys and values
-        self.assertEqual(result['repository_url'], 'https\\://example2.com/repository/Public_Repositories_Releases/')
+        self.assertEqual(result['repository_url'], 'https://example2.com/repository/Public_Repositories_Releases/')
         self.assertEqual(result['update_date'], '2023-11-30 16:19:49')
 
     def test_parse_lastUpdate_file_no_file(self):
@@ -61,8 +61,9 @@ class TestMavenScanner(unittest.TestCase):
     def test_parse_lastUpdate_file_exception(self):
         # Test parse_pom_file method when an exception occurs
         with tempfile.TemporaryDirectory() as temp_dir:
-            with patch('maven_scanner.scanner.re.finditer') as mock_finditer:
-                mock_finditer.side_effect = Exception('Test exception')
+            open(os.path.join(temp_dir, 'xom-1.3.7.pom.lastUpdated'), 'w').close()
+            with patch('maven_scanner.provenance.read_provenance') as mock_read:
+                mock_read.side_effect = Exception('Test exception')
                 result = self.scanner.parse_last_updated_file(temp_dir)
             self.assertIsNone(result)  # Ensure None is returned when an exception occurs
 
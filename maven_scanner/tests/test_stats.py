@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+
+"""Tests for `maven_scanner.stats` module and the --stats options."""
+
+import json
+import os
+import tempfile
+import unittest
+from click.testing import CliRunner
+from maven_scanner.cli import cli
+from maven_scanner.parallel import parse_directories
+from maven_scanner.scanner import MavenScanner
+from maven_scanner.stats import ScanStats, TimedIterator
+
+
+class TestScanStats(unittest.TestCase):
+    """Tests for `maven_scanner.stats` module."""
+
+    def test_merge_and_hit_rate(self):
+        stats = ScanStats()
+        stats.count('index_hits', 3)
+        stats.error('pom_missing')
+        worker = ScanStats()
+        worker.count('index_misses')
+        worker.error('pom_missing')
+        worker.add_duration('parse_pom', 0.5)
+        stats.merge(worker)
+        self.assertEqual(stats.hit_rate('index'), 0.75)
+        self.assertIsNone(stats.hit_rate('provenance'))
+        self.assertEqual(stats.errors, {'pom_missing': 2})
+        self.assertEqual(stats.as_dict()['durations'], {'parse_pom': 0.5})
+        self.assertIn('index cache hit rate', stats.summary())
+
+    def test_timed_iterator(self):
+        items = TimedIterator(iter([1, 2]))
+        self.assertEqual(list(items), [1, 2])
+        self.assertGreaterEqual(items.seconds, 0.0)
+
+    def test_scanner_counts(self):
+        scanner = MavenScanner(debug=False)
+        scanner.scan_maven_repo_for_dependencies('dir/')
+        parse_directories(scanner, sorted(set(scanner.jar_dir_dict.values())), jobs=2)
+        counters = scanner.stats.counters
+        self.assertEqual(counters['directories_listed'], 6)
+        self.assertEqual(counters['artifacts_found'], 4)
+        self.assertEqual(counters['poms_parsed'], 3)
+        self.assertEqual(scanner.stats.errors, {'pom_missing': 1, 'last_updated_missing': 2})
+        self.assertEqual(sum(scanner.stats.errors.values()), scanner.error_counter)
+        self.assertIn('walk', scanner.stats.durations)
+
+    def test_stats_options(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            stats_file = os.path.join(temp_dir, 'stats.json')
+            profile_file = os.path.join(temp_dir, 'profile')
+            result = CliRunner().invoke(cli, ['list-dependencies', '-r', 'dir/', '-t', 'tsv', '--stats-json',
+                                              stats_file, '--profile', profile_file])
+            self.assertEqual(result.exit_code, 0, result.output)
+            with open(stats_file) as file:
+                stats = json.load(file)
+            self.assertTrue(os.path.getsize(profile_file))
+        self.assertEqual(stats['counters']['artifacts_listed'], 3)
+        self.assertIn('output', stats['durations'])
+        self.assertGreaterEqual(stats['durations']['total'], stats['durations']['walk'])
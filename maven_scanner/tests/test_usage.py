@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+
+"""Tests for `maven_scanner.usage` module."""
+
+import os
+import tempfile
+import time
+import unittest
+from click.testing import CliRunner
+from maven_scanner.cli import cli
+from maven_scanner.usage import format_size, largest, scan_usage, snapshots_to_prune
+
+DAY = 24 * 3600
+
+
+class TestUsage(unittest.TestCase):
+    """Tests for `maven_scanner.usage` module."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repo = self.temp_dir.name
+        self.now = time.time()
+        self.write('org/example/app/1.0', 'app-1.0.jar', 100, age_days=400)
+        self.write('org/example/app/1.0', 'app-1.0.pom', 10, age_days=400)
+        self.write('org/example/app/2.0-SNAPSHOT', 'app-2.0-SNAPSHOT.jar', 50, age_days=90)
+        self.write('org/example/app/2.1-SNAPSHOT', 'app-2.1-SNAPSHOT.jar', 50, age_days=60)
+        self.write('org/example/app/2.2-SNAPSHOT', 'app-2.2-SNAPSHOT.jar', 50, age_days=1)
+        self.write('org/example/app', 'maven-metadata-central.xml', 5)
+        self.write('com/other/deep/lib/3', 'lib-3.jar', 1000, age_days=10)
+        # The download recorded in .lastUpdated is more recent than the files
+        last_updated = (int(self.now) - 2 * DAY) * 1000
+        self.write('com/other/deep/lib/3', 'lib-3.pom.lastUpdated', 0, age_days=10,
+                   content=f"https\\://repo/.lastUpdated={last_updated}\n")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, dir_path, name, size, age_days=0, content=None):
+        dir_path = os.path.join(self.repo, dir_path)
+        os.makedirs(dir_path, exist_ok=True)
+        file_path = os.path.join(dir_path, name)
+        with open(file_path, 'w') as file:
+            file.write(content if content is not None else 'x' * size)
+        mtime = self.now - age_days * DAY
+        os.utime(file_path, (mtime, mtime))
+
+    def test_scan_usage(self):
+        for jobs in (1, 4):
+            usage = scan_usage(self.repo, jobs)
+            self.assertEqual([(version.group_id, version.artifact_id, version.version) for version in usage.versions],
+                             [('com.other.deep', 'lib', '3'), ('org.example', 'app', '1.0'),
+                              ('org.example', 'app', '2.0-SNAPSHOT'), ('org.example', 'app', '2.1-SNAPSHOT'),
+                              ('org.example', 'app', '2.2-SNAPSHOT')])
+            self.assertEqual(usage.files, 8)
+            # lib holds the jar and the .lastUpdated file, app the versions and the artifact's metadata
+            self.assertEqual(usage.size, usage.versions[0].size + 110 + 150 + 5)
+
+        self.assertEqual(usage.by_artifact()[('org.example', 'app')], (260, 5))
+        self.assertEqual(largest(usage.by_group(), 1)[0][0], 'com.other.deep')
+        lib = usage.versions[0]
+        self.assertAlmostEqual(lib.last_used, self.now - 2 * DAY, delta=1)
+        self.assertEqual(usage.stalest(1)[0].version, '1.0')
+
+    def test_snapshots_to_prune(self):
+        usage = scan_usage(self.repo)
+        self.assertEqual([version.version for version in snapshots_to_prune(usage, 1, 30, self.now)],
+                         ['2.0-SNAPSHOT', '2.1-SNAPSHOT'])
+        self.assertEqual([version.version for version in snapshots_to_prune(usage, 1, 70, self.now)],
+                         ['2.0-SNAPSHOT'])
+        self.assertEqual(snapshots_to_prune(usage, 3, 0, self.now), [])
+
+    def test_missing_repository(self):
+        with self.assertRaises(FileNotFoundError):
+            scan_usage(os.path.join(self.repo, 'missing'))
+
+    def test_format_size(self):
+        self.assertEqual(format_size(512), '512 B')
+        self.assertEqual(format_size(1536 * 1024 * 1024), '1.5 GiB')
+
+    def test_commands(self):
+        runner = CliRunner()
+        result = runner.invoke(cli, ['analyze', '-r', self.repo, '-n', '2'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('com.other.deep:lib', result.output)
+        self.assertIn('5 versions', result.output)
+
+        result = runner.invoke(cli, ['prune', '-r', self.repo, '--dry-run'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertTrue(os.path.isdir(os.path.join(self.repo, 'org/example/app/2.0-SNAPSHOT')))
+
+        result = runner.invoke(cli, ['prune', '-r', self.repo], input='y\n')
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Freed 100 B', result.output)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.repo, 'org/example/app'))),
+                         ['1.0', '2.2-SNAPSHOT', 'maven-metadata-central.xml'])
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+
+"""Tests for `maven_scanner.verify` module."""
+
+import hashlib
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest.mock import patch
+from click.testing import CliRunner
+from maven_scanner.cli import cli
+from maven_scanner.index import ScanIndex
+from maven_scanner.verify import HashCache, hash_file, verify_artifacts
+
+
+class TestVerify(unittest.TestCase):
+    """Tests for `maven_scanner.verify` module."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repo = os.path.join(self.temp_dir.name, 'repository')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def artifact(self, group_path, artifact_id, version, content=b'content', sidecar=True, sha1=None):
+        dir_path = os.path.join(self.repo, group_path, artifact_id, version)
+        os.makedirs(dir_path, exist_ok=True)
+        file_path = os.path.join(dir_path, f'{artifact_id}-{version}.jar')
+        with zipfile.ZipFile(file_path, 'w') as archive:
+            # A fixed timestamp makes archives of the same content byte-identical
+            archive.writestr(zipfile.ZipInfo('data', date_time=(2024, 1, 1, 0, 0, 0)), content)
+        if sidecar:
+            with open(file_path + '.sha1', 'w') as file:
+                file.write(sha1 or hash_file(file_path))
+        return file_path
+
+    def test_hash_file(self):
+        file_path = self.artifact('g', 'a', '1')
+        with open(file_path, 'rb') as file:
+            expected = hashlib.sha1(file.read()).hexdigest()
+        self.assertEqual(hash_file(file_path), expected)
+        with patch('maven_scanner.verify.MMAP_THRESHOLD', 1):
+            self.assertEqual(hash_file(file_path), expected)
+
+    def test_report(self):
+        good = self.artifact('g', 'a', '1')
+        copy = self.artifact('h', 'b', '1', sidecar=False)
+        bad = self.artifact('g', 'c', '1', b'other', sha1='0' * 40)
+        broken = os.path.join(self.repo, 'g', 'd', '1', 'd-1.jar')
+        os.makedirs(os.path.dirname(broken))
+        with open(broken, 'wb') as file:
+            file.write(b'not a zip')
+
+        report = verify_artifacts([good, copy, bad, broken], jobs=2)
+        self.assertEqual(report.corrupted, [(broken, 'Not a valid zip archive')])
+        self.assertEqual([mismatch[:2] for mismatch in report.mismatched], [(bad, '0' * 40)])
+        self.assertEqual(report.duplicates, [sorted([good, copy])])
+        self.assertEqual((report.verified, report.unverified), (2, 1))
+        self.assertFalse(report.ok)
+
+    def test_only_size_collisions_are_hashed(self):
+        first = self.artifact('g', 'a', '1', sidecar=False)
+        second = self.artifact('g', 'b', '1', b'a much longer content', sidecar=False)
+        with patch('maven_scanner.verify.hash_file', wraps=hash_file) as mock_hash:
+            report = verify_artifacts([first, second], check_sidecars=False)
+        mock_hash.assert_not_called()
+        self.assertEqual(report.duplicates, [])
+
+    def test_cached_hashes(self):
+        paths = [self.artifact('g', 'a', '1'), self.artifact('g', 'b', '1')]
+        index_path = os.path.join(self.temp_dir.name, 'index')
+        with ScanIndex(index_path, self.repo) as index:
+            self.assertEqual(verify_artifacts(paths, cache=HashCache(index)).hashed, 2)
+        with ScanIndex(index_path, self.repo) as index, \
+                patch('maven_scanner.verify.hash_file') as mock_hash:
+            report = verify_artifacts(paths, cache=HashCache(index))
+        mock_hash.assert_not_called()
+        self.assertEqual(report.cached, 2)
+        self.assertEqual(len(report.duplicates), 1)
+
+    def test_changed_file_is_hashed_again(self):
+        file_path = self.artifact('g', 'a', '1')
+        cache = HashCache()
+        verify_artifacts([file_path], cache=cache)
+        with open(file_path, 'ab') as file:
+            file.write(b'x')
+        report = verify_artifacts([file_path], cache=cache)
+        self.assertEqual(report.hashed, 1)
+        self.assertEqual(len(report.mismatched), 1)
+
+    def test_commands(self):
+        self.artifact('g', 'a', '1')
+        self.artifact('h', 'b', '1')
+        runner = CliRunner()
+        result = runner.invoke(cli, ['verify', '-r', self.repo, '-j', '2'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Verified against .sha1: 2', result.output)
+        self.artifact('g', 'c', '1', sha1='0' * 40)
+        self.assertEqual(runner.invoke(cli, ['verify', '-r', self.repo]).exit_code, 1)
+        result = runner.invoke(cli, ['dedupe', '-r', self.repo])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Duplicates:', result.output)
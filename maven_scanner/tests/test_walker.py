@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+
+"""Tests for `maven_scanner.walker` module."""
+
+import os
+import unittest
+from unittest.mock import patch
+from maven_scanner.scanner import MavenScanner
+from maven_scanner.walker import walk_repository, classify_entries, ArtifactDir
+
+
+class TestWalker(unittest.TestCase):
+    """Tests for `maven_scanner.walker` module."""
+
+    def test_walk_repository_records(self):
+        records = {os.path.basename(record.path): record for record in walk_repository('dir/')}
+        self.assertEqual(records['test-jar'].artifacts, ('xom-1.3.7.jar',))
+        self.assertEqual(records['test-jar'].poms, ('xom-1.3.7.pom',))
+        self.assertEqual(records['test-lastUpdated'].last_updated, ('xom-1.3.7.pom.lastUpdated',))
+        self.assertEqual(records['test4-zip'].artifacts, ('xom-1.3.7.zip',))
+        self.assertEqual(records['test-no-jar'].artifacts, ())
+
+    def test_walk_repository_lists_each_directory_once(self):
+        with patch('maven_scanner.walker.os.scandir', wraps=os.scandir) as mock_scandir:
+            list(walk_repository('dir/'))
+        listed = [call.args[0] for call in mock_scandir.call_args_list]
+        self.assertEqual(len(listed), len(set(listed)))
+        self.assertEqual(len(listed), 1 + len(os.listdir('dir/')))
+
+    def test_classify_entries(self):
+        record = classify_entries('x', ['a-1.jar', 'a-1-sources.jar', 'a-1.pom', 'a-1.jar.lastUpdated', 'a.sha1'])
+        self.assertEqual(record, ArtifactDir('x', ['a-1.jar'], ['a-1.pom'], ['a-1.jar.lastUpdated']))
+        self.assertIsNone(classify_entries('x', ['_remote.repositories', 'a.sha1']))
+
+    def test_parsers_reuse_scanned_records(self):
+        scanner = MavenScanner()
+        scanner.scan_maven_repo_for_dependencies('dir/')
+        with patch('maven_scanner.scanner.os.listdir') as mock_listdir:
+            for dir_path in scanner.jar_dir_dict.values():
+                scanner.parse_pom_file(dir_path)
+                scanner.parse_last_updated_file(dir_path)
+        mock_listdir.assert_not_called()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+
+"""Tests for `maven_scanner.writers` module and the streaming dependency listing."""
+
+import io
+import json
+import sqlite3
+import unittest
+from maven_scanner.cli import iter_dependencies
+from maven_scanner.filters import DependencyFilter
+from maven_scanner.scanner import MavenScanner
+from maven_scanner.writers import ROOTS_COLUMNS, write_table, write_csv, write_tsv, write_jsonl, write_sqlite
+
+
+def dependency(artifact_id, version='1.0'):
+    return {'groupId': 'com.example', 'artifactId': artifact_id, 'version': version, 'repository_url': '',
+            'last_update': '', 'filename': f'{artifact_id}-{version}.jar',
+            'file_path': f'/repo/com/example/{artifact_id}/{version}/{artifact_id}-{version}.jar'}
+
+
+class TestWriters(unittest.TestCase):
+    """Tests for `maven_scanner.writers` module."""
+
+    def test_write_table_sizes_columns_from_sample(self):
+        out = io.StringIO()
+        count = write_table(iter([dependency('a'), dependency('much-longer-artifact')]), out, sample_size=1)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(count, 2)
+        self.assertTrue(lines[0].startswith('GroupID      ArtifactID  Version'))
+        self.assertTrue(lines[1].startswith('com.example  a           1.0'))
+        self.assertTrue(lines[2].startswith('com.example  much-longer-artifact  1.0'))
+
+    def test_versions_are_written_as_text(self):
+        out = io.StringIO()
+        write_table([dependency('a', '1.10')], out)
+        self.assertIn(' 1.10 ', out.getvalue())
+
+    def test_write_csv(self):
+        out = io.StringIO()
+        self.assertEqual(write_csv(iter([dependency('a')]), out), 1)
+        self.assertEqual(out.getvalue().splitlines()[2].split(',')[:3], ['com.example', 'a', '1.0'])
+
+    def test_write_tsv(self):
+        out = io.StringIO()
+        self.assertEqual(write_tsv(iter([dependency('a'), dependency('b')]), out), 2)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[2].split('\t')[1], 'b')
+
+    def test_write_jsonl(self):
+        out = io.StringIO()
+        self.assertEqual(write_jsonl(iter(dependency(name) for name in 'abc'), out, batch_size=2), 3)
+        lines = out.getvalue().splitlines()
+        self.assertEqual([json.loads(line)['artifactId'] for line in lines], ['a', 'b', 'c'])
+        self.assertEqual(json.loads(lines[0]), dependency('a'))
+
+    def test_write_sqlite(self):
+        connection = sqlite3.connect(':memory:')
+        rows = [dict(dependency(name), roots='/a;/b') for name in 'abc']
+        self.assertEqual(write_sqlite(iter(rows), connection, ROOTS_COLUMNS, batch_size=2), 3)
+        # Writing again replaces the previous content
+        self.assertEqual(write_sqlite(iter(rows[:2]), connection, ROOTS_COLUMNS), 2)
+        self.assertEqual(connection.execute("SELECT artifactId, roots FROM dependencies").fetchall(),
+                         [('a', '/a;/b'), ('b', '/a;/b')])
+        connection.close()
+
+    def test_write_sqlite_keeps_previous_export_on_error(self):
+        connection = sqlite3.connect(':memory:')
+        write_sqlite(iter([dependency('a'), dependency('b')]), connection)
+
+        def failing():
+            yield dependency('c')
+            raise OSError('Repository unreadable')
+
+        with self.assertRaises(OSError):
+            write_sqlite(failing(), connection, batch_size=1)
+        self.assertEqual(connection.execute("SELECT artifactId FROM dependencies").fetchall(), [('a',), ('b',)])
+        connection.close()
+
+    def test_iter_dependencies_streams_batches(self):
+        scanner = MavenScanner(debug=False)
+        consumed = []
+
+        def artifacts():
+            for item in scanner.iter_maven_repo_artifacts('dir/'):
+                consumed.append(item)
+                yield item
+
+        dependencies = iter_dependencies(scanner, artifacts(), DependencyFilter(), batch_size=1)
+        first = next(dependencies)
+        self.assertEqual(first['artifactId'], 'xom.project')
+        # Only the first directory and the one starting the next batch were walked so far
+        self.assertEqual(len(consumed), 2)
+        self.assertEqual(len([first] + list(dependencies)), 3)